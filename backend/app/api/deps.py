@@ -0,0 +1,54 @@
+from typing import Optional
+from fastapi import Depends, HTTPException, Request
+from app.core.admission import AdmissionController, AdmissionRejected, retry_after_header
+from app.core.security import get_current_user
+from app.models.user import User
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_service import EmbeddingService
+from app.services.generation_cache import GenerationCache
+from app.services.llm_service import CodexService
+from app.services.registry import ServiceRegistry
+from app.services.supabase_auth import SupabaseAuthService
+
+def get_services(request: Request) -> ServiceRegistry:
+    """Application-scoped service registry created in the lifespan handler."""
+    return request.app.state.services
+
+def get_codex_service(request: Request) -> CodexService:
+    return request.app.state.services.codex
+
+def get_codex_cache(request: Request) -> Optional[GenerationCache]:
+    return request.app.state.services.codex_cache
+
+def get_embedding_service(request: Request) -> EmbeddingService:
+    return request.app.state.services.embeddings
+
+def get_embedding_batcher(request: Request) -> Optional[EmbeddingBatcher]:
+    return request.app.state.services.embedding_batcher
+
+def get_auth_service(request: Request) -> SupabaseAuthService:
+    return request.app.state.services.auth
+
+def get_admission(request: Request) -> AdmissionController:
+    return request.app.state.admission
+
+def admission(route: str):
+    """Dependency factory holding a route + per-user admission slot for the request.
+
+    Rejections (rate limit, full queue, queue wait timeout) become 429 with
+    Retry-After so clients back off instead of piling onto a saturated upstream.
+    """
+    async def dependency(
+        current_user: User = Depends(get_current_user),
+        controller: AdmissionController = Depends(get_admission)
+    ):
+        try:
+            async with controller.admit(route, str(current_user.id)) as waited:
+                yield waited
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": retry_after_header(e.retry_after)},
+            )
+    return dependency
\ No newline at end of file
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import BaseModel
-from backend.app.models.user import User
-from backend.app.services.supabase_auth import SupabaseAuthService
+from app.models.user import User
+from app.services.supabase_auth import SupabaseAuthService
+from app.api.deps import get_auth_service
+from app.core.security import bearer_scheme, get_current_user
 
 router = APIRouter()
 
@@ -14,19 +17,24 @@ class LoginResponse(BaseModel):
     token_type: str
 
 @router.post("/login", response_model=LoginResponse)
-async def login(request: LoginRequest):
+async def login(
+    request: LoginRequest,
+    auth_service: SupabaseAuthService = Depends(get_auth_service)
+):
     try:
-        auth_service = SupabaseAuthService()
-        access_token = await auth_service.login(request.email, request.password)
-        return LoginResponse(access_token=access_token, token_type="bearer")
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=str(e))
+        response = await auth_service.sign_in(request.email, request.password)
+    except HTTPException as e:
+        raise HTTPException(status_code=401, detail=e.detail)
+    if response.session is None:
+        raise HTTPException(status_code=401, detail="Sign-in returned no session")
+    return LoginResponse(access_token=response.session.access_token, token_type="bearer")
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
-    try:
-        auth_service = SupabaseAuthService()
-        await auth_service.logout(current_user.id)
-        return {"detail": "Successfully logged out"}
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+async def logout(
+    current_user: User = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    auth_service: SupabaseAuthService = Depends(get_auth_service)
+):
+    # get_current_user has already verified this token
+    await auth_service.sign_out(credentials.credentials)
+    return {"detail": "Successfully logged out"}
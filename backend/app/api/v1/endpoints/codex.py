@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from app.models.codex import CodexRequest, CodexResponse
-from app.services.llm_service import LLMService
+from app.services.llm_service import CodexService
+from app.services.generation_cache import GenerationCache
+from app.api.deps import admission, get_codex_cache, get_codex_service
 from app.core.security import get_current_user
 from app.models.user import User
 
@@ -10,11 +15,60 @@ router = APIRouter()
 @router.post("/codex/generate", response_model=CodexResponse)
 async def generate_codex_response(
     request: CodexRequest,
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    codex_service: CodexService = Depends(get_codex_service),
+    codex_cache: Optional[GenerationCache] = Depends(get_codex_cache),
+    queue_wait: float = Depends(admission("codex.generate"))
 ) -> CodexResponse:
+    async def generate():
+        return await codex_service.generate_code(
+            request.prompt,
+            max_tokens=request.max_tokens,
+            temperature=request.temperature,
+        )
+
     try:
-        llm_service = LLMService()
-        result = await llm_service.generate(request.prompt)
-        return CodexResponse(result=result)
+        if codex_cache is None:
+            result = await generate()
+        else:
+            # Identical concurrent requests share one upstream call (X-Cache: COALESCED)
+            result, status = await codex_cache.get_or_generate(
+                request.prompt, request.max_tokens, request.temperature, generate
+            )
+            response.headers["X-Cache"] = status
+        response.headers["X-Queue-Wait-Ms"] = f"{queue_wait * 1000:.1f}"
+        return CodexResponse(**result)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/codex/generate/stream")
+async def stream_codex_response(
+    request: CodexRequest,
+    current_user: User = Depends(get_current_user),
+    codex_service: CodexService = Depends(get_codex_service),
+    queue_wait: float = Depends(admission("codex.generate.stream"))
+) -> StreamingResponse:
+    """Stream completion tokens as NDJSON: ``{"token": ...}`` lines, then ``{"done": true}``.
+
+    Upstream failures after the response has started are reported as a final
+    ``{"error": ...}`` line since the status code has already been sent.
+    """
+    async def events():
+        try:
+            async for token in codex_service.stream_code(
+                request.prompt,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+            ):
+                yield json.dumps({"token": token}) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+            return
+        yield json.dumps({"done": True}) + "\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,48 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Response
+from app.core.config import settings
+from app.models.embeddings import EmbeddingsRequest, EmbeddingsResponse
+from app.services.embedding_batcher import EmbeddingBatcher, embed_unbatched
+from app.services.embedding_service import EmbeddingService
+from app.api.deps import admission, get_embedding_batcher, get_embedding_service
+
+router = APIRouter()
+
+@router.post("", response_model=EmbeddingsResponse)
+async def create_embeddings(
+    request: EmbeddingsRequest,
+    response: Response,
+    embedding_service: EmbeddingService = Depends(get_embedding_service),
+    batcher: Optional[EmbeddingBatcher] = Depends(get_embedding_batcher),
+    queue_wait: float = Depends(admission("embeddings"))
+) -> EmbeddingsResponse:
+    """Embed ``texts`` (or a single ``text``); vectors are returned in input order.
+
+    With batching enabled, texts from concurrent requests are merged into
+    shared upstream calls, so many single-text callers cost a few round trips.
+    """
+    texts = request.texts if request.texts is not None else ([request.text] if request.text is not None else [])
+    if not texts:
+        raise HTTPException(status_code=422, detail="Provide 'text' or a non-empty 'texts' list")
+    if len(texts) > settings.embedding_max_texts_per_request:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.embedding_max_texts_per_request} texts per request",
+        )
+
+    try:
+        if batcher is None:
+            vectors = await embed_unbatched(
+                embedding_service,
+                texts,
+                settings.embedding_batch_max_size,
+                settings.embedding_batch_max_tokens,
+            )
+        else:
+            vectors = await batcher.embed(texts)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    response.headers["X-Queue-Wait-Ms"] = f"{queue_wait * 1000:.1f}"
+    return EmbeddingsResponse(embeddings=vectors, count=len(vectors))
\ No newline at end of file
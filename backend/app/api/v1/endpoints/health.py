@@ -1,4 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from app.api.deps import get_admission
+from app.core.admission import AdmissionController
 
 router = APIRouter()
 
@@ -7,4 +9,9 @@ async def health_check():
     try:
         return {"status": "healthy"}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/admission")
+async def admission_stats(controller: AdmissionController = Depends(get_admission)):
+    """Per-route in-flight counts, queue depth, wait times and rejections."""
+    return controller.snapshot()
\ No newline at end of file
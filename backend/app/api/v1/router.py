@@ -1,8 +1,9 @@
 from fastapi import APIRouter
-from .endpoints import auth, codex, health
+from .endpoints import auth, codex, embeddings, health
 
 router = APIRouter()
 
 router.include_router(auth.router, prefix="/auth", tags=["auth"])
 router.include_router(codex.router, prefix="/codex", tags=["codex"])
+router.include_router(embeddings.router, prefix="/embeddings", tags=["embeddings"])
 router.include_router(health.router, prefix="/health", tags=["health"])
\ No newline at end of file
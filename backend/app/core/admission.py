@@ -0,0 +1,252 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; maps to 429 + Retry-After."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Consume one token; return 0 on success or the seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class ConcurrencyLimiter:
+    """Concurrency limit with a bounded FIFO wait queue.
+
+    Requests beyond ``limit`` wait in line; when ``max_queue`` are already
+    waiting, or a wait exceeds ``queue_timeout``, the request is rejected so
+    callers fail fast instead of timing out upstream.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.hold_avg = 1.0  # EWMA of seconds a slot is held, for Retry-After hints
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> float:
+        return max(1.0, self.hold_avg * (self.waiting + 1) / self.limit)
+
+    async def acquire(self) -> float:
+        """Wait for a slot and return the time spent queued."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return 0.0
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected(f"{self.name}: queue full", self.retry_after())
+
+        fut: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        t0 = time.monotonic()
+        try:
+            await asyncio.wait_for(fut, self.queue_timeout)
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # slot was handed over just as the wait timed out
+            else:
+                self._discard(fut)
+            self.rejected += 1
+            raise AdmissionRejected(f"{self.name}: queue wait timed out", self.retry_after())
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # slot was handed over just as we were cancelled
+            else:
+                self._discard(fut)
+            raise
+        waited = time.monotonic() - t0
+        self.admitted += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        return waited
+
+    def _discard(self, fut: "asyncio.Future[None]") -> None:
+        try:
+            self._waiters.remove(fut)
+        except ValueError:
+            pass
+
+    def release(self, held: Optional[float] = None) -> None:
+        if held is not None:
+            self.hold_avg = 0.9 * self.hold_avg + 0.1 * held
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)  # hand the slot over; active count unchanged
+                return
+        self.active -= 1
+
+    def idle(self) -> bool:
+        return self.active == 0 and not self._waiters
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "limit": self.limit,
+            "queue_depth": self.waiting,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_avg_ms": (self.wait_total / self.admitted * 1000) if self.admitted else 0.0,
+            "wait_max_ms": self.wait_max * 1000,
+        }
+
+
+class AdmissionController:
+    """Per-route and per-user admission: token bucket, then user and route queues."""
+
+    MAX_TRACKED_USERS = 10000
+
+    def __init__(
+        self,
+        route_max_concurrent: int = 32,
+        route_max_queue: int = 64,
+        route_limits: Optional[Dict[str, int]] = None,
+        user_max_concurrent: int = 4,
+        user_max_queue: int = 8,
+        user_rate: float = 2.0,
+        user_burst: int = 10,
+        queue_timeout: float = 10.0,
+    ):
+        self.route_max_concurrent = route_max_concurrent
+        self.route_max_queue = route_max_queue
+        self.route_limits = dict(route_limits or {})
+        self.user_max_concurrent = user_max_concurrent
+        self.user_max_queue = user_max_queue
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.queue_timeout = queue_timeout
+        self.routes: Dict[str, ConcurrencyLimiter] = {}
+        self.users: "OrderedDict[str, ConcurrencyLimiter]" = OrderedDict()
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.rate_limited = 0
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "AdmissionController":
+        return cls(
+            route_max_concurrent=settings.admission_route_max_concurrent,
+            route_max_queue=settings.admission_route_max_queue,
+            route_limits=settings.admission_route_limits,
+            user_max_concurrent=settings.admission_user_max_concurrent,
+            user_max_queue=settings.admission_user_max_queue,
+            user_rate=settings.admission_user_rate,
+            user_burst=settings.admission_user_burst,
+            queue_timeout=settings.admission_queue_timeout,
+        )
+
+    def _route(self, route: str) -> ConcurrencyLimiter:
+        limiter = self.routes.get(route)
+        if limiter is None:
+            limit = self.route_limits.get(route, self.route_max_concurrent)
+            limiter = ConcurrencyLimiter(route, limit, self.route_max_queue, self.queue_timeout)
+            self.routes[route] = limiter
+        return limiter
+
+    def _user(self, user_id: str) -> ConcurrencyLimiter:
+        limiter = self.users.get(user_id)
+        if limiter is None:
+            limiter = ConcurrencyLimiter(
+                f"user {user_id}", self.user_max_concurrent, self.user_max_queue, self.queue_timeout
+            )
+            self.users[user_id] = limiter
+            self._evict(self.users, lambda lim: lim.idle())
+        else:
+            self.users.move_to_end(user_id)
+        return limiter
+
+    def _bucket(self, user_id: str) -> TokenBucket:
+        bucket = self.buckets.get(user_id)
+        if bucket is None:
+            bucket = TokenBucket(self.user_rate, self.user_burst)
+            self.buckets[user_id] = bucket
+            self._evict(self.buckets, lambda b: True)
+        else:
+            self.buckets.move_to_end(user_id)
+        return bucket
+
+    def _evict(self, table: "OrderedDict[str, Any]", evictable) -> None:
+        if len(table) <= self.MAX_TRACKED_USERS:
+            return
+        for key in list(table.keys())[: len(table) - self.MAX_TRACKED_USERS]:
+            if evictable(table[key]):
+                del table[key]
+
+    @asynccontextmanager
+    async def admit(self, route: str, user_id: Optional[str] = None) -> AsyncIterator[float]:
+        """Hold a route (and user) slot for the duration of the block.
+
+        Yields the seconds spent queued. Raises ``AdmissionRejected`` when the
+        user is over rate, or a queue is full or its wait times out.
+        """
+        user_limiter = None
+        waited = 0.0
+        if user_id is not None:
+            if self.user_rate > 0:
+                wait = self._bucket(user_id).take()
+                if wait > 0:
+                    self.rate_limited += 1
+                    raise AdmissionRejected("rate limit exceeded", wait)
+            user_limiter = self._user(user_id)
+            waited += await user_limiter.acquire()
+        route_limiter = self._route(route)
+        try:
+            waited += await route_limiter.acquire()
+        except BaseException:
+            if user_limiter is not None:
+                user_limiter.release()
+            raise
+        t0 = time.monotonic()
+        try:
+            yield waited
+        finally:
+            held = time.monotonic() - t0
+            route_limiter.release(held)
+            if user_limiter is not None:
+                user_limiter.release(held)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "routes": {name: lim.snapshot() for name, lim in self.routes.items()},
+            "users_tracked": len(self.users),
+            "users_queued": sum(lim.waiting for lim in self.users.values()),
+            "rate_limited": self.rate_limited,
+        }
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
@@ -1,3 +1,4 @@
+from typing import Dict, Optional
 from pydantic import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,6 +8,40 @@ class Settings(BaseSettings):
     anthropic_api_key: str
     qdrant_url: str
     qdrant_api_key: str
+    codex_api_url: str = "https://api.openai.com/v1/completions"
+    # Internal embedding service (takes {"text"}/{"texts"}, no auth header); no public default
+    embedding_api_url: str
+    upstream_timeout: float = 60.0
+    upstream_connect_timeout: float = 10.0
+    upstream_max_connections: int = 100
+    upstream_max_keepalive: int = 20
+    upstream_http2: bool = True
+    codex_cache_enabled: bool = True
+    codex_cache_max_entries: int = 1024
+    codex_cache_ttl: float = 3600.0
+    codex_cache_sqlite_path: Optional[str] = None
+    codex_cache_nondeterministic: bool = False
+    admission_route_max_concurrent: int = 32
+    admission_route_max_queue: int = 64
+    admission_route_limits: Dict[str, int] = {}
+    admission_user_max_concurrent: int = 4
+    admission_user_max_queue: int = 8
+    admission_user_rate: float = 2.0
+    admission_user_burst: int = 10
+    admission_queue_timeout: float = 10.0
+    supabase_jwt_secret: Optional[str] = None
+    supabase_jwks_url: Optional[str] = None
+    jwt_audience: Optional[str] = "authenticated"
+    jwt_issuer: Optional[str] = None
+    jwt_leeway: float = 0.0
+    jwt_claims_cache_size: int = 1024
+    jwks_cache_ttl: float = 3600.0
+    embedding_batch_enabled: bool = True
+    embedding_batch_max_size: int = 64
+    embedding_batch_max_tokens: int = 8192
+    embedding_batch_window_ms: float = 5.0
+    embedding_batch_max_concurrent: int = 4
+    embedding_max_texts_per_request: int = 256
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import httpx
+import jwt
+from jwt import PyJWK
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "PS256", "EdDSA")
+
+
+class TokenError(Exception):
+    """Token is malformed, expired, or not signed by a trusted key."""
+
+
+class JWKSCache:
+    """Signing keys fetched from a JWKS URL, keyed by ``kid``.
+
+    Keys are refreshed when the TTL lapses or a token names an unknown kid
+    (key rotation); unknown-kid refreshes are throttled so garbage tokens
+    cannot turn into a stream of JWKS fetches.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        client: Optional[httpx.AsyncClient] = None,
+        ttl: float = 3600.0,
+        min_refresh_interval: float = 30.0,
+    ):
+        self.url = url
+        self.client = client
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.keys: Dict[str, PyJWK] = {}
+        self.fetched_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def _refresh(self) -> None:
+        if self.client is not None:
+            response = await self.client.get(self.url, timeout=5.0)
+        else:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(self.url, timeout=5.0)
+        response.raise_for_status()
+        keys: Dict[str, PyJWK] = {}
+        for jwk in response.json().get("keys", []):
+            if jwk.get("use", "sig") != "sig" or "kid" not in jwk:
+                continue
+            try:
+                keys[jwk["kid"]] = PyJWK(jwk)
+            except jwt.PyJWTError:
+                continue  # unsupported key type; skip rather than fail the set
+        self.keys = keys
+        self.fetched_at = time.monotonic()
+
+    async def get(self, kid: str) -> PyJWK:
+        now = time.monotonic()
+        key = self.keys.get(kid)
+        if key is not None and now - self.fetched_at < self.ttl:
+            return key
+        async with self._lock:
+            key = self.keys.get(kid)
+            stale = time.monotonic() - self.fetched_at
+            if key is None and stale < self.min_refresh_interval:
+                raise TokenError(f"Unknown signing key id: {kid}")
+            if key is None or stale >= self.ttl:
+                try:
+                    await self._refresh()
+                except (httpx.HTTPError, ValueError) as e:
+                    if key is not None:
+                        return key  # keep serving the last good key during an outage
+                    raise TokenError(f"Could not fetch signing keys: {e}") from e
+                key = self.keys.get(kid)
+        if key is None:
+            raise TokenError(f"Unknown signing key id: {kid}")
+        return key
+
+
+class JWTVerifier:
+    """Verify Supabase access tokens locally, without a network hop per request.
+
+    HS256 tokens are checked against the project's JWT secret; asymmetric
+    tokens against keys from the JWKS endpoint. Decoded claims are kept in a
+    small LRU until the token expires, so repeat requests skip signature work.
+    """
+
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        jwks: Optional[JWKSCache] = None,
+        audience: Optional[str] = "authenticated",
+        issuer: Optional[str] = None,
+        leeway: float = 0.0,
+        cache_size: int = 1024,
+    ):
+        self.secret = secret
+        self.jwks = jwks
+        self.audience = audience
+        self.issuer = issuer
+        self.leeway = leeway
+        self.cache_size = cache_size
+        self._claims: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def _cached(self, token: str) -> Optional[Dict[str, Any]]:
+        item = self._claims.get(token)
+        if item is None:
+            return None
+        exp, claims = item
+        if exp + self.leeway <= time.time():
+            del self._claims[token]
+            return None
+        self._claims.move_to_end(token)
+        return claims
+
+    async def _key_for(self, header: Dict[str, Any]) -> Tuple[Any, str]:
+        alg = header.get("alg")
+        if alg == "HS256":
+            if not self.secret:
+                raise TokenError("HS256 tokens are not accepted: no JWT secret configured")
+            return self.secret, alg
+        if alg in ASYMMETRIC_ALGORITHMS:
+            if self.jwks is None:
+                raise TokenError(f"{alg} tokens are not accepted: no JWKS URL configured")
+            kid = header.get("kid")
+            if not kid:
+                raise TokenError("Token header has no kid")
+            return (await self.jwks.get(kid)).key, alg
+        raise TokenError(f"Unsupported token algorithm: {alg}")
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        claims = self._cached(token)
+        if claims is not None:
+            return claims
+        try:
+            header = jwt.get_unverified_header(token)
+            key, alg = await self._key_for(header)
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[alg],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={"require": ["exp", "sub"], "verify_aud": self.audience is not None},
+            )
+        except jwt.PyJWTError as e:
+            raise TokenError(str(e)) from e
+        self._claims[token] = (float(claims["exp"]), claims)
+        if len(self._claims) > self.cache_size:
+            self._claims.popitem(last=False)
+        return claims
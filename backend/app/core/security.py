@@ -1,9 +1,15 @@
-from fastapi import HTTPException
+from datetime import datetime, timezone
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from passlib.context import CryptContext
+from app.core.jwt_verifier import JWTVerifier, TokenError
+from app.models.user import User
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+bearer_scheme = HTTPBearer(auto_error=False)
+
 def hash_password(password: str) -> str:
     """Hash a password for storing."""
     return pwd_context.hash(password)
@@ -12,7 +18,38 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a stored password against one provided by user."""
     return pwd_context.verify(plain_password, hashed_password)
 
-def get_current_user(token: str):
-    """Retrieve the current user based on the provided token."""
-    # Implementation for extracting user from token goes here
-    raise NotImplementedError("Token verification not implemented.")
\ No newline at end of file
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+def user_from_claims(claims: dict) -> User:
+    """Build a User from Supabase access-token claims."""
+    metadata = claims.get("user_metadata") or {}
+    email = claims.get("email") or ""
+    issued = datetime.fromtimestamp(claims.get("iat", claims["exp"]), tz=timezone.utc)
+    return User(
+        id=claims["sub"],
+        email=email,
+        username=metadata.get("username") or email,
+        created_at=issued,
+        updated_at=issued,
+    )
+
+async def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+) -> User:
+    """Retrieve the current user by verifying the bearer token locally.
+
+    Signature and expiry are checked against the configured JWT secret or
+    cached JWKS keys; Supabase is not called on the request path.
+    """
+    if credentials is None or credentials.scheme.lower() != "bearer":
+        raise _unauthorized("Not authenticated")
+    verifier: JWTVerifier = request.app.state.jwt_verifier
+    try:
+        claims = await verifier.verify(credentials.credentials)
+        return user_from_claims(claims)
+    except TokenError as e:
+        raise _unauthorized(f"Invalid token: {e}")
+    except (KeyError, ValueError) as e:
+        raise _unauthorized(f"Invalid token claims: {e}")
\ No newline at end of file
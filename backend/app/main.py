@@ -1,9 +1,63 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import router
+from app.core.admission import AdmissionController
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, metrics_endpoint, registry as metrics_registry, sample_lines
+from app.services.registry import ServiceRegistry
 
-app = FastAPI(title="Vibe Coding Template API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build shared, pooled clients once; requests only look them up
+    services = ServiceRegistry(settings)
+    await services.startup()
+    app.state.services = services
+    app.state.admission = AdmissionController.from_settings(settings)
+    app.state.jwt_verifier = services.jwt_verifier
+    try:
+        yield
+    finally:
+        await services.shutdown()
+
+def collect_state_metrics():
+    """Cache, batching and admission figures, read from app state at scrape time."""
+    lines = []
+    services = getattr(app.state, "services", None)
+    cache = getattr(services, "codex_cache", None)
+    if cache is not None:
+        lines += sample_lines(
+            "codex_cache_requests_total", "Codex cache lookups by result", "counter",
+            (({"result": k.lower()}, v) for k, v in cache.stats.items()),
+        )
+        lines += sample_lines(
+            "codex_cache_hit_ratio", "Share of cacheable lookups served without a new upstream call", "gauge",
+            [({}, cache.hit_ratio())],
+        )
+        lines += sample_lines("codex_cache_entries", "Entries in the in-memory tier", "gauge", [({}, len(cache.memory))])
+    batcher = getattr(services, "embedding_batcher", None)
+    if batcher is not None:
+        lines += sample_lines("embedding_batches_total", "Upstream embedding batches sent", "counter", [({}, batcher.batches)])
+        lines += sample_lines("embedding_batched_texts_total", "Texts embedded through the batcher", "counter", [({}, batcher.texts)])
+    admission = getattr(app.state, "admission", None)
+    if admission is not None:
+        routes = admission.routes.items()
+        lines += sample_lines(
+            "admission_queue_depth", "Requests waiting for a slot", "gauge",
+            [({"route": name}, lim.waiting) for name, lim in routes],
+        )
+        lines += sample_lines(
+            "admission_rejected_total", "Requests rejected with 429", "counter",
+            [({"route": name}, lim.rejected) for name, lim in routes],
+        )
+        lines += sample_lines(
+            "admission_wait_seconds_total", "Total time spent queued", "counter",
+            [({"route": name}, lim.wait_total) for name, lim in routes],
+        )
+    return lines
+
+app = FastAPI(title="Vibe Coding Template API", version="1.0.0", lifespan=lifespan)
+metrics_registry.add_collector(collect_state_metrics)
 
 # CORS middleware
 app.add_middleware(
@@ -14,5 +68,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request count/latency/in-flight per route; added last so it wraps everything
+app.add_middleware(MetricsMiddleware)
+
 # Include the API router
-app.include_router(router, prefix="/api/v1")
\ No newline at end of file
+app.include_router(router, prefix="/api/v1")
+app.add_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
\ No newline at end of file
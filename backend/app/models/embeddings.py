@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class EmbeddingsRequest(BaseModel):
+    text: Optional[str] = None
+    texts: Optional[List[str]] = None
+
+class EmbeddingsResponse(BaseModel):
+    embeddings: List[List[float]]
+    count: int
\ No newline at end of file
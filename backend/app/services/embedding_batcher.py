@@ -0,0 +1,161 @@
+import asyncio
+from typing import List, Optional, Set, Tuple
+from app.services.embedding_service import EmbeddingService
+
+_Item = Tuple[str, int, "asyncio.Future[List[float]]"]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for batch limits."""
+    return len(text) // 4 + 1
+
+
+def check_tokens(texts: List[str], max_tokens: int) -> List[int]:
+    """Token estimates for ``texts``; ValueError if any one exceeds ``max_tokens``."""
+    estimates = [estimate_tokens(t) for t in texts]
+    for i, tokens in enumerate(estimates):
+        if tokens > max_tokens:
+            raise ValueError(f"Text {i} of ~{tokens} tokens exceeds the batch limit of {max_tokens}")
+    return estimates
+
+
+def split_batches(texts: List[str], max_batch_size: int, max_batch_tokens: int) -> List[List[str]]:
+    """Split ``texts`` in order into upstream batches within both limits."""
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    tokens = 0
+    for text, n in zip(texts, check_tokens(texts, max_batch_tokens)):
+        if batch and (len(batch) >= max_batch_size or tokens + n > max_batch_tokens):
+            batches.append(batch)
+            batch, tokens = [], 0
+        batch.append(text)
+        tokens += n
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+async def embed_unbatched(
+    service: EmbeddingService, texts: List[str], max_batch_size: int = 64, max_batch_tokens: int = 8192
+) -> List[List[float]]:
+    """Embed ``texts`` directly, under the same per-call limits the batcher uses."""
+    batches = split_batches(texts, max(1, max_batch_size), max_batch_tokens)
+    results = await asyncio.gather(*(service.get_embeddings_batch(batch) for batch in batches))
+    return [vector for vectors in results for vector in vectors]
+
+
+class EmbeddingBatcher:
+    """Merge concurrent embedding requests into upstream batches.
+
+    Texts submitted within ``window`` seconds of the first queued text are
+    sent together, up to ``max_batch_size`` texts and ``max_batch_tokens``
+    estimated tokens per upstream call. At most ``max_concurrent_batches``
+    upstream calls run at once; further batches wait.
+    """
+
+    def __init__(
+        self,
+        service: EmbeddingService,
+        max_batch_size: int = 64,
+        max_batch_tokens: int = 8192,
+        window: float = 0.005,
+        max_concurrent_batches: int = 4,
+    ):
+        self.service = service
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_batch_tokens = max_batch_tokens
+        self.window = window
+        self._queue: "asyncio.Queue[_Item]" = asyncio.Queue()
+        self._slots = asyncio.Semaphore(max_concurrent_batches)
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._inflight: Set["asyncio.Task[None]"] = set()
+        self.batches = 0
+        self.texts = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        while not self._queue.empty():
+            _, _, fut = self._queue.get_nowait()
+            if not fut.done():
+                fut.set_exception(RuntimeError("Embedding batcher stopped"))
+
+    def _enqueue(self, text: str, tokens: int) -> "asyncio.Future[List[float]]":
+        fut: "asyncio.Future[List[float]]" = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, tokens, fut))
+        return fut
+
+    def submit(self, text: str) -> "asyncio.Future[List[float]]":
+        return self._enqueue(text, check_tokens([text], self.max_batch_tokens)[0])
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed ``texts`` (any number), sharing upstream calls with concurrent callers.
+
+        Every text is checked against the token limit before any is queued,
+        so a rejected request leaves nothing behind in the batch queue.
+        """
+        tokens = check_tokens(texts, self.max_batch_tokens)
+        futures = [self._enqueue(t, n) for t, n in zip(texts, tokens)]
+        return list(await asyncio.gather(*futures))
+
+    async def _collect(self, first: _Item) -> Tuple[List[_Item], Optional[_Item]]:
+        loop = asyncio.get_running_loop()
+        batch = [first]
+        tokens = first[1]
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if tokens + item[1] > self.max_batch_tokens:
+                return batch, item  # starts the next batch
+            batch.append(item)
+            tokens += item[1]
+        return batch, None
+
+    async def _run(self) -> None:
+        carry: Optional[_Item] = None
+        while True:
+            first = carry or await self._queue.get()
+            batch, carry = await self._collect(first)
+            await self._slots.acquire()
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[_Item]) -> None:
+        try:
+            live = [item for item in batch if not item[2].done()]  # callers may have gone away
+            if not live:
+                return
+            self.batches += 1
+            self.texts += len(live)
+            try:
+                vectors = await self.service.get_embeddings_batch([text for text, _, _ in live])
+                if len(vectors) != len(live):
+                    raise RuntimeError(f"Upstream returned {len(vectors)} embeddings for {len(live)} texts")
+            except Exception as e:
+                for _, _, fut in live:
+                    if not fut.done():
+                        fut.set_exception(e)
+                return
+            for (_, _, fut), vector in zip(live, vectors):
+                if not fut.done():
+                    fut.set_result(vector)
+        finally:
+            self._slots.release()
@@ -1,6 +1,8 @@
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
-import requests
+import httpx
+from app.core.metrics import track_upstream
+from app.services.http_client import get_http_client
 
 class EmbeddingRequest(BaseModel):
     text: str
@@ -8,16 +10,41 @@ class EmbeddingRequest(BaseModel):
 class EmbeddingResponse(BaseModel):
     embeddings: List[float]
 
+class EmbeddingBatchRequest(BaseModel):
+    texts: List[str]
+
+class EmbeddingBatchResponse(BaseModel):
+    embeddings: List[List[float]]
+
 class EmbeddingService:
-    def __init__(self, api_url: str):
+    def __init__(self, api_url: str, client: Optional[httpx.AsyncClient] = None):
         self.api_url = api_url
+        self._client = client
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Shared pooled client unless one was injected
+        return self._client or get_http_client()
+
+    @track_upstream("embeddings", "get_embeddings")
     async def get_embeddings(self, request: EmbeddingRequest) -> EmbeddingResponse:
         try:
-            response = requests.post(f"{self.api_url}/embeddings", json=request.dict())
+            response = await self.client.post(f"{self.api_url}/embeddings", json=request.dict())
             response.raise_for_status()
             return EmbeddingResponse(**response.json())
-        except requests.HTTPError as e:
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"HTTP error occurred: {e}")
+        except Exception as e:
+            raise Exception(f"An error occurred: {e}")
+
+    @track_upstream("embeddings", "get_embeddings_batch")
+    async def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts in one upstream call; results keep input order."""
+        try:
+            response = await self.client.post(f"{self.api_url}/embeddings", json={"texts": texts})
+            response.raise_for_status()
+            return EmbeddingBatchResponse(**response.json()).embeddings
+        except httpx.HTTPStatusError as e:
             raise Exception(f"HTTP error occurred: {e}")
         except Exception as e:
             raise Exception(f"An error occurred: {e}")
\ No newline at end of file
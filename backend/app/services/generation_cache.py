@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Values for the X-Cache response header
+HIT = "HIT"
+MISS = "MISS"
+COALESCED = "COALESCED"
+BYPASS = "BYPASS"
+
+
+def cache_key(prompt: str, max_tokens: Optional[int], temperature: Optional[float]) -> str:
+    raw = json.dumps([prompt, max_tokens, temperature], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """In-memory LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires, value = item
+        if expires < time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, expires: Optional[float] = None) -> None:
+        self._data[key] = (expires or time.time() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """Optional persistent tier shared across workers and restarts.
+
+    Calls run in a worker thread so the event loop never blocks on disk I/O.
+    Expired rows are purged on open and then every ``purge_every`` writes.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600.0, purge_every: int = 256):
+        self.path = path
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS generations ("
+            "key TEXT PRIMARY KEY, expires REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        self._purge()
+
+    def _get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires, value FROM generations WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] < time.time():
+            return None
+        return row[0], json.loads(row[1])
+
+    def _set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO generations (key, expires, value) VALUES (?, ?, ?)",
+                (key, time.time() + self.ttl, json.dumps(value)),
+            )
+            self._writes += 1
+            due = self.purge_every > 0 and self._writes % self.purge_every == 0
+        if due:
+            self._purge()
+
+    def _purge(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM generations WHERE expires < ?", (time.time(),))
+
+    async def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+    async def purge(self) -> None:
+        await asyncio.to_thread(self._purge)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class GenerationCache:
+    """Single-flight plus LRU (and optional SQLite) cache for generations.
+
+    Concurrent callers with the same key share one upstream call, whatever
+    the temperature. Results are stored in the LRU/SQLite tiers only when the
+    request is deterministic (``temperature == 0``) or ``cache_nondeterministic``
+    is set; other requests skip those tiers and report ``BYPASS``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        sqlite_path: Optional[str] = None,
+        cache_nondeterministic: bool = False,
+    ):
+        self.memory = LRUCache(max_entries, ttl)
+        self.sqlite = SQLiteCache(sqlite_path, ttl) if sqlite_path else None
+        self.cache_nondeterministic = cache_nondeterministic
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        self.stats: Dict[str, int] = {HIT: 0, MISS: 0, COALESCED: 0, BYPASS: 0}
+
+    def cacheable(self, temperature: Optional[float]) -> bool:
+        return self.cache_nondeterministic or not temperature
+
+    async def _lookup(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None or self.sqlite is None:
+            return value
+        row = await self.sqlite.get(key)
+        if row is None:
+            return None
+        expires, value = row
+        self.memory.set(key, value, expires)  # promote to the memory tier
+        return value
+
+    async def _fill(self, key: str, fn: Callable[[], Awaitable[Any]], store: bool = True) -> Any:
+        value = await fn()
+        if not store:
+            return value
+        self.memory.set(key, value)
+        if self.sqlite is not None:
+            try:
+                await self.sqlite.set(key, value)
+            except Exception as e:
+                logger.warning("SQLite cache write failed: %s", e)
+        return value
+
+    async def get_or_generate(
+        self,
+        prompt: str,
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        fn: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, str]:
+        """Return ``(result, cache_status)`` for one generation request."""
+        store = self.cacheable(temperature)
+        key = cache_key(prompt, max_tokens, temperature)
+        if store:
+            value = await self._lookup(key)
+            if value is not None:
+                self.stats[HIT] += 1
+                return value, HIT
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats[COALESCED] += 1
+            return await asyncio.shield(task), COALESCED
+
+        task = asyncio.ensure_future(self._fill(key, fn, store))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        status = MISS if store else BYPASS
+        self.stats[status] += 1
+        # Shielded so a disconnecting leader does not cancel the shared call
+        return await asyncio.shield(task), status
+
+    def hit_ratio(self) -> float:
+        lookups = self.stats[HIT] + self.stats[MISS] + self.stats[COALESCED]
+        return (self.stats[HIT] + self.stats[COALESCED]) / lookups if lookups else 0.0
+
+    def close(self) -> None:
+        if self.sqlite is not None:
+            self.sqlite.close()
@@ -0,0 +1,55 @@
+import importlib.util
+from typing import Optional
+import httpx
+
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def http2_available() -> bool:
+    """HTTP/2 in httpx needs the optional ``h2`` package."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client(
+    timeout: float = DEFAULT_TIMEOUT,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE,
+    http2: bool = True,
+) -> httpx.AsyncClient:
+    """Build a pooled async client for upstream LLM/embedding APIs."""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+        http2=http2 and http2_available(),
+    )
+
+
+def init_http_client(**kwargs) -> httpx.AsyncClient:
+    """Replace the shared client with one built from ``create_http_client(**kwargs)``."""
+    global _client
+    _client = create_http_client(**kwargs)
+    return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide upstream client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,17 +1,28 @@
-from typing import Any, Dict
-import requests
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+import httpx
+from app.core.metrics import track_upstream
+from app.services.http_client import get_http_client
 
 class CodexService:
-    def __init__(self, api_key: str, api_url: str):
+    def __init__(self, api_key: str, api_url: str, client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key
         self.api_url = api_url
+        self._client = client
 
-    async def generate_code(self, prompt: str, **kwargs: Any) -> Dict[str, Any]:
-        headers = {
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Shared pooled client unless one was injected
+        return self._client or get_http_client()
+
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        data = {
+
+    def _payload(self, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+        return {
             "prompt": prompt,
             "max_tokens": kwargs.get("max_tokens", 150),
             "temperature": kwargs.get("temperature", 0.7),
@@ -19,20 +30,51 @@ class CodexService:
             "n": kwargs.get("n", 1),
             "stop": kwargs.get("stop", None)
         }
+
+    @track_upstream("codex", "generate")
+    async def generate_code(self, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+        headers = self._headers()
+        data = self._payload(prompt, **kwargs)
         try:
-            response = requests.post(self.api_url, headers=headers, json=data)
+            response = await self.client.post(self.api_url, headers=headers, json=data)
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"Error generating code: {str(e)}") from e
 
+    @track_upstream("codex", "stream")
+    async def stream_code(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        """Yield completion text fragments as the upstream emits them.
+
+        Requests ``stream: true`` and parses the OpenAI-style server-sent events
+        (``data: {...}`` lines terminated by ``data: [DONE]``).
+        """
+        data = self._payload(prompt, **kwargs)
+        data["stream"] = True
+        try:
+            async with self.client.stream("POST", self.api_url, headers=self._headers(), json=data) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    chunk = line[5:].strip()
+                    if chunk == "[DONE]":
+                        break
+                    for choice in json.loads(chunk).get("choices", []):
+                        text = choice.get("text") or (choice.get("delta") or {}).get("content")
+                        if text:
+                            yield text
+        except httpx.HTTPError as e:
+            raise Exception(f"Error streaming code: {str(e)}") from e
+
+    @track_upstream("codex", "model_info")
     async def get_model_info(self) -> Dict[str, Any]:
         headers = {
             "Authorization": f"Bearer {self.api_key}"
         }
         try:
-            response = requests.get(f"{self.api_url}/models", headers=headers)
+            response = await self.client.get(f"{self.api_url}/models", headers=headers)
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"Error fetching model info: {str(e)}") from e
\ No newline at end of file
@@ -0,0 +1,120 @@
+import inspect
+import logging
+from typing import Any, Dict, Optional, Tuple
+import httpx
+from supabase import create_client, Client
+from app.core.config import Settings
+from app.core.jwt_verifier import JWKSCache, JWTVerifier
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_service import EmbeddingService
+from app.services.generation_cache import GenerationCache
+from app.services.http_client import close_http_client, init_http_client
+from app.services.llm_service import CodexService
+from app.services.supabase_auth import SupabaseAuthService
+from app.services.supabase_database import SupabaseDatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """Application-scoped clients and services shared by every request.
+
+    Built once in the FastAPI lifespan and stored on ``app.state.services``;
+    endpoints receive services through the dependencies in ``app.api.deps``.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.http: Optional[httpx.AsyncClient] = None
+        self.supabase: Optional[Client] = None
+        self.codex: Optional[CodexService] = None
+        self.embeddings: Optional[EmbeddingService] = None
+        self.embedding_batcher: Optional[EmbeddingBatcher] = None
+        self.auth: Optional[SupabaseAuthService] = None
+        self.codex_cache: Optional[GenerationCache] = None
+        self.jwt_verifier: Optional[JWTVerifier] = None
+        self._databases: Dict[Tuple[str, Any], SupabaseDatabaseService] = {}
+
+    async def startup(self) -> None:
+        settings = self.settings
+        self.http = init_http_client(
+            timeout=settings.upstream_timeout,
+            connect_timeout=settings.upstream_connect_timeout,
+            max_connections=settings.upstream_max_connections,
+            max_keepalive_connections=settings.upstream_max_keepalive,
+            http2=settings.upstream_http2,
+        )
+        self.supabase = create_client(settings.supabase_url, settings.supabase_service_key)
+        self.codex = CodexService(
+            api_key=settings.openai_api_key, api_url=settings.codex_api_url, client=self.http
+        )
+        self.embeddings = EmbeddingService(api_url=settings.embedding_api_url, client=self.http)
+        if settings.embedding_batch_enabled:
+            self.embedding_batcher = EmbeddingBatcher(
+                self.embeddings,
+                max_batch_size=settings.embedding_batch_max_size,
+                max_batch_tokens=settings.embedding_batch_max_tokens,
+                window=settings.embedding_batch_window_ms / 1000,
+                max_concurrent_batches=settings.embedding_batch_max_concurrent,
+            )
+            self.embedding_batcher.start()
+        # The shared client does DB work as the service role; user sessions
+        # are created on per-call clients inside SupabaseAuthService.
+        self.auth = SupabaseAuthService(
+            settings.supabase_url, settings.supabase_service_key, client=self.supabase
+        )
+        if settings.codex_cache_enabled:
+            self.codex_cache = GenerationCache(
+                max_entries=settings.codex_cache_max_entries,
+                ttl=settings.codex_cache_ttl,
+                sqlite_path=settings.codex_cache_sqlite_path,
+                cache_nondeterministic=settings.codex_cache_nondeterministic,
+            )
+        jwks_url = settings.supabase_jwks_url or (
+            f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
+        )
+        self.jwt_verifier = JWTVerifier(
+            secret=settings.supabase_jwt_secret,
+            jwks=JWKSCache(jwks_url, client=self.http, ttl=settings.jwks_cache_ttl),
+            audience=settings.jwt_audience,
+            issuer=settings.jwt_issuer,
+            leeway=settings.jwt_leeway,
+            cache_size=settings.jwt_claims_cache_size,
+        )
+        logger.info("Service registry started")
+
+    def database(self, table_name: str, response_model: Any) -> SupabaseDatabaseService:
+        """Return the shared table service, creating it on first use."""
+        key = (table_name, response_model)
+        service = self._databases.get(key)
+        if service is None:
+            service = SupabaseDatabaseService(table_name, response_model, client=self.supabase)
+            self._databases[key] = service
+        return service
+
+    async def shutdown(self) -> None:
+        self._databases.clear()
+        if self.embedding_batcher is not None:
+            await self.embedding_batcher.stop()
+            self.embedding_batcher = None
+        if self.codex_cache is not None:
+            self.codex_cache.close()
+            self.codex_cache = None
+        if self.supabase is not None:
+            await _close_quietly(self.supabase)
+            self.supabase = None
+        await close_http_client()
+        self.http = None
+        logger.info("Service registry stopped")
+
+
+async def _close_quietly(obj: Any) -> None:
+    close = getattr(obj, "aclose", None) or getattr(obj, "close", None)
+    if close is None:
+        return
+    try:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+    except Exception as e:
+        logger.warning("Error closing %s: %s", type(obj).__name__, e)
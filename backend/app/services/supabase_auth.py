@@ -1,33 +1,65 @@
+import asyncio
 from fastapi import HTTPException
-from supabase import create_client, Client
-from typing import Any, Dict
+from supabase import ClientOptions, create_client, Client
+from typing import Any, Dict, Optional
+from app.core.metrics import track_upstream
 
 class SupabaseAuthService:
-    def __init__(self, supabase_url: str, supabase_key: str) -> None:
-        self.supabase: Client = create_client(supabase_url, supabase_key)
+    """Supabase password auth that never changes who the shared client acts as.
 
+    supabase-py keeps the session from sign-in/sign-up on the client that
+    made the call and sends that user's token on every later request. So
+    those calls run on a throwaway client each time, and sign-out and user
+    lookup go through the service-role ``client`` with the caller's token.
+    """
+
+    def __init__(
+        self,
+        supabase_url: Optional[str] = None,
+        supabase_key: Optional[str] = None,
+        client: Optional[Client] = None,
+    ) -> None:
+        self.supabase_url = supabase_url
+        self.supabase_key = supabase_key
+        # Reuse an application-scoped client when given one
+        self.supabase: Client = client or create_client(supabase_url, supabase_key)
+
+    def _session_client(self) -> Client:
+        options = ClientOptions(auto_refresh_token=False, persist_session=False)
+        return create_client(self.supabase_url, self.supabase_key, options=options)
+
+    @track_upstream("supabase_auth", "sign_up")
     async def sign_up(self, email: str, password: str) -> Dict[str, Any]:
         try:
-            response = await self.supabase.auth.sign_up(email=email, password=password)
+            client = self._session_client()
+            response = await asyncio.to_thread(
+                client.auth.sign_up, {"email": email, "password": password}
+            )
             return response
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
+    @track_upstream("supabase_auth", "sign_in")
     async def sign_in(self, email: str, password: str) -> Dict[str, Any]:
         try:
-            response = await self.supabase.auth.sign_in(email=email, password=password)
+            client = self._session_client()
+            response = await asyncio.to_thread(
+                client.auth.sign_in_with_password, {"email": email, "password": password}
+            )
             return response
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-    async def sign_out(self) -> None:
+    @track_upstream("supabase_auth", "sign_out")
+    async def sign_out(self, access_token: str) -> None:
+        """End the session that ``access_token`` belongs to."""
         try:
-            await self.supabase.auth.sign_out()
+            await asyncio.to_thread(self.supabase.auth.admin.sign_out, access_token)
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-    async def get_user(self) -> Dict[str, Any]:
-        user = self.supabase.auth.user()
+    async def get_user(self, access_token: str) -> Dict[str, Any]:
+        user = await asyncio.to_thread(self.supabase.auth.get_user, access_token)
         if user is None:
             raise HTTPException(status_code=401, detail="User not authenticated")
-        return user
\ No newline at end of file
+        return user
@@ -1,16 +1,19 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from supabase import create_client, Client
 from fastapi import HTTPException
+from app.core.metrics import track_upstream
 
 class SupabaseDatabaseService:
-    def __init__(self, table_name: str, response_model: Any):
+    def __init__(self, table_name: str, response_model: Any, client: Optional[Client] = None):
         self.table_name = table_name
         self.response_model = response_model
-        self.client: Client = create_client(
+        # Reuse an application-scoped client when given one
+        self.client: Client = client or create_client(
             url="YOUR_SUPABASE_URL",
             key="YOUR_SUPABASE_SERVICE_KEY"
         )
 
+    @track_upstream("supabase_db", "create")
     async def create(self, data: Dict[str, Any]) -> Any:
         try:
             response = await self.client.from_(self.table_name).insert(data).execute()
@@ -20,6 +23,7 @@ class SupabaseDatabaseService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    @track_upstream("supabase_db", "read")
     async def read(self, id: str) -> Any:
         try:
             response = await self.client.from_(self.table_name).select("*").eq("id", id).execute()
@@ -31,6 +35,7 @@ class SupabaseDatabaseService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    @track_upstream("supabase_db", "update")
     async def update(self, id: str, data: Dict[str, Any]) -> Any:
         try:
             response = await self.client.from_(self.table_name).update(data).eq("id", id).execute()
@@ -40,6 +45,7 @@ class SupabaseDatabaseService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    @track_upstream("supabase_db", "delete")
     async def delete(self, id: str) -> None:
         try:
             response = await self.client.from_(self.table_name).delete().eq("id", id).execute()
@@ -0,0 +1,18 @@
+import os
+import sys
+
+# The backend is imported as ``app`` (``uvicorn app.main:app`` from backend/).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings() is built at import time and these have no defaults.
+_REQUIRED = (
+    "SUPABASE_URL",
+    "SUPABASE_SERVICE_KEY",
+    "OPENAI_API_KEY",
+    "ANTHROPIC_API_KEY",
+    "QDRANT_URL",
+    "QDRANT_API_KEY",
+    "EMBEDDING_API_URL",
+)
+for _name in _REQUIRED:
+    os.environ.setdefault(_name, "test")
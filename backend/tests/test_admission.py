@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from app.core import admission
+from app.core.admission import AdmissionRejected, ConcurrencyLimiter
+
+
+def test_slot_handed_over_as_wait_times_out_is_released(monkeypatch):
+    limiter = ConcurrencyLimiter("r", limit=1, max_queue=4, queue_timeout=1.0)
+
+    async def late_timeout(fut, timeout):
+        # release() hands the slot to the waiter, then the wait still times out
+        # (what wait_for can do on Python >= 3.12).
+        limiter.release()
+        assert fut.done() and not fut.cancelled()
+        raise asyncio.TimeoutError
+
+    async def scenario():
+        await limiter.acquire()
+        monkeypatch.setattr(admission.asyncio, "wait_for", late_timeout)
+        with pytest.raises(AdmissionRejected):
+            await limiter.acquire()
+
+    asyncio.run(scenario())
+    assert limiter.active == 0
+    assert limiter.idle()
+    assert limiter.rejected == 1
+
+
+def test_queue_wait_timeout_rejects_and_keeps_capacity():
+    limiter = ConcurrencyLimiter("r", limit=1, max_queue=4, queue_timeout=0.01)
+
+    async def scenario():
+        await limiter.acquire()
+        with pytest.raises(AdmissionRejected):
+            await limiter.acquire()
+        limiter.release()
+        assert await limiter.acquire() == 0.0
+
+    asyncio.run(scenario())
+    assert limiter.active == 1
+    assert limiter.waiting == 0
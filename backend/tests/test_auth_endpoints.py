@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_auth_service
+from app.api.v1.endpoints import auth
+from app.core.security import get_current_user
+from app.services import supabase_auth
+from app.services.supabase_auth import SupabaseAuthService
+
+
+class StubAuth:
+    """Synchronous like supabase-py 2.x's ``client.auth``; remembers the session it signed in."""
+
+    def __init__(self):
+        self.session = None
+        self.admin = SimpleNamespace(sign_out=self._admin_sign_out)
+        self.admin_signed_out = []
+
+    def sign_in_with_password(self, credentials):
+        if credentials["password"] != "secret":
+            raise ValueError("Invalid login credentials")
+        self.session = SimpleNamespace(access_token=f"token-for-{credentials['email']}")
+        return SimpleNamespace(session=self.session)
+
+    def _admin_sign_out(self, jwt):
+        self.admin_signed_out.append(jwt)
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    shared = StubAuth()
+    per_call = []
+
+    def create_client(url, key, options=None):
+        assert options is not None and not options.persist_session and not options.auto_refresh_token
+        per_call.append(StubAuth())
+        return SimpleNamespace(auth=per_call[-1])
+
+    monkeypatch.setattr(supabase_auth, "create_client", create_client)
+    return shared, per_call
+
+
+def _client(shared):
+    app = FastAPI()
+    app.include_router(auth.router)
+    service = SupabaseAuthService("https://project.supabase.co", "service-key", client=SimpleNamespace(auth=shared))
+    app.dependency_overrides[get_auth_service] = lambda: service
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="user-1")
+    return TestClient(app)
+
+
+def test_login_returns_access_token_without_touching_shared_client(clients):
+    shared, per_call = clients
+    client = _client(shared)
+    for email in ("a@example.com", "b@example.com"):
+        response = client.post("/login", json={"email": email, "password": "secret"})
+        assert response.status_code == 200
+        assert response.json() == {"access_token": f"token-for-{email}", "token_type": "bearer"}
+    assert shared.session is None
+    assert len(per_call) == 2
+
+
+def test_login_with_bad_password_is_401(clients):
+    shared, _ = clients
+    response = _client(shared).post("/login", json={"email": "a@example.com", "password": "nope"})
+    assert response.status_code == 401
+    assert "Invalid login credentials" in response.json()["detail"]
+
+
+def test_logout_ends_the_callers_session(clients):
+    shared, _ = clients
+    response = _client(shared).post("/logout", headers={"Authorization": "Bearer caller-token"})
+    assert response.status_code == 200
+    assert shared.admin_signed_out == ["caller-token"]
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.services.embedding_batcher import EmbeddingBatcher, embed_unbatched, split_batches
+
+
+class FakeService:
+    def __init__(self):
+        self.calls = []
+
+    async def get_embeddings_batch(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+
+def test_oversized_text_rejects_request_before_queueing_any():
+    batcher = EmbeddingBatcher(FakeService(), max_batch_tokens=10)
+
+    async def scenario():
+        with pytest.raises(ValueError, match="Text 1 "):
+            await batcher.embed(["short", "x" * 100, "short"])
+        return batcher._queue.qsize()
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_batcher_embeds_in_input_order():
+    service = FakeService()
+
+    async def scenario():
+        batcher = EmbeddingBatcher(service, max_batch_size=2, window=0.001)
+        batcher.start()
+        try:
+            return await batcher.embed(["a", "bb", "ccc"])
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(scenario()) == [[1.0], [2.0], [3.0]]
+
+
+def test_split_batches_respects_size_and_tokens():
+    assert split_batches(["a"] * 5, max_batch_size=2, max_batch_tokens=100) == [["a", "a"], ["a", "a"], ["a"]]
+    # each "x" * 8 is ~3 tokens
+    assert split_batches(["x" * 8] * 3, max_batch_size=10, max_batch_tokens=6) == [["x" * 8] * 2, ["x" * 8]]
+
+
+def test_unbatched_path_applies_the_same_limits():
+    service = FakeService()
+    vectors = asyncio.run(embed_unbatched(service, ["a", "bb", "ccc"], max_batch_size=2))
+    assert vectors == [[1.0], [2.0], [3.0]]
+    assert service.calls == [["a", "bb"], ["ccc"]]
+    with pytest.raises(ValueError):
+        asyncio.run(embed_unbatched(service, ["x" * 100], max_batch_tokens=10))
+    assert len(service.calls) == 2
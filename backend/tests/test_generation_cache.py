@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+from app.services.generation_cache import BYPASS, COALESCED, HIT, MISS, GenerationCache, SQLiteCache
+
+
+def _upstream(calls):
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"text": "ok"}
+    return generate
+
+
+def test_nondeterministic_requests_coalesce_but_are_not_stored():
+    cache = GenerationCache()
+    calls = []
+
+    async def scenario():
+        fn = _upstream(calls)
+        results = await asyncio.gather(*(cache.get_or_generate("p", 16, 0.7, fn) for _ in range(3)))
+        again = await cache.get_or_generate("p", 16, 0.7, fn)
+        return [status for _, status in results], again[1]
+
+    statuses, again = asyncio.run(scenario())
+    assert sorted(statuses) == [BYPASS, COALESCED, COALESCED]
+    assert again == BYPASS
+    assert len(calls) == 2
+    assert len(cache.memory) == 0
+
+
+def test_deterministic_requests_are_cached():
+    cache = GenerationCache()
+    calls = []
+
+    async def scenario():
+        fn = _upstream(calls)
+        first = await cache.get_or_generate("p", 16, 0.0, fn)
+        second = await cache.get_or_generate("p", 16, 0.0, fn)
+        return first[1], second[1]
+
+    assert asyncio.run(scenario()) == (MISS, HIT)
+    assert len(calls) == 1
+
+
+def test_sqlite_purges_expired_rows_every_n_writes(tmp_path):
+    store = SQLiteCache(str(tmp_path / "cache.db"), ttl=3600.0, purge_every=3)
+    store._set("old", "v")
+    store._conn.execute("UPDATE generations SET expires = ?", (time.time() - 1,))
+    store._set("a", "v")
+    assert store._conn.execute("SELECT COUNT(*) FROM generations").fetchone()[0] == 2
+    store._set("b", "v")
+    keys = {row[0] for row in store._conn.execute("SELECT key FROM generations")}
+    assert keys == {"a", "b"}
+    store.close()
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import time
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from app.core.jwt_verifier import JWKSCache, JWTVerifier, TokenError
+
+SECRET = "test-secret-with-at-least-32-bytes!!"
+JWKS_URL = "https://project.supabase.co/auth/v1/.well-known/jwks.json"
+
+
+def _rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _jwk(private_key, kid):
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid=kid, use="sig", alg="RS256")
+    return jwk
+
+
+def _claims(**overrides):
+    claims = {"sub": "user-1", "aud": "authenticated", "exp": int(time.time()) + 300}
+    claims.update(overrides)
+    return claims
+
+
+class JWKSServer:
+    """Serves a mutable key set through httpx.MockTransport and counts fetches."""
+
+    def __init__(self, *jwks):
+        self.keys = list(jwks)
+        self.fetches = 0
+
+    def handler(self, request):
+        self.fetches += 1
+        return httpx.Response(200, json={"keys": self.keys})
+
+    def cache(self, **kwargs):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        return JWKSCache(JWKS_URL, client=client, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def rsa_key():
+    return _rsa_key()
+
+
+def test_hs256_valid_token():
+    verifier = JWTVerifier(secret=SECRET)
+    token = jwt.encode(_claims(), SECRET, algorithm="HS256")
+    assert asyncio.run(verifier.verify(token))["sub"] == "user-1"
+
+
+def test_hs256_expired_token_rejected():
+    verifier = JWTVerifier(secret=SECRET)
+    token = jwt.encode(_claims(exp=int(time.time()) - 10), SECRET, algorithm="HS256")
+    with pytest.raises(TokenError, match="expired"):
+        asyncio.run(verifier.verify(token))
+
+
+def test_wrong_audience_rejected():
+    verifier = JWTVerifier(secret=SECRET)
+    token = jwt.encode(_claims(aud="someone-else"), SECRET, algorithm="HS256")
+    with pytest.raises(TokenError, match="[Aa]udience"):
+        asyncio.run(verifier.verify(token))
+
+
+def test_hs256_bad_signature_rejected():
+    verifier = JWTVerifier(secret=SECRET)
+    token = jwt.encode(_claims(), "another-secret-with-at-least-32-bytes", algorithm="HS256")
+    with pytest.raises(TokenError, match="[Ss]ignature"):
+        asyncio.run(verifier.verify(token))
+
+
+def test_rs256_valid_token(rsa_key):
+    server = JWKSServer(_jwk(rsa_key, "k1"))
+    verifier = JWTVerifier(jwks=server.cache())
+    token = jwt.encode(_claims(), rsa_key, algorithm="RS256", headers={"kid": "k1"})
+    assert asyncio.run(verifier.verify(token))["sub"] == "user-1"
+    assert server.fetches == 1
+
+
+def test_rs256_bad_signature_rejected(rsa_key):
+    server = JWKSServer(_jwk(rsa_key, "k1"))
+    verifier = JWTVerifier(jwks=server.cache())
+    token = jwt.encode(_claims(), _rsa_key(), algorithm="RS256", headers={"kid": "k1"})
+    with pytest.raises(TokenError, match="[Ss]ignature"):
+        asyncio.run(verifier.verify(token))
+
+
+def test_rs256_expired_token_rejected(rsa_key):
+    server = JWKSServer(_jwk(rsa_key, "k1"))
+    verifier = JWTVerifier(jwks=server.cache())
+    token = jwt.encode(_claims(exp=int(time.time()) - 10), rsa_key, algorithm="RS256", headers={"kid": "k1"})
+    with pytest.raises(TokenError, match="expired"):
+        asyncio.run(verifier.verify(token))
+
+
+def test_first_lookup_fetches_even_right_after_boot(rsa_key, monkeypatch):
+    # time.monotonic() can be smaller than min_refresh_interval on a fresh host.
+    monkeypatch.setattr("app.core.jwt_verifier.time.monotonic", lambda: 1.0)
+    server = JWKSServer(_jwk(rsa_key, "k1"))
+    cache = server.cache(min_refresh_interval=30.0)
+    asyncio.run(cache.get("k1"))
+    assert server.fetches == 1
+
+
+def test_unknown_kid_refreshes_and_is_throttled(rsa_key):
+    server = JWKSServer(_jwk(rsa_key, "k1"))
+    cache = server.cache(min_refresh_interval=30.0)
+    verifier = JWTVerifier(jwks=cache)
+
+    async def scenario():
+        await cache.get("k1")
+        rotated = _rsa_key()
+        server.keys.append(_jwk(rotated, "k2"))
+        token = jwt.encode(_claims(), rotated, algorithm="RS256", headers={"kid": "k2"})
+
+        # Within the throttle window an unknown kid does not trigger a fetch.
+        with pytest.raises(TokenError, match="Unknown signing key id"):
+            await verifier.verify(token)
+        with pytest.raises(TokenError, match="Unknown signing key id"):
+            await cache.get("garbage")
+        assert server.fetches == 1
+
+        # Once the window has passed the rotated key is picked up with one fetch.
+        cache.fetched_at -= 31.0
+        assert (await verifier.verify(token))["sub"] == "user-1"
+        assert server.fetches == 2
+
+    asyncio.run(scenario())
+
+
+def test_claims_are_cached_until_expiry(monkeypatch):
+    verifier = JWTVerifier(secret=SECRET)
+    token = jwt.encode(_claims(), SECRET, algorithm="HS256")
+    first = asyncio.run(verifier.verify(token))
+
+    def no_decode(*args, **kwargs):
+        raise AssertionError("cached token was decoded again")
+
+    monkeypatch.setattr("app.core.jwt_verifier.jwt.decode", no_decode)
+    assert asyncio.run(verifier.verify(token)) is first
+
+    verifier._claims[token] = (time.time() - 1, first)
+    with pytest.raises(AssertionError, match="decoded again"):
+        asyncio.run(verifier.verify(token))
+    assert token not in verifier._claims
+
+
+def test_claims_cache_is_bounded():
+    verifier = JWTVerifier(secret=SECRET, cache_size=2)
+    tokens = [jwt.encode(_claims(sub=f"user-{i}"), SECRET, algorithm="HS256") for i in range(3)]
+    for token in tokens:
+        asyncio.run(verifier.verify(token))
+    assert list(verifier._claims) == tokens[1:]
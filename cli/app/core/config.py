@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from pydantic import BaseSettings
 
 
 class CLISettings(BaseSettings):
     api_url: str = "http://localhost:8000"
     timeout: int = 30
+    qdrant_url: Optional[str] = None  # or ":memory:" for the in-process engine
+    qdrant_api_key: Optional[str] = None
 
     class Config:
         env_file = ".env"
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import requests
 
 from ..core.state import load_app_config, save_app_config
+from .http_session import HTTPSession, RequestTiming
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return bool(value)
 
 
 @dataclass
@@ -14,6 +22,9 @@ class AppSettings:
     token: Optional[str] = None
     generate_endpoint: str = "/api/v1/codex/generate"
     health_endpoint: str = "/api/v1/health/health"
+    retries: int = 3
+    backoff_factor: float = 0.3
+    gzip_requests: bool = False
 
     @staticmethod
     def from_config() -> "AppSettings":
@@ -23,24 +34,48 @@ class AppSettings:
             token=cfg.get("token"),
             generate_endpoint=cfg.get("generate_endpoint", "/api/v1/codex/generate"),
             health_endpoint=cfg.get("health_endpoint", "/api/v1/health/health"),
+            retries=int(cfg.get("retries", 3)),
+            backoff_factor=float(cfg.get("backoff_factor", 0.3)),
+            gzip_requests=_as_bool(cfg.get("gzip_requests", False)),
         )
 
     def persist(self) -> None:
         cfg = load_app_config()
-        cfg.update(
-            {
-                "api_url": self.api_url,
-                "token": self.token,
-                "generate_endpoint": self.generate_endpoint,
-                "health_endpoint": self.health_endpoint,
-            }
-        )
+        updates = {
+            "api_url": self.api_url,
+            "token": self.token,
+            "generate_endpoint": self.generate_endpoint,
+            "health_endpoint": self.health_endpoint,
+        }
+        # Skip the rewrite when nothing changed (e.g. logout without a token)
+        if all(cfg.get(k) == v for k, v in updates.items()):
+            return
+        cfg.update(updates)
         save_app_config(cfg)
 
 
 class AppClient:
-    def __init__(self, settings: Optional[AppSettings] = None):
+    """Backend client sharing one keep-alive connection pool across calls.
+
+    Idempotent requests (``health``) are retried with backoff; POSTs are sent
+    once. Set ``timing=True`` to collect per-request phase timings.
+    """
+
+    def __init__(self, settings: Optional[AppSettings] = None, timing: bool = False):
         self.settings = settings or AppSettings.from_config()
+        self.http = HTTPSession(
+            retries=self.settings.retries,
+            backoff_factor=self.settings.backoff_factor,
+            gzip_requests=self.settings.gzip_requests,
+            timing=timing,
+        )
+
+    @property
+    def timings(self) -> List[RequestTiming]:
+        return self.http.timings
+
+    def close(self) -> None:
+        self.http.close()
 
     def _headers(self) -> Dict[str, str]:
         headers: Dict[str, str] = {"Content-Type": "application/json"}
@@ -50,42 +85,63 @@ class AppClient:
 
     def login(self, email: str, password: str) -> Dict[str, Any]:
         url = f"{self.settings.api_url}/api/v1/auth/login"
-        resp = requests.post(url, json={"email": email, "password": password}, timeout=30)
+        resp = self.http.request("POST", url, json={"email": email, "password": password}, timeout=30)
         resp.raise_for_status()
         data = resp.json()
         token = data.get("access_token")
-        if token:
+        if token and token != self.settings.token:
             self.settings.token = token
             self.settings.persist()
         return data
 
     def logout(self) -> Dict[str, Any]:
         url = f"{self.settings.api_url}/api/v1/auth/logout"
-        resp = requests.post(url, headers=self._headers(), timeout=30)
+        resp = self.http.request("POST", url, headers=self._headers(), timeout=30)
         resp.raise_for_status()
         # Clear local token
-        self.settings.token = None
-        self.settings.persist()
+        if self.settings.token is not None:
+            self.settings.token = None
+            self.settings.persist()
         return resp.json()
 
     def register(self, email: str, password: str) -> Dict[str, Any]:
         url = f"{self.settings.api_url}/api/v1/auth/register"
-        resp = requests.post(url, json={"email": email, "password": password}, timeout=30)
+        resp = self.http.request("POST", url, json={"email": email, "password": password}, timeout=30)
         resp.raise_for_status()
         return resp.json()
 
     def generate(self, prompt: str, max_tokens: int = 100) -> Dict[str, Any]:
         url = f"{self.settings.api_url}{self.settings.generate_endpoint}"
         payload = {"prompt": prompt, "max_tokens": max_tokens}
-        resp = requests.post(url, headers=self._headers(), json=payload, timeout=60)
+        resp = self.http.request("POST", url, headers=self._headers(), json=payload, timeout=60)
         resp.raise_for_status()
         return resp.json()
 
+    def generate_stream(self, prompt: str, max_tokens: int = 100) -> Iterator[str]:
+        """Yield tokens from the NDJSON streaming endpoint as they arrive."""
+        url = f"{self.settings.api_url}{self.settings.generate_endpoint}/stream"
+        payload = {"prompt": prompt, "max_tokens": max_tokens}
+        resp = self.http.request("POST", url, headers=self._headers(), json=payload, timeout=60, stream=True)
+        try:
+            resp.raise_for_status()
+            for line in resp.iter_lines(chunk_size=None, decode_unicode=True):
+                if not line:
+                    continue
+                event = json.loads(line)
+                if "error" in event:
+                    raise RuntimeError(event["error"])
+                if event.get("done"):
+                    break
+                token = event.get("token")
+                if token:
+                    yield token
+        finally:
+            resp.close()
+
     def health(self) -> bool:
         url = f"{self.settings.api_url}{self.settings.health_endpoint}"
         try:
-            r = requests.get(url, timeout=5)
+            r = self.http.request("GET", url, timeout=5)
             return r.status_code == 200
         except requests.RequestException:
             return False
-
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import gzip
+import json as _json
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+@dataclass
+class RequestTiming:
+    """Phase timings for one HTTP request, in milliseconds.
+
+    ``dns_ms`` and ``connect_ms`` are zero when a pooled keep-alive connection
+    was reused. ``connect_ms`` includes the TLS handshake for HTTPS.
+    ``ttfb_ms`` runs from the request being sent to the first response byte
+    (status line and headers parsed), so it excludes connection setup.
+    """
+
+    method: str
+    url: str
+    status: Optional[int] = None
+    reused: bool = True
+    dns_ms: float = 0.0
+    connect_ms: float = 0.0
+    ttfb_ms: float = 0.0
+    total_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+_active = threading.local()
+
+
+def _current() -> Optional[RequestTiming]:
+    return getattr(_active, "timing", None)
+
+
+class _TimedConnectionMixin:
+    """Record DNS, connect/TLS and time-to-first-byte into the request being sent."""
+
+    def _new_conn(self):  # type: ignore[override]
+        timing = _current()
+        if timing is None:
+            return super()._new_conn()  # type: ignore[misc]
+        host = self._dns_host  # type: ignore[attr-defined]
+        t0 = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)  # type: ignore[attr-defined]
+        except OSError:
+            infos = []
+        timing.dns_ms = (time.perf_counter() - t0) * 1000
+        if infos:
+            # Connect to the address we just resolved so DNS is not paid twice
+            self._dns_host = infos[0][4][0]  # type: ignore[attr-defined]
+        try:
+            return super()._new_conn()  # type: ignore[misc]
+        finally:
+            self._dns_host = host  # type: ignore[attr-defined]
+
+    def connect(self):  # type: ignore[override]
+        timing = _current()
+        if timing is None:
+            return super().connect()  # type: ignore[misc]
+        t0 = time.perf_counter()
+        try:
+            return super().connect()  # type: ignore[misc]
+        finally:
+            timing.reused = False
+            timing.connect_ms = max(0.0, (time.perf_counter() - t0) * 1000 - timing.dns_ms)
+
+    def getresponse(self, *args: Any, **kwargs: Any):  # type: ignore[override]
+        # Called once the request is on the wire; returns when the response starts
+        timing = _current()
+        t0 = time.perf_counter()
+        try:
+            return super().getresponse(*args, **kwargs)  # type: ignore[misc]
+        finally:
+            if timing is not None:
+                timing.ttfb_ms = (time.perf_counter() - t0) * 1000
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimingAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools use connection classes that report phase timings."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def _retry_policy(retries: int, backoff_factor: float) -> Retry:
+    kwargs: Dict[str, Any] = {
+        "total": retries,
+        "connect": retries,
+        "read": retries,
+        "status": retries,
+        "backoff_factor": backoff_factor,
+        "status_forcelist": (429, 502, 503, 504),
+        "respect_retry_after_header": True,
+        "raise_on_status": False,
+    }
+    try:
+        return Retry(allowed_methods=IDEMPOTENT_METHODS, **kwargs)
+    except TypeError:  # urllib3 < 1.26
+        return Retry(method_whitelist=IDEMPOTENT_METHODS, **kwargs)
+
+
+class HTTPSession:
+    """Persistent keep-alive ``requests.Session`` with retries, gzip and timing.
+
+    Retries with exponential backoff apply only to idempotent methods; POSTs
+    are attempted once. JSON bodies larger than ``gzip_min_bytes`` are sent
+    with ``Content-Encoding: gzip`` when ``gzip_requests`` is enabled.
+    """
+
+    def __init__(
+        self,
+        retries: int = 3,
+        backoff_factor: float = 0.3,
+        pool_maxsize: int = 10,
+        gzip_requests: bool = False,
+        gzip_min_bytes: int = 1024,
+        timing: bool = False,
+    ) -> None:
+        self.gzip_requests = gzip_requests
+        self.gzip_min_bytes = gzip_min_bytes
+        self.timing = timing
+        self.timings: List[RequestTiming] = []
+
+        adapter_cls = TimingAdapter if timing else HTTPAdapter
+        adapter = adapter_cls(
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=_retry_policy(retries, backoff_factor),
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+        **kwargs: Any,
+    ) -> requests.Response:
+        hdrs = dict(headers or {})
+        data = None
+        if json is not None:
+            data = _json.dumps(json, ensure_ascii=False).encode("utf-8")
+            hdrs.setdefault("Content-Type", "application/json")
+            if self.gzip_requests and len(data) >= self.gzip_min_bytes:
+                data = gzip.compress(data, compresslevel=5)
+                hdrs["Content-Encoding"] = "gzip"
+
+        if not self.timing:
+            return self.session.request(method, url, data=data, headers=hdrs, timeout=timeout, **kwargs)
+
+        timing = RequestTiming(method=method.upper(), url=url)
+        _active.timing = timing
+        t0 = time.perf_counter()
+        try:
+            resp = self.session.request(method, url, data=data, headers=hdrs, timeout=timeout, **kwargs)
+        finally:
+            _active.timing = None
+            timing.total_ms = (time.perf_counter() - t0) * 1000
+            self.timings.append(timing)
+        timing.status = resp.status_code
+        return resp
+
+    def close(self) -> None:
+        self.session.close()
@@ -1,2 +1,3 @@
-__all__ = []
+from .qdrant_service import QdrantService, QdrantServiceError, SearchHit, UpsertReport
 
+__all__ = ["QdrantService", "QdrantServiceError", "SearchHit", "UpsertReport"]
@@ -1,12 +1,284 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+
+class QdrantServiceError(RuntimeError):
+    pass
+
+
+@dataclass
+class UpsertReport:
+    points: int
+    batches: int
+    seconds: float
+
+    @property
+    def points_per_sec(self) -> float:
+        return self.points / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.points} points in {self.batches} batches, "
+            f"{self.seconds:.2f}s ({self.points_per_sec:,.0f} points/sec)"
+        )
+
+
+@dataclass
+class SearchHit:
+    id: Union[str, int]
+    score: float
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+FilterSpec = Union[Mapping[str, Any], Any]
+
+_DISTANCES = {"cosine": "COSINE", "dot": "DOT", "euclid": "EUCLID", "manhattan": "MANHATTAN"}
+
 
 class QdrantService:
-    """Placeholder for Qdrant client wrappers for CLI usage."""
+    """Async Qdrant wrapper for CLI usage.
+
+    ``location=":memory:"`` runs qdrant-client's in-process engine, which is
+    handy for tests and benchmarks (HNSW params and quantization are accepted
+    but search is exact there). Otherwise ``url``/``api_key`` default to the
+    ``QDRANT_URL``/``QDRANT_API_KEY`` environment variables.
+
+    Upserts are split into ``batch_size`` chunks, ``parallel`` of which are
+    in flight at once; ``ef`` sets the default HNSW search breadth.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        location: Optional[str] = None,
+        path: Optional[str] = None,
+        batch_size: int = 256,
+        parallel: int = 4,
+        ef: Optional[int] = None,
+        timeout: Optional[int] = None,
+        prefer_grpc: bool = False,
+    ) -> None:
+        try:
+            from qdrant_client import AsyncQdrantClient, models
+        except Exception as e:  # noqa: BLE001
+            raise QdrantServiceError(
+                "qdrant-client is required. Install with: pip install 'qdrant-client>=1.10'"
+            ) from e
+        self.models = models
+        if location is None and path is None:
+            url = url or os.getenv("QDRANT_URL")
+            api_key = api_key or os.getenv("QDRANT_API_KEY")
+            if not url:
+                raise QdrantServiceError("No Qdrant url configured (set QDRANT_URL or pass location=':memory:')")
+        self.local = location is not None or path is not None
+        if self.local:
+            self.client = AsyncQdrantClient(location=location, path=path)
+        else:
+            self.client = AsyncQdrantClient(url=url, api_key=api_key, timeout=timeout, prefer_grpc=prefer_grpc)
+        self.batch_size = max(1, batch_size)
+        self.parallel = max(1, parallel)
+        self.ef = ef
+
+    @classmethod
+    def from_settings(cls, settings: Any, **kwargs: Any) -> "QdrantService":
+        """Build from any settings object carrying ``qdrant_url``/``qdrant_api_key``."""
+        url = getattr(settings, "qdrant_url", None)
+        if url == ":memory:":
+            return cls(location=url, **kwargs)
+        return cls(url=url, api_key=getattr(settings, "qdrant_api_key", None), **kwargs)
+
+    async def ensure_collection(
+        self,
+        collection: str,
+        size: int,
+        distance: str = "cosine",
+        on_disk: bool = False,
+        quantization: Optional[str] = None,
+        quantile: float = 0.99,
+        quantized_in_ram: bool = True,
+        hnsw_m: Optional[int] = None,
+        ef_construct: Optional[int] = None,
+        recreate: bool = False,
+    ) -> bool:
+        """Create ``collection`` unless it exists; return True if it was created.
+
+        ``on_disk`` keeps original vectors memory-mapped; ``quantization="int8"``
+        adds scalar-quantized copies (held in RAM when ``quantized_in_ram``) that
+        searches use first, rescoring against the originals.
+        """
+        m = self.models
+        exists = await self.client.collection_exists(collection)
+        if exists and not recreate:
+            return False
+        if exists:
+            await self.client.delete_collection(collection)
+        try:
+            metric = getattr(m.Distance, _DISTANCES[distance.lower()])
+        except KeyError:
+            raise QdrantServiceError(f"Unknown distance: {distance}") from None
+        quant_config = None
+        if quantization == "int8":
+            quant_config = m.ScalarQuantization(
+                scalar=m.ScalarQuantizationConfig(
+                    type=m.ScalarType.INT8, quantile=quantile, always_ram=quantized_in_ram
+                )
+            )
+        elif quantization is not None:
+            raise QdrantServiceError(f"Unsupported quantization: {quantization} (expected 'int8')")
+        hnsw_config = None
+        if hnsw_m is not None or ef_construct is not None:
+            hnsw_config = m.HnswConfigDiff(m=hnsw_m, ef_construct=ef_construct)
+        await self.client.create_collection(
+            collection_name=collection,
+            vectors_config=m.VectorParams(size=size, distance=metric, on_disk=on_disk),
+            quantization_config=quant_config,
+            hnsw_config=hnsw_config,
+        )
+        return True
+
+    async def upsert(
+        self,
+        collection: str,
+        vectors: Sequence[Sequence[float]],
+        payloads: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+        ids: Optional[Sequence[Union[str, int]]] = None,
+        batch_size: Optional[int] = None,
+        parallel: Optional[int] = None,
+        wait: bool = True,
+    ) -> UpsertReport:
+        """Upsert points in chunks uploaded concurrently; ids default to random UUIDs."""
+        n = len(vectors)
+        if payloads is not None and len(payloads) != n:
+            raise QdrantServiceError(f"Got {len(payloads)} payloads for {n} vectors")
+        if ids is not None and len(ids) != n:
+            raise QdrantServiceError(f"Got {len(ids)} ids for {n} vectors")
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in range(n)]
+        size = max(1, batch_size or self.batch_size)
+        sem = asyncio.Semaphore(max(1, parallel or self.parallel))
+        PointStruct = self.models.PointStruct
+
+        async def send(start: int) -> None:
+            async with sem:  # build points lazily so only `parallel` chunks are materialised
+                points = [
+                    PointStruct(
+                        id=ids[i],
+                        vector=[float(x) for x in vectors[i]],
+                        payload=(payloads[i] if payloads is not None else None) or {},
+                    )
+                    for i in range(start, min(start + size, n))
+                ]
+                await self.client.upsert(collection_name=collection, points=points, wait=wait)
+
+        t0 = time.perf_counter()
+        starts = range(0, n, size)
+        await asyncio.gather(*(send(s) for s in starts))
+        return UpsertReport(points=n, batches=len(starts), seconds=time.perf_counter() - t0)
+
+    def build_filter(self, spec: Optional[FilterSpec]) -> Any:
+        """Turn ``{"field": value}`` into a Qdrant filter; conditions are ANDed.
+
+        Values may be a scalar (exact match), a list (match any) or a dict of
+        ``gt``/``gte``/``lt``/``lte`` bounds. ``models.Filter`` passes through.
+        """
+        if spec is None or isinstance(spec, self.models.Filter):
+            return spec
+        m = self.models
+        must = []
+        for key, value in spec.items():
+            if isinstance(value, Mapping):
+                must.append(m.FieldCondition(key=key, range=m.Range(**value)))
+            elif isinstance(value, (list, tuple, set)):
+                must.append(m.FieldCondition(key=key, match=m.MatchAny(any=list(value))))
+            else:
+                must.append(m.FieldCondition(key=key, match=m.MatchValue(value=value)))
+        return m.Filter(must=must)
+
+    def _params(self, ef: Optional[int], exact: bool) -> Any:
+        ef = ef if ef is not None else self.ef
+        if self.local or (ef is None and not exact):  # local mode is always exact
+            return None
+        return self.models.SearchParams(hnsw_ef=ef, exact=exact)
+
+    @staticmethod
+    def _hits(points: Sequence[Any]) -> List[SearchHit]:
+        return [SearchHit(id=p.id, score=p.score, payload=p.payload or {}) for p in points]
+
+    async def search(
+        self,
+        collection: str,
+        vector: Sequence[float],
+        limit: int = 5,
+        filter: Optional[FilterSpec] = None,
+        ef: Optional[int] = None,
+        exact: bool = False,
+        score_threshold: Optional[float] = None,
+        with_payload: bool = True,
+    ) -> List[SearchHit]:
+        res = await self.client.query_points(
+            collection_name=collection,
+            query=[float(x) for x in vector],
+            limit=limit,
+            query_filter=self.build_filter(filter),
+            search_params=self._params(ef, exact),
+            score_threshold=score_threshold,
+            with_payload=with_payload,
+        )
+        return self._hits(res.points)
+
+    async def search_batch(
+        self,
+        collection: str,
+        vectors: Sequence[Sequence[float]],
+        limit: int = 5,
+        filter: Optional[FilterSpec] = None,
+        ef: Optional[int] = None,
+        exact: bool = False,
+        with_payload: bool = True,
+    ) -> List[List[SearchHit]]:
+        """Run several queries in one request; results follow input order."""
+        m = self.models
+        query_filter = self.build_filter(filter)
+        params = self._params(ef, exact)
+        requests = [
+            m.QueryRequest(
+                query=[float(x) for x in v],
+                limit=limit,
+                filter=query_filter,
+                params=params,
+                with_payload=with_payload,
+            )
+            for v in vectors
+        ]
+        responses = await self.client.query_batch_points(collection_name=collection, requests=requests)
+        return [self._hits(r.points) for r in responses]
+
+    async def count(self, collection: str, filter: Optional[FilterSpec] = None) -> int:
+        res = await self.client.count(
+            collection_name=collection, count_filter=self.build_filter(filter), exact=True
+        )
+        return res.count
+
+    async def delete(self, collection: str, ids: Sequence[Union[str, int]]) -> None:
+        await self.client.delete(
+            collection_name=collection, points_selector=self.models.PointIdsList(points=list(ids))
+        )
+
+    async def delete_collection(self, collection: str) -> None:
+        await self.client.delete_collection(collection)
 
-    async def upsert(self, collection: str, vectors):
-        raise NotImplementedError
+    async def close(self) -> None:
+        await self.client.close()
 
-    async def search(self, collection: str, vector, limit: int = 5):
-        raise NotImplementedError
+    async def __aenter__(self) -> "QdrantService":
+        return self
 
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
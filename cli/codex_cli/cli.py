@@ -9,15 +9,17 @@ from typing import Any, Dict, List
 
 import yaml
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.table import Table
 from rich.theme import Theme
 
-from .embeddings import EmbeddingConfig, Embeddings
-from .lancedb_store import LanceDBStore
+from .remote import open_backends
 from .utils.context_manager import ContextManager, RetrievalConfig
-from .utils.logger import setup_logger
+from .utils.logger import setup_logger, shutdown_logger
 from gutil.CodexBridge import CodexCLI, CodexCLIError
+from gutil.Tracing import tracer
 
 
 def load_config(path: str) -> Dict[str, Any]:
@@ -67,58 +69,118 @@ def build_prompt(user_text: str, retrieved: List[dict]) -> str:
     if not retrieved:
         return user_text
     examples = []
+    snippets = []
     for r in retrieved:
+        if r.get("path"):
+            snippets.append(f"{r['path']}:{r.get('start_line')}-{r.get('end_line')}\n{r.get('text', '').rstrip()}")
+            continue
         p = r.get("prompt", "").strip()
         a = r.get("response", "").strip()
         examples.append(f"User:\n{p}\n\nAssistant:\n{a}")
-    prefix = (
-        "You are a coding assistant. Consider the following prior examples as context.\n"
-        "Use them only when relevant and avoid repeating mistakes.\n\n"
-    )
-    return prefix + "\n\n".join(examples) + "\n\nCurrent instruction:\n" + user_text
+    parts = []
+    if examples:
+        parts.append(
+            "You are a coding assistant. Consider the following prior examples as context.\n"
+            "Use them only when relevant and avoid repeating mistakes.\n\n" + "\n\n".join(examples)
+        )
+    if snippets:
+        parts.append("Relevant code from the repository:\n\n" + "\n\n".join(snippets))
+    return "\n\n".join(parts) + "\n\nCurrent instruction:\n" + user_text
+
+
+def stats_table(stats: Dict[str, Dict[str, float]]) -> Table:
+    table = Table(title="Session stages (ms)")
+    table.add_column("stage")
+    for col in ("count", "p50", "p95", "total"):
+        table.add_column(col, justify="right")
+    for name, s in sorted(stats.items(), key=lambda kv: -kv[1]["total_ms"]):
+        table.add_row(
+            name, str(s["count"]), f"{s['p50_ms']:.1f}", f"{s['p95_ms']:.1f}", f"{s['total_ms']:.1f}"
+        )
+    return table
 
 
 def run_repl(config_path: str) -> int:
     cfg = load_config(config_path)
     theme = Theme({"info": "cyan", "ok": "green", "err": "red"})
     console = Console(theme=theme)
-    logger = setup_logger()
-
-    # Initialize components
-    db_uri = cfg.get("db_uri", "./data/codex_memory")
-    table = cfg.get("table", "interactions")
-    store = LanceDBStore(db_uri, table)
+    lcfg = cfg.get("logging", {}) or {}
+    logger = setup_logger(
+        log_path=lcfg.get("path"),
+        level=lcfg.get("level", "INFO"),
+        json_lines=bool(lcfg.get("json", False)),
+        max_bytes=int(lcfg.get("max_bytes", 0)),
+        backup_count=int(lcfg.get("backup_count", 5)),
+        rotate_interval=float(lcfg.get("rotate_interval", 0)),
+        debug_sample_rate=float(lcfg.get("debug_sample_rate", 1.0)),
+    )
 
-    ecfg = cfg.get("embeddings", {})
-    embeddings = Embeddings(
-        EmbeddingConfig(provider=ecfg.get("provider", "fastembed"), model=ecfg.get("model"))
+    # Per-turn span tracing (feeds :stats; optional JSONL file / OTLP export)
+    tcfg = cfg.get("tracing", {}) or {}
+    tracer.configure(
+        enabled=bool(tcfg.get("enable", True)),
+        path=tcfg.get("path"),
+        otlp_endpoint=tcfg.get("otlp_endpoint"),
+        service_name="codex-repl",
     )
 
-    rcfg = cfg.get("retrieval", {})
-    cm = ContextManager(store, embeddings, RetrievalConfig(top_k=int(rcfg.get("top_k", 5))))
+    # Initialize components (served by `gutil daemon` when it is running)
+    store, embeddings, code_index = open_backends(cfg)
 
-    # Optional SQLite history
-    history_cfg = cfg.get("history", {})
-    hist_enabled = bool(history_cfg.get("enable", True))
     hist_db = None
-    if hist_enabled:
-        hist_db = open_history(history_cfg.get("sqlite_path", "./data/history.db"))
-
-    codex_args = cfg.get("codex", {}).get("args", ["--oss"])  # default to local model via codex
-    codex = CodexCLI()
+    try:
+        rcfg = cfg.get("retrieval", {})
+        cm = ContextManager(
+            store,
+            embeddings,
+            RetrievalConfig(top_k=int(rcfg.get("top_k", 5)), code_top_k=int(rcfg.get("code_top_k", 3))),
+            code_index=code_index,
+        )
+
+        # Optional SQLite history
+        history_cfg = cfg.get("history", {})
+        hist_enabled = bool(history_cfg.get("enable", True))
+        if hist_enabled:
+            hist_db = open_history(history_cfg.get("sqlite_path", "./data/history.db"))
+
+        codex_args = cfg.get("codex", {}).get("args", ["--oss"])  # default to local model via codex
+        codex = CodexCLI()
+
+        banner = "Codex REPL with LanceDB Memory. Type :stats for stage timings, :q to quit."
+        console.print(Panel(banner, title="gutil codex-repl"))
+        while True:
+            try:
+                user_text = Prompt.ask("[info]You[/info]")
+            except (KeyboardInterrupt, EOFError):
+                console.print("\n[info]Goodbye![/info]")
+                break
+            if not user_text:
+                continue
+            if user_text.strip() in {":q", ":quit", ":exit"}:
+                break
+            if user_text.strip() == ":stats":
+                stats = tracer.stats()
+                if stats:
+                    console.print(stats_table(stats))
+                elif not tracer.enabled:
+                    console.print("[info]Tracing is disabled (tracing.enable in config.yaml).[/info]")
+                else:
+                    console.print("[info]No turns recorded yet.[/info]")
+                continue
+            code = _turn(user_text, cm, codex, codex_args, hist_db, console, logger)
+            if code:
+                return code
+    finally:
+        if hist_db is not None:
+            hist_db.close()
+        store.close()
+        tracer.close()
+        shutdown_logger()
+    return 0
 
-    console.print(Panel("Codex REPL with LanceDB Memory. Type :q to quit.", title="gutil codex-repl"))
-    while True:
-        try:
-            user_text = Prompt.ask("[info]You[/info]")
-        except (KeyboardInterrupt, EOFError):
-            console.print("\n[info]Goodbye![/info]")
-            break
-        if not user_text:
-            continue
-        if user_text.strip() in {":q", ":quit", ":exit"}:
-            break
 
+def _turn(user_text, cm, codex, codex_args, hist_db, console, logger) -> int:
+    with tracer.span("turn", chars=len(user_text)):
         # Retrieve related context
         try:
             retrieved = cm.retrieve(user_text)
@@ -126,7 +188,8 @@ def run_repl(config_path: str) -> int:
             logger.exception("Retrieval failed: %s", e)
             retrieved = []
 
-        full_prompt = build_prompt(user_text, retrieved)
+        with tracer.span("build_prompt", examples=len(retrieved)):
+            full_prompt = build_prompt(user_text, retrieved)
 
         # Generate via Codex CLI (exec mode for non-interactive)
         try:
@@ -147,17 +210,16 @@ def run_repl(config_path: str) -> int:
             cm.remember(user_text, response)
         except Exception as e:  # noqa: BLE001
             logger.exception("Failed to store memory: %s", e)
+            console.print(f"[err]Memory not saved: {escape(str(e))}[/err]")
 
         # Also store lightweight history
         if hist_db is not None:
-            hist_db.execute(
-                "INSERT INTO history (ts, prompt, response, tags, tokens) VALUES (strftime('%s','now'), ?, ?, ?, ?)",
-                (user_text, response, json.dumps([]), len(user_text.split()) + len(response.split())),
-            )
-            hist_db.commit()
-
-    if hist_db is not None:
-        hist_db.close()
+            with tracer.span("history.commit"):
+                hist_db.execute(
+                    "INSERT INTO history (ts, prompt, response, tags, tokens) VALUES (strftime('%s','now'), ?, ?, ?, ?)",
+                    (user_text, response, json.dumps([]), len(user_text.split()) + len(response.split())),
+                )
+                hist_db.commit()
     return 0
 
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import math
 from dataclasses import dataclass
 from typing import Iterable, List, Optional
 
@@ -10,8 +12,27 @@ class EmbeddingError(RuntimeError):
 
 @dataclass
 class EmbeddingConfig:
-    provider: str = "fastembed"  # fastembed | openai
+    provider: str = "fastembed"  # fastembed | openai | hash
     model: Optional[str] = None   # optional override
+    dim: Optional[int] = None     # hash provider: vector size (default 384)
+
+
+class _HashEmb:
+    """Deterministic feature-hashing embeddings; no model, for offline tests and benchmarks."""
+
+    def __init__(self, dim: int = 384) -> None:
+        self.dim = dim
+
+    def _vector(self, text: str) -> List[float]:
+        vec = [0.0] * self.dim
+        for token in text.lower().split():
+            h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) else -1.0
+        norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+        return [x / norm for x in vec]
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._vector(t) for t in texts]
 
 
 class Embeddings:
@@ -49,6 +70,8 @@ class Embeddings:
                     return [d.embedding for d in resp.data]
 
             return _OpenAIEmb(model, client)
+        elif cfg.provider == "hash":
+            return _HashEmb(int(cfg.dim or 384))
         else:
             raise EmbeddingError(f"Unknown embeddings provider: {cfg.provider}")
 
@@ -56,11 +79,9 @@ class Embeddings:
         texts = list(texts)
         if not texts:
             return []
-        # fastembed TextEmbedding returns a generator of vectors
-        impl = self._impl
-        if hasattr(impl, "embed"):
-            return impl.embed(texts)  # type: ignore[no-any-return]
-        # fastembed API
-        vecs = impl.embed(texts)  # type: ignore[attr-defined]
+        # fastembed TextEmbedding returns a generator of numpy arrays
+        vecs = self._impl.embed(texts)
+        if isinstance(vecs, list):
+            return vecs
         return [list(v) for v in vecs]
 
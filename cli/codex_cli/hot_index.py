@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .locking import FileLock
+from .quantization import CompactVectors, rescore
+
+
+class HotIndex:
+    """Memory-mapped matrix of normalised embeddings for exact top-k search.
+
+    Three files share the ``base`` path: ``.npy`` (float32 rows, preallocated
+    and doubled when full so appends never rewrite existing rows), ``.ids``
+    (one id per line) and ``.json`` (row count, dim and the LanceDB table
+    version the files mirror). The JSON is written last and atomically, so
+    after a crash anything past its ``count`` is ignored.
+
+    Scores are cosine similarities; ``search`` reports ``2 - 2*cos``, which
+    is the squared L2 distance for unit-length embeddings.
+
+    With ``quantization`` (``int8`` or ``binary``, optionally truncated to
+    ``dims``), the first pass runs over compact codes held in RAM and only the
+    top ``k * rescore`` candidates are read from the memmap and scored exactly,
+    so the full matrix can stay on disk.
+
+    Several processes may share the files: callers hold ``lock`` (a file
+    lock on ``<base>.lock``) around ``refresh`` and any change, and
+    ``refresh`` picks up what another process wrote since.
+    """
+
+    def __init__(
+        self,
+        base: str,
+        max_rows: int = 300_000,
+        quantization: Optional[str] = None,
+        dims: Optional[int] = None,
+        rescore: int = 4,
+    ) -> None:
+        self.npy_path = base + ".npy"
+        self.ids_path = base + ".ids"
+        self.meta_path = base + ".json"
+        self.lock = FileLock(base + ".lock")
+        self.max_rows = max_rows
+        self.count = 0
+        self.dim: Optional[int] = None
+        self.version: Optional[int] = None
+        self.ids: List[str] = []
+        self._mm: Optional[np.ndarray] = None
+        self.compact = CompactVectors(quantization, dims) if quantization else None
+        self.rescore = rescore
+        self._load()
+        self._reload_compact()
+
+    @property
+    def usable(self) -> bool:
+        return self._mm is not None and self.count <= self.max_rows
+
+    def _load(self) -> None:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            mm = np.load(self.npy_path, mmap_mode="r+")
+            with open(self.ids_path, "r", encoding="utf-8") as f:
+                ids = f.read().splitlines()
+        except (OSError, ValueError):
+            return
+        count = int(meta.get("count", 0))
+        if len(ids) < count or mm.shape[0] < count or mm.shape[1] != meta.get("dim"):
+            return  # torn files: treat as absent and let the owner rebuild
+        if len(ids) > count:
+            ids = ids[:count]
+            self._write_ids(ids)
+        self._mm = mm
+        self.ids = ids
+        self.count = count
+        self.dim = int(meta["dim"])
+        self.version = meta.get("version")
+
+    def refresh(self) -> None:
+        """Reload the files if another process has changed them since they were read."""
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        if meta.get("version") == self.version and meta.get("count") == self.count:
+            return
+        self._mm = None
+        self.ids = []
+        self.count = 0
+        self.version = None
+        self._load()
+        if self._mm is None:
+            # Table tracked but not indexed (see ``mark``)
+            self.count = int(meta.get("count", 0))
+            self.version = meta.get("version")
+        self._reload_compact()
+
+    def _reload_compact(self) -> None:
+        if self.compact is None:
+            return
+        self.compact.reset()
+        if self._mm is None:
+            return
+        for start in range(0, self.count, 65536):
+            self.compact.add(self._mm[start:min(start + 65536, self.count)])
+
+    def _write_ids(self, ids: Sequence[str]) -> None:
+        tmp = self.ids_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(i + "\n" for i in ids)
+        os.replace(tmp, self.ids_path)
+
+    def _write_meta(self) -> None:
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"count": self.count, "dim": self.dim, "version": self.version}, f)
+        os.replace(tmp, self.meta_path)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _allocate(self, capacity: int, dim: int) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.npy_path)), exist_ok=True)
+        tmp = self.npy_path + ".tmp"
+        grown = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=(capacity, dim))
+        if self._mm is not None and self.count:
+            grown[: self.count] = self._mm[: self.count]
+        grown.flush()
+        del grown
+        os.replace(tmp, self.npy_path)
+        self._mm = np.load(self.npy_path, mmap_mode="r+")
+        self.dim = dim
+
+    def mark(self, version: Optional[int], count: int) -> None:
+        """Record that the table is at ``version`` with ``count`` rows without indexing it."""
+        self.version = version
+        self.count = count
+        self._mm = None
+        self.ids = []
+        if self.compact is not None:
+            self.compact.reset()
+        self._write_meta()
+
+    def rebuild(self, ids: Sequence[str], vectors: np.ndarray, version: Optional[int]) -> None:
+        self._mm = None
+        self.count = 0
+        self.ids = []
+        if len(ids):
+            self._allocate(max(1024, len(ids)), vectors.shape[1])
+            self._mm[: len(ids)] = self._normalize(np.asarray(vectors, dtype=np.float32))
+            self._mm.flush()
+        self.ids = list(ids)
+        self.count = len(ids)
+        self._write_ids(self.ids)
+        self.version = version
+        self._write_meta()
+        self._reload_compact()
+
+    def append(self, ids: Sequence[str], vectors: np.ndarray, version: Optional[int]) -> None:
+        if not self.usable and self.count:
+            self.mark(version, self.count + len(ids))  # too large to index; track the table only
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        needed = self.count + len(ids)
+        if self._mm is None or needed > self._mm.shape[0]:
+            capacity = max(1024, needed, 2 * (self._mm.shape[0] if self._mm is not None else 0))
+            self._allocate(capacity, vectors.shape[1])
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding size {vectors.shape[1]} does not match hot index size {self.dim}")
+        unit = self._normalize(vectors)
+        self._mm[self.count:needed] = unit
+        self._mm.flush()
+        if self.compact is not None:
+            self.compact.add(unit)
+        with open(self.ids_path, "a", encoding="utf-8") as f:
+            f.writelines(i + "\n" for i in ids)
+        self.ids.extend(ids)
+        self.count = needed
+        self.version = version
+        self._write_meta()
+
+    def search(self, vector: Sequence[float], k: int = 5) -> List[Tuple[str, float]]:
+        """Top-``k`` ``(id, squared L2 distance)`` pairs, nearest first."""
+        if self._mm is None or self.count == 0 or k <= 0:
+            return []
+        q = np.asarray(vector, dtype=np.float32)
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+        if self.compact is not None:
+            idx, exact = rescore(self.compact, self._mm, q, k, self.rescore)
+            return [(self.ids[i], float(2.0 - 2.0 * s)) for i, s in zip(idx, exact)]
+        scores = self._mm[: self.count] @ q
+        k = min(k, self.count)
+        idx = np.argpartition(-scores, k - 1)[:k] if k < self.count else np.arange(self.count)
+        idx = idx[np.argsort(-scores[idx])]
+        return [(self.ids[i], float(2.0 - 2.0 * scores[i])) for i in idx]
@@ -1,27 +1,99 @@
 from __future__ import annotations
 
+import contextlib
+import os
+import random
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from gutil.Tracing import tracer
 
-class LanceDBStoreError(RuntimeError):
+from .vector_store import MemoryEntry, VectorStore, VectorStoreError
+
+__all__ = ["LanceDBStore", "LanceDBStoreError", "MemoryEntry"]
+
+
+class LanceDBStoreError(VectorStoreError):
     pass
 
 
-@dataclass
-class MemoryEntry:
-    id: str
-    ts: float
-    prompt: str
-    response: str
-    tags: List[str]
-    tokens: int
-    embedding: List[float]
+def _schema(dim: int):
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            pa.field("id", pa.string()),
+            pa.field("ts", pa.float64()),
+            pa.field("prompt", pa.string()),
+            pa.field("response", pa.string()),
+            pa.field("tags", pa.list_(pa.string())),
+            pa.field("tokens", pa.int64()),
+            pa.field("embedding", pa.list_(pa.float32(), dim)),
+        ]
+    )
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+# Lance raises these when another writer committed first and its own
+# internal retries ran out; re-running the operation on the latest version
+# is safe for our appends and deletes.
+_CONFLICT_MARKERS = (
+    "commit conflict",
+    "too many concurrent",
+    "incompatible transaction",
+    "manifest contention",
+)
+
 
+def _is_conflict(exc: BaseException) -> bool:
+    msg = str(exc).lower()
+    return any(marker in msg for marker in _CONFLICT_MARKERS)
 
-class LanceDBStore:
-    def __init__(self, uri: str, table_name: str = "interactions") -> None:
+
+class LanceDBStore(VectorStore):
+    """Memory in a LanceDB table, optionally fronted by a ``HotIndex``.
+
+    With ``hot_index`` on, searches over tables of up to ``hot_max_rows``
+    rows run as an exact matrix product over a memory-mapped copy of the
+    embeddings (``<uri>.<table>.hot.*`` next to the database directory), and
+    only the matching rows are read from Lance. The copy is checked against
+    the table version on every search and rebuilt when another writer has
+    changed the table (a full rebuild, done once under the hot index lock
+    whichever process gets there first); larger tables use Lance's own
+    vector search. The hot index ranks by cosine similarity and reports
+    ``_distance = 2 - 2*cos`` (squared L2 between the normalised vectors),
+    and with it enabled the Lance fallback is queried with the cosine metric
+    and scaled to match, so a query ranks and scores the same whatever the
+    table size. Without it, ``_distance`` is squared L2 on the raw vectors.
+
+    Several processes can write to the same table. Writes are optimistic:
+    a commit conflict re-runs the write on the latest version up to
+    ``write_retries`` times with jittered exponential backoff, and retries
+    insert with ``merge_insert`` on ``id`` so an attempt that did land is not
+    duplicated. ``write_lock`` additionally serializes writers through
+    ``<uri>/<table>.lock``, trading throughput for no conflicts at all. The
+    hot index only appends a write when no other commit came between it and
+    the previous one, and otherwise rebuilds on the next search.
+    """
+
+    name = "lancedb"
+
+    def __init__(
+        self,
+        uri: str,
+        table_name: str = "interactions",
+        hot_index: bool = False,
+        hot_max_rows: int = 300_000,
+        hot_quantization: Optional[str] = None,
+        hot_dims: Optional[int] = None,
+        hot_rescore: int = 4,
+        write_lock: bool = False,
+        write_retries: int = 8,
+        lock_timeout: float = 30.0,
+    ) -> None:
         try:
             import lancedb
         except Exception as e:  # noqa: BLE001
@@ -30,47 +102,200 @@ class LanceDBStore:
             ) from e
         self.db = lancedb.connect(uri)
         self.table_name = table_name
-        self._ensure_table()
-
-    def _ensure_table(self) -> None:
-        data = [
-            {
-                "id": "_schema_example_",
-                "ts": time.time(),
-                "prompt": "",
-                "response": "",
-                "tags": [],
-                "tokens": 0,
-                "embedding": [0.0],
-            }
-        ]
-        if self.table_name not in [t.name for t in self.db.tables()]:
-            self.db.create_table(self.table_name, data=data, exist_ok=True)
-            # remove the example row
-            self.db.open_table(self.table_name).delete("id == '_schema_example_'")
-
-    def add(self, entry: MemoryEntry) -> None:
-        tbl = self.db.open_table(self.table_name)
-        tbl.add(
-            [
-                {
-                    "id": entry.id,
-                    "ts": entry.ts,
-                    "prompt": entry.prompt,
-                    "response": entry.response,
-                    "tags": entry.tags,
-                    "tokens": entry.tokens,
-                    "embedding": entry.embedding,
-                }
-            ]
-        )
-
-    def search(self, vector: List[float], k: int = 5) -> List[Dict[str, Any]]:
-        tbl = self.db.open_table(self.table_name)
+        self._tbl = None  # handle reused across calls once the table exists
+        self.write_retries = max(0, write_retries)
+        self.conflicts = 0  # commit conflicts retried so far
+        self.write_lock = None
+        if write_lock:
+            if "://" in uri:
+                raise LanceDBStoreError(f"write_lock needs a local db_uri, got {uri}")
+            from .locking import FileLock
+
+            self.write_lock = FileLock(os.path.join(uri, f"{table_name}.lock"), timeout=lock_timeout)
+        self.hot = None
+        if hot_index:
+            from .hot_index import HotIndex
+
+            self.hot = HotIndex(
+                f"{os.path.normpath(uri)}.{table_name}.hot",
+                max_rows=hot_max_rows,
+                quantization=hot_quantization,
+                dims=hot_dims,
+                rescore=hot_rescore,
+            )
+            self._sync_hot(self._open())
+
+    def _table_names(self) -> List[str]:
+        if hasattr(self.db, "table_names"):
+            return list(self.db.table_names())
+        return [t.name for t in self.db.tables()]
+
+    def _being_created(self, exc: BaseException) -> bool:
+        """``exc`` is LanceDB failing to open a table that is listed but has no
+        committed version yet, i.e. another process is inside ``create_table``."""
+        return f"Table '{self.table_name}' was not found" in str(exc) and self.table_name in self._table_names()
+
+    def _retryable(self, exc: BaseException) -> bool:
+        return _is_conflict(exc) or self._being_created(exc)
+
+    def _open(self, dim: Optional[int] = None):
+        """Open the table; it is created on first write, once the embedding size is known.
+
+        The handle is kept and moved to the latest version on each call
+        (picking up other writers' commits) rather than listing tables again.
+        """
+        if self._tbl is not None:
+            try:
+                self._tbl.checkout_latest()
+                return self._tbl
+            except Exception:  # noqa: BLE001
+                self._tbl = None  # dropped or replaced; look it up again
+        self._tbl = self._lookup(dim)
+        return self._tbl
+
+    def _lookup(self, dim: Optional[int]):
+        if self.table_name in self._table_names():
+            try:
+                return self.db.open_table(self.table_name)
+            except Exception as e:  # noqa: BLE001
+                if dim is not None or not self._being_created(e):
+                    raise
+                return None
+        if dim is None:
+            return None
+        try:
+            return self.db.create_table(self.table_name, schema=_schema(dim), exist_ok=True)
+        except Exception:  # noqa: BLE001
+            if self.table_name in self._table_names():  # another process created it first
+                return self.db.open_table(self.table_name)
+            raise
+
+    def _write(self, op: Callable[[Any, int], None], dim: Optional[int] = None) -> Tuple[Any, int]:
+        """Run ``op(table, attempt)`` until it commits, retrying on conflicts.
+
+        Returns the table handle (at the committed version) and the version
+        it was opened at.
+        """
+        delay = 0.01
+        guard = self.write_lock if self.write_lock is not None else contextlib.nullcontext()
+        with guard:
+            for attempt in range(self.write_retries + 1):
+                try:
+                    tbl = self._open(dim=dim)
+                    if tbl is None:
+                        raise LanceDBStoreError(f"Table {self.table_name} was not found")
+                    before = tbl.version
+                    op(tbl, attempt)
+                    return tbl, before
+                except Exception as e:  # noqa: BLE001
+                    if not self._retryable(e) or attempt == self.write_retries:
+                        raise LanceDBStoreError(
+                            f"Write to {self.table_name} failed after {attempt + 1} attempt(s): {e}"
+                        ) from e
+                self.conflicts += 1
+                time.sleep(random.uniform(0, delay))
+                delay = min(delay * 2, 1.0)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def add_batch(self, entries: Sequence[MemoryEntry]) -> None:
+        if not entries:
+            return
+        with tracer.span("lancedb.add", rows=len(entries)):
+            self._add_batch(entries)
+
+    def _add_batch(self, entries: Sequence[MemoryEntry]) -> None:
+        rows = [e.row() for e in entries]
+
+        def append(tbl, attempt: int) -> None:
+            if attempt:
+                # The failed attempt may have committed after all; insert only what is missing
+                tbl.merge_insert("id").when_not_matched_insert_all().execute(rows)
+            else:
+                tbl.add(rows)
+
+        tbl, before = self._write(append, dim=len(entries[0].embedding))
+        if self.hot is not None:
+            with self.hot.lock:
+                self.hot.refresh()
+                if self.hot.version == before and tbl.version == before + 1:
+                    self.hot.append([e.id for e in entries], [e.embedding for e in entries], tbl.version)
+                # else another writer committed in between; the next search rebuilds
+
+    def _sync_hot(self, tbl) -> bool:
+        """Bring the hot index in line with ``tbl``; return True if it can serve queries."""
+        if tbl is None:
+            return False
+        if self.hot.version == tbl.version:
+            return self.hot.usable
+        with self.hot.lock:
+            self.hot.refresh()  # another process may have rebuilt it already
+            return self._rebuild_hot(tbl)
+
+    def _rebuild_hot(self, tbl) -> bool:
+        version = tbl.version
+        if self.hot.version == version:
+            return self.hot.usable
+        n = tbl.count_rows()
+        if n > self.hot.max_rows:
+            self.hot.mark(version, n)
+            return False
+        import numpy as np
+
+        data = tbl.search().select(["id", "embedding"]).limit(max(n, 1)).to_arrow()
+        ids = data.column("id").to_pylist()
+        dim = data.schema.field("embedding").type.list_size
+        flat = data.column("embedding").combine_chunks().flatten().to_numpy(zero_copy_only=False)
+        self.hot.rebuild(ids, np.asarray(flat, dtype=np.float32).reshape(len(ids), dim), version)
+        return self.hot.usable
+
+    def _rows_by_id(self, tbl, hits: Sequence[Tuple[str, float]]) -> List[Dict[str, Any]]:
+        if not hits:
+            return []
+        cols = ["id", "ts", "prompt", "response", "tags", "tokens"]
+        where = f"id IN ({', '.join(_quote(i) for i, _ in hits)})"
+        rows = {r["id"]: r for r in tbl.search().where(where).select(cols).limit(len(hits)).to_list()}
+        return [dict(rows[i], _distance=d) for i, d in hits if i in rows]
+
+    def search(self, vector: Sequence[float], k: int = 5) -> List[Dict[str, Any]]:
+        with tracer.span("lancedb.search", k=k) as span:
+            return self._search(vector, k, span)
+
+    def _search(self, vector: Sequence[float], k: int, span: Any) -> List[Dict[str, Any]]:
+        tbl = self._open()
+        if tbl is None:
+            return []
+        if self.hot is not None and self._sync_hot(tbl):
+            span.set(hot=True)
+            return self._rows_by_id(tbl, self.hot.search(vector, k))
         try:
-            results = tbl.search(vector).limit(k).to_list()
-        except Exception:
-            # Some older versions use different APIs; fallback to Arrow
-            results = tbl.search(vector).limit(k).to_arrow().to_pylist()
+            query = tbl.search(list(vector), vector_column_name="embedding")
+        except TypeError:
+            # Some older versions use different APIs
+            query = tbl.search(list(vector))
+        if self.hot is None:
+            return query.limit(k).to_list()
+        # Same metric and scale as the hot index (2 - 2*cos = 2 * cosine distance)
+        set_metric = getattr(query, "distance_type", None) or query.metric
+        results = set_metric("cosine").limit(k).to_list()
+        for r in results:
+            r["_distance"] = 2.0 * r["_distance"]
         return results
 
+    def delete(self, ids: Sequence[str]) -> int:
+        tbl = self._open()
+        if tbl is None or not ids:
+            return 0
+        where = f"id IN ({', '.join(_quote(i) for i in ids)})"
+        removed = 0
+
+        def delete(tbl, attempt: int) -> None:
+            nonlocal removed
+            removed = tbl.count_rows(where)
+            tbl.delete(where)
+
+        self._write(delete)
+        return removed
+
+    def count(self) -> int:
+        tbl = self._open()
+        return 0 if tbl is None else tbl.count_rows()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class LockTimeout(RuntimeError):
+    pass
+
+
+class FileLock:
+    """Exclusive advisory lock on ``path`` shared by processes and threads.
+
+    Uses ``fcntl.flock`` on a lock file that is created on first use and
+    never removed (unlinking it would let two processes hold locks on
+    different inodes). The kernel drops the lock if its holder dies, so a
+    crashed writer cannot wedge the others. Where ``fcntl`` is unavailable
+    only the in-process lock is taken.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        self.path = path
+        self.timeout = timeout
+        self._thread_lock = threading.Lock()
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        deadline = time.monotonic() + self.timeout
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise LockTimeout(f"Timed out after {self.timeout:.0f}s waiting for {self.path}")
+        if fcntl is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            delay = 0.001
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        os.close(fd)
+                        raise LockTimeout(f"Timed out after {self.timeout:.0f}s waiting for {self.path}")
+                    time.sleep(random.uniform(0, delay))
+                    delay = min(delay * 2, 0.05)
+            self._fd = fd
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
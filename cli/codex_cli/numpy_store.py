@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .vector_store import MemoryEntry, VectorStore
+
+
+class NumpyStore(VectorStore):
+    """Exact in-process search over a float32 matrix.
+
+    Vectors live in a preallocated matrix that doubles when full, so appends
+    are amortised O(1); queries are one matrix product plus ``argpartition``.
+    With ``path`` set, entries are appended to a JSONL file and reloaded on
+    open; deletes rewrite the file.
+    """
+
+    name = "numpy"
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.rows: List[Dict[str, Any]] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._sq_norms = np.zeros(0, dtype=np.float32)
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                entries = [MemoryEntry(**json.loads(line)) for line in f if line.strip()]
+            if entries:
+                self._append(entries)
+
+    def _append(self, entries: Sequence[MemoryEntry]) -> None:
+        vecs = np.asarray([e.embedding for e in entries], dtype=np.float32)
+        n = len(self.rows)
+        if self._matrix is None:
+            self._matrix = np.empty((max(64, len(entries)), vecs.shape[1]), dtype=np.float32)
+            self._sq_norms = np.empty(len(self._matrix), dtype=np.float32)
+        elif vecs.shape[1] != self._matrix.shape[1]:
+            raise ValueError(f"Embedding size {vecs.shape[1]} does not match store size {self._matrix.shape[1]}")
+        needed = n + len(entries)
+        if needed > len(self._matrix):
+            capacity = max(needed, 2 * len(self._matrix))
+            grown = np.empty((capacity, self._matrix.shape[1]), dtype=np.float32)
+            grown[:n] = self._matrix[:n]
+            self._matrix = grown
+            norms = np.empty(capacity, dtype=np.float32)
+            norms[:n] = self._sq_norms[:n]
+            self._sq_norms = norms
+        self._matrix[n:needed] = vecs
+        self._sq_norms[n:needed] = np.einsum("ij,ij->i", vecs, vecs)
+        for e in entries:
+            row = e.row()
+            del row["embedding"]
+            self.rows.append(row)
+
+    def add_batch(self, entries: Sequence[MemoryEntry]) -> None:
+        if not entries:
+            return
+        self._append(entries)
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(e.row()) + "\n" for e in entries)
+
+    def _top_k(self, distances: np.ndarray, k: int) -> List[Dict[str, Any]]:
+        k = min(k, len(distances))
+        if k <= 0:
+            return []
+        idx = np.argpartition(distances, k - 1)[:k] if k < len(distances) else np.arange(len(distances))
+        idx = idx[np.argsort(distances[idx])]
+        return [dict(self.rows[i], _distance=float(distances[i])) for i in idx]
+
+    def search(self, vector: Sequence[float], k: int = 5) -> List[Dict[str, Any]]:
+        return self.search_batch([vector], k=k)[0]
+
+    def search_batch(self, vectors: Sequence[Sequence[float]], k: int = 5) -> List[List[Dict[str, Any]]]:
+        n = len(self.rows)
+        if n == 0 or self._matrix is None:
+            return [[] for _ in vectors]
+        q = np.asarray(vectors, dtype=np.float32)
+        # ||x - q||^2 = ||x||^2 - 2 x.q + ||q||^2, one GEMM for the whole batch
+        d = self._sq_norms[:n, None] - 2.0 * (self._matrix[:n] @ q.T) + np.einsum("ij,ij->i", q, q)[None, :]
+        return [self._top_k(d[:, j], k) for j in range(len(q))]
+
+    def delete(self, ids: Sequence[str]) -> int:
+        drop = set(ids)
+        keep = [i for i, row in enumerate(self.rows) if row["id"] not in drop]
+        removed = len(self.rows) - len(keep)
+        if not removed:
+            return 0
+        if self._matrix is not None:
+            idx = np.asarray(keep, dtype=np.intp)
+            self._matrix[: len(keep)] = self._matrix[idx]
+            self._sq_norms[: len(keep)] = self._sq_norms[idx]
+        self.rows = [self.rows[i] for i in keep]
+        if self.path:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for i, row in enumerate(self.rows):
+                    f.write(json.dumps(dict(row, embedding=self._matrix[i].tolist())) + "\n")
+            os.replace(tmp, self.path)
+        return removed
+
+    def count(self) -> int:
+        return len(self.rows)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any, Dict, List, Sequence
+
+from .vector_store import MemoryEntry, VectorStore, VectorStoreError
+
+
+def _point_id(entry_id: str) -> str:
+    """Qdrant ids must be UUIDs or ints; other ids map to a stable UUIDv5."""
+    try:
+        return str(uuid.UUID(entry_id))
+    except ValueError:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, entry_id))
+
+
+class QdrantLocalStore(VectorStore):
+    """Memory in Qdrant's embedded local mode (on-disk under ``path``, or ``:memory:``).
+
+    The collection is created on first write with Euclidean distance; scores
+    are squared on the way out so ``_distance`` matches the other stores.
+    """
+
+    name = "qdrant"
+
+    def __init__(self, path: str, collection: str = "interactions", upsert_batch: int = 256) -> None:
+        try:
+            from qdrant_client import QdrantClient, models
+        except Exception as e:  # noqa: BLE001
+            raise VectorStoreError(
+                "qdrant-client is required. Install with: pip install 'qdrant-client>=1.10'"
+            ) from e
+        self.models = models
+        if path == ":memory:":
+            self.client = QdrantClient(location=path)
+        else:
+            self.client = QdrantClient(path=path)
+        self.collection = collection
+        self.upsert_batch = upsert_batch
+        self._ready = self.client.collection_exists(collection)
+
+    def _ensure(self, dim: int) -> None:
+        if self._ready:
+            return
+        m = self.models
+        self.client.create_collection(
+            collection_name=self.collection,
+            vectors_config=m.VectorParams(size=dim, distance=m.Distance.EUCLID),
+        )
+        self._ready = True
+
+    def add_batch(self, entries: Sequence[MemoryEntry]) -> None:
+        if not entries:
+            return
+        self._ensure(len(entries[0].embedding))
+        PointStruct = self.models.PointStruct
+        for start in range(0, len(entries), self.upsert_batch):
+            points = []
+            for e in entries[start:start + self.upsert_batch]:
+                payload = e.row()
+                vector = payload.pop("embedding")
+                points.append(PointStruct(id=_point_id(e.id), vector=[float(x) for x in vector], payload=payload))
+            self.client.upsert(collection_name=self.collection, points=points)
+
+    @staticmethod
+    def _rows(points: Sequence[Any]) -> List[Dict[str, Any]]:
+        return [dict(p.payload or {}, _distance=float(p.score) ** 2) for p in points]
+
+    def search(self, vector: Sequence[float], k: int = 5) -> List[Dict[str, Any]]:
+        if not self._ready:
+            return []
+        res = self.client.query_points(
+            collection_name=self.collection, query=[float(x) for x in vector], limit=k, with_payload=True
+        )
+        return self._rows(res.points)
+
+    def search_batch(self, vectors: Sequence[Sequence[float]], k: int = 5) -> List[List[Dict[str, Any]]]:
+        if not self._ready:
+            return [[] for _ in vectors]
+        m = self.models
+        requests = [
+            m.QueryRequest(query=[float(x) for x in v], limit=k, with_payload=True) for v in vectors
+        ]
+        responses = self.client.query_batch_points(collection_name=self.collection, requests=requests)
+        return [self._rows(r.points) for r in responses]
+
+    def delete(self, ids: Sequence[str]) -> int:
+        if not self._ready or not ids:
+            return 0
+        before = self.count()
+        self.client.delete(
+            collection_name=self.collection, points_selector=self.models.PointIdsList(points=[_point_id(i) for i in ids])
+        )
+        return before - self.count()
+
+    def count(self) -> int:
+        if not self._ready:
+            return 0
+        return self.client.count(collection_name=self.collection, exact=True).count
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+MODES = ("int8", "binary")
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+_CHUNK = 4096
+
+
+def _popcount_rows(x: np.ndarray) -> np.ndarray:
+    bitwise_count = getattr(np, "bitwise_count", None)  # NumPy >= 2.0
+    if bitwise_count is not None:
+        return bitwise_count(x).sum(axis=1, dtype=np.int32)
+    return _POPCOUNT[x].sum(axis=1, dtype=np.int32)
+
+
+def truncate(vectors: np.ndarray, dims: Optional[int]) -> np.ndarray:
+    """Keep the leading ``dims`` components and renormalise (Matryoshka-style)."""
+    if dims is None or dims >= vectors.shape[-1]:
+        return vectors
+    head = np.asarray(vectors[..., :dims], dtype=np.float32)
+    norms = np.linalg.norm(head, axis=-1, keepdims=True)
+    return head / np.maximum(norms, 1e-12)
+
+
+class CompactVectors:
+    """RAM-resident compact codes used for a first-pass candidate search.
+
+    ``int8`` stores each vector scaled by its own max magnitude (one byte per
+    dimension plus a float32 scale) and scores the float query against the
+    codes. ``binary`` keeps only sign bits (one bit per dimension) and ranks by
+    Hamming distance. ``dims`` truncates vectors first. Candidates are meant to
+    be rescored against the full-precision vectors, see ``rescore``.
+    """
+
+    def __init__(self, mode: str = "int8", dims: Optional[int] = None) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown quantization: {mode} (expected one of {', '.join(MODES)})")
+        self.mode = mode
+        self.dims = dims
+        self.count = 0
+        self._codes: Optional[np.ndarray] = None
+        self._scales = np.zeros(0, dtype=np.float32)
+
+    @property
+    def nbytes(self) -> int:
+        if self._codes is None:
+            return 0
+        per_row = self._codes.shape[1] * self._codes.itemsize
+        if self.mode == "int8":
+            per_row += self._scales.itemsize
+        return per_row * self.count
+
+    def encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        v = truncate(np.asarray(vectors, dtype=np.float32), self.dims)
+        if self.mode == "binary":
+            return np.packbits(v > 0, axis=1), np.zeros(0, dtype=np.float32)
+        scales = np.maximum(np.abs(v).max(axis=1), 1e-12) / 127.0
+        codes = np.clip(np.rint(v / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def reset(self) -> None:
+        self.count = 0
+        self._codes = None
+        self._scales = np.zeros(0, dtype=np.float32)
+
+    def add(self, vectors: np.ndarray) -> None:
+        if len(vectors) == 0:
+            return
+        codes, scales = self.encode(vectors)
+        needed = self.count + len(codes)
+        if self._codes is None or needed > len(self._codes):
+            capacity = max(1024, needed, 2 * (len(self._codes) if self._codes is not None else 0))
+            grown = np.empty((capacity, codes.shape[1]), dtype=codes.dtype)
+            if self._codes is not None:
+                grown[: self.count] = self._codes[: self.count]
+            self._codes = grown
+            if self.mode == "int8":
+                s = np.empty(capacity, dtype=np.float32)
+                s[: self.count] = self._scales[: self.count]
+                self._scales = s
+        self._codes[self.count:needed] = codes
+        if self.mode == "int8":
+            self._scales[self.count:needed] = scales
+        self.count = needed
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """Approximate similarity of ``query`` to every stored vector (higher is nearer)."""
+        q = truncate(np.asarray(query, dtype=np.float32)[None, :], self.dims)[0]
+        codes = self._codes[: self.count]
+        if self.mode == "binary":
+            qbits = np.packbits(q > 0)
+            return -_popcount_rows(np.bitwise_xor(codes, qbits)).astype(np.float32)
+        out = np.empty(self.count, dtype=np.float32)
+        for start in range(0, self.count, _CHUNK):
+            block = codes[start:start + _CHUNK].astype(np.float32)
+            out[start:start + _CHUNK] = block @ q
+        return out * self._scales[: self.count]
+
+    def candidates(self, query: np.ndarray, n: int) -> np.ndarray:
+        if self.count == 0 or n <= 0:
+            return np.zeros(0, dtype=np.intp)
+        s = self.scores(query)
+        if n >= self.count:
+            return np.arange(self.count)
+        return np.argpartition(-s, n - 1)[:n]
+
+
+def rescore(
+    compact: CompactVectors, full: np.ndarray, query: np.ndarray, k: int, factor: int = 4
+) -> Tuple[np.ndarray, np.ndarray]:
+    """First pass over ``compact``, then exact dot products for the top ``k * factor``.
+
+    ``full`` holds the unit-length full-precision rows (typically a memmap, so
+    only candidate rows are paged in). Returns ``(indices, scores)`` nearest first.
+    """
+    cand = compact.candidates(query, max(k, k * factor))
+    if len(cand) == 0:
+        return cand, np.zeros(0, dtype=np.float32)
+    cand = np.sort(cand)  # ascending offsets read the memmap sequentially
+    exact = np.asarray(full[cand], dtype=np.float32) @ np.asarray(query, dtype=np.float32)
+    k = min(k, len(cand))
+    top = np.argpartition(-exact, k - 1)[:k] if k < len(cand) else np.arange(len(cand))
+    top = top[np.argsort(-exact[top])]
+    return cand[top], exact[top]
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from gutil.Daemon import DaemonClient, DaemonUnavailable, connect, specs_from_config
+from gutil.Tracing import tracer
+
+from .embeddings import EmbeddingConfig, Embeddings
+from .vector_store import MemoryEntry, VectorStore, open_store
+
+logger = logging.getLogger("codex_cli")
+
+
+class _Remote:
+    """Forwards calls to the daemon until it becomes unreachable, then
+    builds the in-process object with ``factory`` and uses it from then on."""
+
+    def __init__(self, client: DaemonClient, factory: Callable[[], Any]) -> None:
+        self.client = client
+        self._factory = factory
+        self._local: Any = None
+        self._lock = threading.Lock()
+
+    def _call(self, op: str, local: Callable[[Any], Any], **params: Any) -> Any:
+        if self._local is None:
+            try:
+                return self.client.call(op, **params)
+            except DaemonUnavailable as e:
+                with self._lock:
+                    if self._local is None:
+                        logger.warning("gutil daemon unavailable (%s); continuing in-process", e)
+                        self._local = self._factory()
+        return local(self._local)
+
+
+class RemoteEmbeddings(_Remote):
+    """``Embeddings`` served by the daemon's warm model."""
+
+    def __init__(self, client: DaemonClient, cfg: EmbeddingConfig) -> None:
+        super().__init__(client, lambda: Embeddings(cfg))
+        self.cfg = cfg
+        self.spec = {"provider": cfg.provider, "model": cfg.model, "dim": cfg.dim}
+
+    def encode(self, texts) -> List[List[float]]:
+        texts = list(texts)
+        if not texts:
+            return []
+        return self._call("embed", lambda e: e.encode(texts), texts=texts, embeddings=self.spec)
+
+
+class RemoteStore(_Remote, VectorStore):
+    """``VectorStore`` whose table (and hot index) lives in the daemon."""
+
+    name = "daemon"
+
+    def __init__(self, client: DaemonClient, spec: Dict[str, Any]) -> None:
+        super().__init__(client, lambda: open_store(spec))
+        self.spec = spec
+
+    def add_batch(self, entries: Sequence[MemoryEntry]) -> None:
+        if not entries:
+            return
+        with tracer.span("daemon.remember", rows=len(entries)):
+            self._call(
+                "remember", lambda s: s.add_batch(entries), store=self.spec, entries=[e.row() for e in entries]
+            )
+
+    def search(self, vector: Sequence[float], k: int = 5) -> List[Dict[str, Any]]:
+        return self.search_batch([vector], k=k)[0]
+
+    def search_batch(self, vectors: Sequence[Sequence[float]], k: int = 5) -> List[List[Dict[str, Any]]]:
+        vectors = [list(v) for v in vectors]
+        with tracer.span("daemon.search", k=k):
+            return self._call("search", lambda s: s.search_batch(vectors, k=k), store=self.spec, vectors=vectors, k=k)
+
+    def delete(self, ids: Sequence[str]) -> int:
+        return self._call("delete", lambda s: s.delete(ids), store=self.spec, ids=list(ids))
+
+    def count(self) -> int:
+        return self._call("count", lambda s: s.count(), store=self.spec)
+
+    def close(self) -> None:
+        if self._local is not None:
+            self._local.close()
+        self.client.close()
+
+
+class RemoteCodeIndex(_Remote):
+    """``gutil.Ingest.CodeIndex`` served by the daemon."""
+
+    def __init__(self, client: DaemonClient, spec: Dict[str, Any]) -> None:
+        from gutil.Ingest import CodeIndex
+
+        super().__init__(client, lambda: CodeIndex(spec["uri"], spec["table"]))
+        self.spec = spec
+
+    def search(self, vector: Sequence[float], k: int = 3) -> List[Dict[str, Any]]:
+        vector = list(vector)
+        return self._call("code_search", lambda c: c.search(vector, k=k), code=self.spec, vector=vector, k=k)
+
+
+def daemon_client(cfg: Mapping[str, Any]) -> Optional[DaemonClient]:
+    """A client for the running daemon unless ``daemon.enable`` is false or none answers."""
+    dcfg = cfg.get("daemon", {}) or {}
+    if not dcfg.get("enable", True):
+        return None
+    return connect(dcfg.get("socket"))
+
+
+def open_backends(cfg: Mapping[str, Any]) -> Tuple[VectorStore, Any, Optional[Any]]:
+    """Memory store, embeddings and (if ``retrieval.code_table`` is set) code index for a REPL config.
+
+    They are served by ``gutil daemon`` when one is running and built
+    in-process otherwise; remote ones switch to in-process if the daemon
+    goes away mid-session.
+    """
+    specs = specs_from_config(dict(cfg))
+    ecfg = EmbeddingConfig(**specs["embeddings"])
+    client = daemon_client(cfg)
+    if client is not None:
+        logger.info("Using gutil daemon at %s", client.socket_path)
+        code = RemoteCodeIndex(client, specs["code"]) if specs["code"] else None
+        return RemoteStore(client, specs["store"]), RemoteEmbeddings(client, ecfg), code
+    code_index = None
+    if specs["code"]:
+        from gutil.Ingest import CodeIndex
+
+        code_index = CodeIndex(specs["code"]["uri"], specs["code"]["table"])
+    return open_store(cfg), Embeddings(ecfg), code_index
+
+
+def open_embeddings(cfg: EmbeddingConfig, socket_path: Optional[str] = None):
+    """``Embeddings`` for ``cfg``, served by the daemon when one is running."""
+    client = connect(socket_path)
+    if client is not None:
+        return RemoteEmbeddings(client, cfg)
+    return Embeddings(cfg)
@@ -3,30 +3,51 @@ from __future__ import annotations
 import time
 import uuid
 from dataclasses import dataclass
-from typing import List, Sequence
+from typing import Any, List, Optional, Sequence
+
+from gutil.Tracing import tracer
 
 from ..embeddings import Embeddings
-from ..lancedb_store import LanceDBStore, MemoryEntry
+from ..vector_store import MemoryEntry, VectorStore
 
 
 @dataclass
 class RetrievalConfig:
     top_k: int = 5
+    code_top_k: int = 3
 
 
 class ContextManager:
-    def __init__(self, store: LanceDBStore, embeddings: Embeddings, rcfg: RetrievalConfig):
+    def __init__(
+        self,
+        store: VectorStore,
+        embeddings: Embeddings,
+        rcfg: RetrievalConfig,
+        code_index: Optional[Any] = None,
+    ):
         self.store = store
         self.embeddings = embeddings
         self.rcfg = rcfg
+        self.code_index = code_index  # gutil.Ingest.CodeIndex over an ingested repository
 
     def retrieve(self, prompt: str) -> List[dict]:
-        vec = self.embeddings.encode([prompt])[0]
-        results = self.store.search(vec, k=self.rcfg.top_k)
+        with tracer.span("retrieve") as span:
+            with tracer.span("embed"):
+                vec = self.embeddings.encode([prompt])[0]
+            results = self.store.search(vec, k=self.rcfg.top_k)
+            if self.code_index is not None and self.rcfg.code_top_k > 0:
+                with tracer.span("code.search"):
+                    results = results + self.code_index.search(vec, k=self.rcfg.code_top_k)
+            span.set(hits=len(results))
         return results
 
     def remember(self, prompt: str, response: str, tags: Sequence[str] = ()) -> MemoryEntry:
-        vec = self.embeddings.encode([prompt + "\n\n" + response])[0]
+        with tracer.span("remember"):
+            return self._remember(prompt, response, tags)
+
+    def _remember(self, prompt: str, response: str, tags: Sequence[str]) -> MemoryEntry:
+        with tracer.span("embed"):
+            vec = self.embeddings.encode([prompt + "\n\n" + response])[0]
         entry = MemoryEntry(
             id=str(uuid.uuid4()),
             ts=time.time(),
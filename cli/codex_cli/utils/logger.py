@@ -1,30 +1,189 @@
 from __future__ import annotations
 
+import atexit
+import json
 import logging
+import logging.handlers
 import os
-from typing import Optional
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 
+# Attributes every LogRecord has; anything else was passed via ``extra=``.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
 
-def setup_logger(log_path: Optional[str] = None) -> logging.Logger:
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line.
+
+    Besides level, logger and message, each line carries timing fields:
+    ``ts`` (wall clock), ``uptime_ms`` (since logging started) and
+    ``queue_ms`` (how long the record waited for the background writer).
+    Values passed with ``extra=`` (e.g. ``duration_ms``) are included as-is.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "uptime_ms": round(record.relativeCreated, 3),
+            "queue_ms": round((time.time() - record.created) * 1000, 3),
+            "thread": record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                out[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one in ``every`` records at or below ``level`` per call site.
+
+    Sampling is counted per (logger, message template), so the first
+    occurrence of every distinct debug message always gets through and a hot
+    loop logging the same line is thinned out. Kept records get a
+    ``sampled`` attribute with the ratio they stand for.
+    """
+
+    def __init__(self, rate: float, level: int = logging.DEBUG) -> None:
+        super().__init__()
+        self.every = max(1, int(round(1.0 / rate))) if rate > 0 else 0
+        self.level = level
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level or self.every == 1:
+            return True
+        if self.every == 0:
+            return False
+        key = (record.name, str(record.msg))
+        with self._lock:
+            n = self._counts.get(key, 0)
+            self._counts[key] = n + 1
+        if n % self.every:
+            return False
+        record.sampled = self.every
+        return True
+
+
+class SizeTimeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """``RotatingFileHandler`` that also rolls over every ``interval`` seconds.
+
+    Both triggers share the numbered ``.1`` .. ``.N`` backups, so a size
+    rollover inside a time window never overwrites an earlier file.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 0,
+        backup_count: int = 5,
+        interval: float = 0,
+        encoding: Optional[str] = "utf-8",
+    ) -> None:
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.interval = interval
+        self.rollover_at = time.time() + interval if interval else None
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        if self.rollover_at is not None:
+            self.rollover_at = time.time() + self.interval
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message and traceback on the caller's thread (args may
+        # be mutable or unpicklable), but leave formatting to the listener.
+        record = logging.makeLogRecord(record.__dict__)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def shutdown_logger() -> None:
+    """Flush queued records and stop the background writer."""
+    _stop_listener()
+    for handler in list(logging.getLogger("codex_cli").handlers):
+        logging.getLogger("codex_cli").removeHandler(handler)
+        handler.close()
+
+
+def setup_logger(
+    log_path: Optional[str] = None,
+    level: str = "INFO",
+    json_lines: bool = False,
+    max_bytes: int = 0,
+    backup_count: int = 5,
+    rotate_interval: float = 0,
+    debug_sample_rate: float = 1.0,
+    console: bool = True,
+) -> logging.Logger:
+    """Configure the ``codex_cli`` logger with a non-blocking queue.
+
+    Log calls only enqueue the record; a ``QueueListener`` thread writes to
+    stderr and, with ``log_path``, to a file (JSON lines when ``json_lines``)
+    rotated at ``max_bytes`` and/or every ``rotate_interval`` seconds.
+    ``debug_sample_rate`` < 1 keeps that fraction of DEBUG records per call
+    site. Calling it again returns the already configured logger.
+    """
+    global _listener
     logger = logging.getLogger("codex_cli")
     if logger.handlers:
         return logger
-    logger.setLevel(logging.INFO)
+    logger.setLevel(getattr(logging, str(level).upper(), logging.INFO))
 
     formatter = logging.Formatter(
         fmt="%(asctime)s [%(levelname)s] %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
-    ch = logging.StreamHandler()
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
+    handlers: List[logging.Handler] = []
+    if console:
+        ch = logging.StreamHandler()
+        ch.setFormatter(formatter)
+        handlers.append(ch)
 
     if log_path:
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
-        fh = logging.FileHandler(log_path)
-        fh.setFormatter(formatter)
-        logger.addHandler(fh)
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+        fh = SizeTimeRotatingFileHandler(
+            log_path, max_bytes=max_bytes, backup_count=backup_count, interval=rotate_interval
+        )
+        fh.setFormatter(JSONFormatter() if json_lines else formatter)
+        handlers.append(fh)
 
-    return logger
+    qh = _QueueHandler(queue.SimpleQueue())
+    if debug_sample_rate < 1.0:
+        qh.addFilter(SamplingFilter(debug_sample_rate))
+    logger.addHandler(qh)
 
+    _stop_listener()
+    _listener = logging.handlers.QueueListener(qh.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+    return logger
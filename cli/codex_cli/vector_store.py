@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Mapping, Sequence
+
+
+class VectorStoreError(RuntimeError):
+    pass
+
+
+@dataclass
+class MemoryEntry:
+    id: str
+    ts: float
+    prompt: str
+    response: str
+    tags: List[str]
+    tokens: int
+    embedding: List[float]
+
+    def row(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class VectorStore:
+    """Interface shared by the memory backends used by ``ContextManager``.
+
+    ``search`` returns rows with the ``MemoryEntry`` fields (the embedding may
+    be omitted) plus ``_distance``, the squared L2 distance to the query
+    (between normalised vectors, ``2 - 2*cos``, for a LanceDB store with the
+    hot index on), nearest first. Backends override ``add_batch``, ``search``, ``delete`` and
+    ``count``; ``add`` and ``search_batch`` have generic fallbacks.
+    """
+
+    name = "base"
+
+    def add(self, entry: MemoryEntry) -> None:
+        self.add_batch([entry])
+
+    def add_batch(self, entries: Sequence[MemoryEntry]) -> None:
+        raise NotImplementedError
+
+    def search(self, vector: Sequence[float], k: int = 5) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def search_batch(self, vectors: Sequence[Sequence[float]], k: int = 5) -> List[List[Dict[str, Any]]]:
+        return [self.search(v, k=k) for v in vectors]
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """Remove entries by id; return how many were removed."""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+STORES = ("lancedb", "qdrant", "numpy")
+
+
+def open_store(cfg: Mapping[str, Any]) -> VectorStore:
+    """Build the store named by ``store:`` in the REPL config (default ``lancedb``).
+
+    All backends live under ``db_uri``: LanceDB uses it directly, Qdrant local
+    mode a ``qdrant/`` subdirectory, and the NumPy store a ``<table>.jsonl`` file.
+    """
+    kind = str(cfg.get("store") or "lancedb").lower()
+    db_uri = cfg.get("db_uri", "./data/codex_memory")
+    table = cfg.get("table", "interactions")
+    if kind == "lancedb":
+        from .lancedb_store import LanceDBStore
+
+        hot = cfg.get("hot_index") or {}
+        writes = cfg.get("writes") or {}
+        return LanceDBStore(
+            db_uri,
+            table,
+            hot_index=bool(hot.get("enable", False)),
+            hot_max_rows=int(hot.get("max_rows", 300_000)),
+            hot_quantization=hot.get("quantization") or None,
+            hot_dims=hot.get("dims"),
+            hot_rescore=int(hot.get("rescore", 4)),
+            write_lock=bool(writes.get("lock", False)),
+            write_retries=int(writes.get("retries", 8)),
+            lock_timeout=float(writes.get("lock_timeout", 30.0)),
+        )
+    if kind == "qdrant":
+        from .qdrant_store import QdrantLocalStore
+
+        return QdrantLocalStore(os.path.join(db_uri, "qdrant"), table)
+    if kind == "numpy":
+        from .numpy_store import NumpyStore
+
+        return NumpyStore(os.path.join(db_uri, f"{table}.jsonl"))
+    raise VectorStoreError(f"Unknown store: {kind} (expected one of {', '.join(STORES)})")
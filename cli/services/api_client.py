@@ -1,16 +1,60 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import httpx
 
 class APIClient:
-    def __init__(self, base_url: str):
+    """Async backend client.
+
+    Used as an async context manager it keeps one pooled ``httpx.AsyncClient``
+    open for all requests; otherwise each request opens a short-lived client.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 60.0,
+        max_connections: int = 10,
+    ):
         self.base_url = base_url
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
 
-    async def request(self, method: str, endpoint: str, data: Dict[str, Any] = None) -> Any:
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+
+    async def __aenter__(self) -> "APIClient":
+        self._client = self._new_client()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def send(self, method: str, endpoint: str, data: Dict[str, Any] = None) -> httpx.Response:
+        """Send a request and return the raw response without raising on status."""
         url = f"{self.base_url}{endpoint}"
-        async with httpx.AsyncClient() as client:
-            response = await client.request(method, url, json=data)
-            response.raise_for_status()
-            return response.json()
+        if self._client is not None:
+            return await self._client.request(method, url, json=data)
+        async with self._new_client() as client:
+            return await client.request(method, url, json=data)
+
+    async def request(self, method: str, endpoint: str, data: Dict[str, Any] = None) -> Any:
+        response = await self.send(method, endpoint, data)
+        response.raise_for_status()
+        return response.json()
 
     async def get(self, endpoint: str) -> Any:
         return await self.request("GET", endpoint)
@@ -22,4 +66,4 @@ class APIClient:
         return await self.request("PUT", endpoint, data)
 
     async def delete(self, endpoint: str) -> Any:
-        return await self.request("DELETE", endpoint)
\ No newline at end of file
+        return await self.request("DELETE", endpoint)
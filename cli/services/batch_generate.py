@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from .api_client import APIClient
+
+
+@dataclass
+class PromptItem:
+    index: int
+    prompt: str
+    max_tokens: int
+    id: Optional[str] = None
+
+
+def read_prompts(lines: Iterable[str], default_max_tokens: int = 100) -> Iterator[PromptItem]:
+    """Parse JSONL prompts.
+
+    Each non-blank line is either a JSON string or an object with ``prompt``
+    and optional ``max_tokens`` / ``id``. Indexes count non-blank lines so they
+    stay stable across resumed runs.
+    """
+    index = 0
+    for lineno, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {lineno}: {e}") from e
+        if isinstance(obj, str):
+            obj = {"prompt": obj}
+        if not isinstance(obj, dict) or not isinstance(obj.get("prompt"), str):
+            raise ValueError(f"Line {lineno} must be a string or an object with a 'prompt' field")
+        yield PromptItem(
+            index=index,
+            prompt=obj["prompt"],
+            max_tokens=int(obj.get("max_tokens", default_max_tokens)),
+            id=None if obj.get("id") is None else str(obj["id"]),
+        )
+        index += 1
+
+
+class RateLimiter:
+    """Async token bucket shared by all workers.
+
+    ``rate`` is requests per second (0 disables limiting). ``pause`` pushes the
+    next permit out for everyone, which is how a 429 Retry-After is honoured.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: int = 1) -> None:
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if self.rate <= 0:
+                    return
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _retry_after(value: Optional[str], default: float) -> float:
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, when.timestamp() - time.time())
+
+
+class BatchGenerator:
+    """Send prompts concurrently and emit results to ``out`` in input order.
+
+    Completed results are appended to ``checkpoint_path`` as they finish; on a
+    rerun those indexes are replayed from the checkpoint instead of being sent
+    again. Failed items are reported but not checkpointed, so a resume retries
+    them.
+    """
+
+    RETRY_STATUSES = {429, 502, 503, 504}
+
+    def __init__(
+        self,
+        client: APIClient,
+        endpoint: str,
+        concurrency: int = 4,
+        rate: float = 0.0,
+        max_retries: int = 5,
+        checkpoint_path: Optional[str] = None,
+    ) -> None:
+        self.client = client
+        self.endpoint = endpoint
+        self.concurrency = max(1, concurrency)
+        self.limiter = RateLimiter(rate, burst=self.concurrency)
+        self.max_retries = max_retries
+        self.checkpoint_path = checkpoint_path
+
+    def _load_checkpoint(self) -> Dict[int, Dict[str, Any]]:
+        done: Dict[int, Dict[str, Any]] = {}
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return done
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line from an interrupted run
+                if isinstance(rec, dict) and "index" in rec and "result" in rec:
+                    done[int(rec["index"])] = rec
+        return done
+
+    async def _send(self, item: PromptItem) -> Dict[str, Any]:
+        payload = {"prompt": item.prompt, "max_tokens": item.max_tokens}
+        record: Dict[str, Any] = {"index": item.index, "id": item.id}
+        backoff = 1.0
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            try:
+                resp = await self.client.send("POST", self.endpoint, payload)
+            except Exception as e:  # noqa: BLE001 - transport errors are retried
+                error = f"{type(e).__name__}: {e}"
+                delay = backoff
+            else:
+                if resp.status_code < 400:
+                    try:
+                        record["result"] = resp.json()
+                    except ValueError:
+                        record["error"] = f"Invalid JSON response: {resp.text[:200]}"
+                    return record
+                error = f"HTTP {resp.status_code}: {resp.text[:200]}"
+                if resp.status_code not in self.RETRY_STATUSES:
+                    break
+                delay = _retry_after(resp.headers.get("Retry-After"), backoff)
+                if resp.status_code == 429:
+                    self.limiter.pause(delay)
+            if attempt < self.max_retries:
+                await asyncio.sleep(delay)
+                backoff = min(backoff * 2, 30.0)
+        record["error"] = error
+        return record
+
+    async def run(self, items: Iterable[PromptItem], out: TextIO = sys.stdout) -> int:
+        """Process ``items`` and return the number of failed prompts."""
+        done = self._load_checkpoint()
+        ckpt = open(self.checkpoint_path, "a", encoding="utf-8") if self.checkpoint_path else None
+
+        # Bound how far workers may run ahead of the next index to print
+        window = asyncio.Semaphore(self.concurrency * 4)
+        queue: "asyncio.Queue[Optional[PromptItem]]" = asyncio.Queue(maxsize=self.concurrency * 2)
+        ready: Dict[int, Dict[str, Any]] = {}
+        next_index = 0
+        failures = 0
+
+        def flush() -> None:
+            nonlocal next_index, failures
+            while next_index in ready:
+                rec = ready.pop(next_index)
+                if "error" in rec:
+                    failures += 1
+                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                next_index += 1
+                window.release()
+            out.flush()
+
+        async def worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                rec = await self._send(item)
+                if ckpt is not None and "result" in rec:
+                    ckpt.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                    ckpt.flush()
+                ready[item.index] = rec
+                flush()
+
+        workers: List[asyncio.Task] = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        try:
+            for item in items:
+                await window.acquire()
+                if item.index in done:
+                    ready[item.index] = done.pop(item.index)
+                    flush()
+                    continue
+                await queue.put(item)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+            flush()
+        finally:
+            for w in workers:
+                w.cancel()
+            if ckpt is not None:
+                ckpt.close()
+        return failures
+
+
+def run_batch(
+    lines: Iterable[str],
+    base_url: str,
+    endpoint: str,
+    headers: Dict[str, str],
+    max_tokens: int = 100,
+    concurrency: int = 4,
+    rate: float = 0.0,
+    max_retries: int = 5,
+    checkpoint_path: Optional[str] = None,
+    out: TextIO = sys.stdout,
+) -> int:
+    """Synchronous entry point used by ``gutil app generate --input``."""
+
+    async def _main() -> int:
+        async with APIClient(base_url, headers=headers, max_connections=concurrency) as client:
+            gen = BatchGenerator(
+                client,
+                endpoint,
+                concurrency=concurrency,
+                rate=rate,
+                max_retries=max_retries,
+                checkpoint_path=checkpoint_path,
+            )
+            return await gen.run(read_prompts(lines, max_tokens), out)
+
+    return asyncio.run(_main())
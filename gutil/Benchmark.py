@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import random
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+SCENARIOS = ("ingest", "search", "embed", "repl")
+
+_WORDS = (
+    "vector memory prompt response table index query batch token model embed search "
+    "python lance codex retrieval latency cache stream shard schema column append"
+).split()
+
+
+class BenchmarkError(RuntimeError):
+    pass
+
+
+class BenchmarkSkipped(Exception):
+    """A scenario cannot run here (missing optional dependency or model)."""
+
+
+@dataclass
+class Metric:
+    value: float
+    unit: str
+    better: str  # "higher" | "lower"
+
+
+@dataclass
+class BenchResult:
+    metrics: Dict[str, Metric] = field(default_factory=dict)
+    skipped: Dict[str, str] = field(default_factory=dict)
+    params: Dict[str, Any] = field(default_factory=dict)
+    env: Dict[str, Any] = field(default_factory=dict)
+    created: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": 1,
+            "created": self.created,
+            "env": self.env,
+            "params": self.params,
+            "metrics": {k: asdict(v) for k, v in sorted(self.metrics.items())},
+            "skipped": self.skipped,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BenchResult":
+        return cls(
+            metrics={k: Metric(**v) for k, v in data.get("metrics", {}).items()},
+            skipped=dict(data.get("skipped", {})),
+            params=dict(data.get("params", {})),
+            env=dict(data.get("env", {})),
+            created=float(data.get("created", 0.0)),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "BenchResult":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+    change: float  # signed fraction; positive means better
+    regressed: bool
+
+
+def compare(current: BenchResult, baseline: BenchResult, threshold: float = 0.10) -> List[Comparison]:
+    """Compare metrics present in both results; a drop worse than ``threshold`` is a regression."""
+    out: List[Comparison] = []
+    for name, metric in sorted(current.metrics.items()):
+        base = baseline.metrics.get(name)
+        if base is None or base.value == 0:
+            continue
+        delta = (metric.value - base.value) / base.value
+        change = delta if metric.better == "higher" else -delta
+        out.append(Comparison(name, base.value, metric.value, change, change < -threshold))
+    return out
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _vector(rng: random.Random, dim: int) -> List[float]:
+    return [rng.gauss(0.0, 1.0) for _ in range(dim)]
+
+
+class BenchmarkSuite:
+    """Deterministic micro and end-to-end benchmarks for the LanceDB and Codex REPL paths.
+
+    Every scenario seeds its own RNG from ``seed`` so runs generate identical
+    data. ``quick`` shrinks sizes for CI smoke runs. Scenarios whose optional
+    dependencies are missing are recorded under ``skipped`` instead of failing.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        quick: bool = False,
+        dim: int = 384,
+        repeat: int = 3,
+        embed_provider: str = "fastembed",
+        workdir: Optional[str] = None,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.seed = seed
+        self.quick = quick
+        self.dim = dim
+        self.repeat = max(1, repeat)
+        self.embed_provider = embed_provider
+        self.workdir = workdir
+        self.log = log or (lambda msg: None)
+
+    def params(self) -> Dict[str, Any]:
+        return {
+            "seed": self.seed,
+            "quick": self.quick,
+            "dim": self.dim,
+            "repeat": self.repeat,
+            "embed_provider": self.embed_provider,
+        }
+
+    def run(self, scenarios: Sequence[str] = SCENARIOS) -> BenchResult:
+        result = BenchResult(params=self.params(), env=_environment())
+        with tempfile.TemporaryDirectory(prefix="gutil-bench-", dir=self.workdir) as tmp:
+            for name in scenarios:
+                if name not in SCENARIOS:
+                    raise BenchmarkError(f"Unknown scenario: {name}")
+                self.log(f"running {name} ...")
+                scenario_dir = os.path.join(tmp, name)
+                os.makedirs(scenario_dir)
+                try:
+                    getattr(self, f"bench_{name}")(scenario_dir, result.metrics)
+                except (ImportError, BenchmarkSkipped) as e:
+                    result.skipped[name] = str(e)
+        return result
+
+    def _best(self, fn: Callable[[], float]) -> float:
+        """Run ``fn`` ``repeat`` times and keep the fastest (least noisy) duration."""
+        return min(fn() for _ in range(self.repeat))
+
+    # -- scenarios -----------------------------------------------------------------
+
+    def bench_ingest(self, workdir: str, metrics: Dict[str, Metric]) -> None:
+        from .LanceDB import LanceDBClient, LanceDBNotInstalled
+
+        try:
+            LanceDBClient(os.path.join(workdir, "probe"))
+        except LanceDBNotInstalled as e:
+            raise BenchmarkSkipped(str(e)) from e
+        rng = random.Random(self.seed)
+        rows_n = 2_000 if self.quick else 20_000
+        batch = 500 if self.quick else 2_000
+        rows = [
+            {"id": str(uuid.UUID(int=rng.getrandbits(128))), "text": _text(rng, 16), "vector": _vector(rng, self.dim)}
+            for _ in range(rows_n)
+        ]
+        runs = iter(range(self.repeat * 2))
+
+        def create() -> float:
+            client = LanceDBClient(os.path.join(workdir, f"create-{next(runs)}"))
+            t0 = time.perf_counter()
+            client.create_table("bench", rows)
+            return time.perf_counter() - t0
+
+        def insert() -> float:
+            client = LanceDBClient(os.path.join(workdir, f"insert-{next(runs)}"))
+            client.create_table("bench", rows[:1])
+            t0 = time.perf_counter()
+            for start in range(1, rows_n, batch):
+                client.insert("bench", rows[start:start + batch])
+            return time.perf_counter() - t0
+
+        metrics["ingest.create_table.rows_per_s"] = Metric(rows_n / self._best(create), "rows/s", "higher")
+        metrics[f"ingest.insert.batch={batch}.rows_per_s"] = Metric(
+            (rows_n - 1) / self._best(insert), "rows/s", "higher"
+        )
+
+    def bench_search(self, workdir: str, metrics: Dict[str, Metric]) -> None:
+        from cli.codex_cli.lancedb_store import LanceDBStore, LanceDBStoreError
+        from cli.codex_cli.vector_store import MemoryEntry
+
+        try:
+            store = LanceDBStore(os.path.join(workdir, "db"), "bench")
+        except LanceDBStoreError as e:
+            raise BenchmarkSkipped(str(e)) from e
+        rng = random.Random(self.seed)
+        sizes = (1_000, 5_000) if self.quick else (1_000, 10_000, 50_000)
+        queries = [_vector(rng, self.dim) for _ in range(20 if self.quick else 100)]
+        have = 0
+        for size in sizes:
+            while have < size:
+                n = min(2_000, size - have)
+                store.add_batch(
+                    [
+                        MemoryEntry(
+                            id=f"row-{have + i}",
+                            ts=float(have + i),
+                            prompt=_text(rng, 12),
+                            response=_text(rng, 40),
+                            tags=[],
+                            tokens=52,
+                            embedding=_vector(rng, self.dim),
+                        )
+                        for i in range(n)
+                    ]
+                )
+                have += n
+            store.search(queries[0], k=5)  # warm the table handle and page cache
+            latencies = []
+            for q in queries:
+                t0 = time.perf_counter()
+                store.search(q, k=5)
+                latencies.append((time.perf_counter() - t0) * 1000)
+            metrics[f"search.rows={size}.p50_ms"] = Metric(percentile(latencies, 50), "ms", "lower")
+            metrics[f"search.rows={size}.p95_ms"] = Metric(percentile(latencies, 95), "ms", "lower")
+
+    def bench_embed(self, workdir: str, metrics: Dict[str, Metric]) -> None:
+        from cli.codex_cli.embeddings import EmbeddingConfig, EmbeddingError, Embeddings
+
+        rng = random.Random(self.seed)
+        texts = [_text(rng, 48) for _ in range(128 if self.quick else 512)]
+        try:
+            emb = Embeddings(EmbeddingConfig(provider=self.embed_provider))
+            emb.encode(texts[:8])  # model load / warm-up
+        except EmbeddingError as e:
+            raise BenchmarkSkipped(str(e)) from e
+        except Exception as e:  # noqa: BLE001
+            raise BenchmarkSkipped(f"{self.embed_provider} model unavailable: {e}") from e
+        for batch in (1, 8, 32, 128):
+            def run() -> float:
+                t0 = time.perf_counter()
+                for start in range(0, len(texts), batch):
+                    emb.encode(texts[start:start + batch])
+                return time.perf_counter() - t0
+
+            metrics[f"embed.{self.embed_provider}.batch={batch}.vectors_per_s"] = Metric(
+                len(texts) / self._best(run), "vectors/s", "higher"
+            )
+
+    def bench_repl(self, workdir: str, metrics: Dict[str, Metric]) -> None:
+        """End-to-end ``run_repl`` turns against a stub ``GUTIL_CODEX_BIN``.
+
+        The REPL runs as a subprocess fed prompts on stdin; per-turn latency is
+        ``(t(N turns) - t(0 turns)) / N`` so interpreter start-up and model load
+        are excluded. The shipped ``config.yaml`` is used with temporary paths;
+        embeddings use the ``hash`` provider to isolate REPL cost.
+        """
+        import yaml
+
+        rng = random.Random(self.seed)
+        stub = os.path.join(workdir, "codex-stub")
+        with open(stub, "w", encoding="utf-8") as f:
+            f.write(f"#!{sys.executable}\nprint('def answer():\\n    return 42')\n")
+        os.chmod(stub, os.stat(stub).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        turns = 5 if self.quick else 20
+        with open(os.path.join(_repo_root(), "cli", "codex_cli", "config.yaml"), "r", encoding="utf-8") as f:
+            defaults = yaml.safe_load(f) or {}  # shipped settings (store, hot index, top_k)
+
+        def session(n: int, tag: str) -> float:
+            cfg = dict(defaults)
+            cfg.update(
+                db_uri=os.path.join(workdir, f"mem-{tag}"),
+                embeddings={"provider": "hash", "dim": self.dim},
+                codex={"args": []},
+                history={"sqlite_path": os.path.join(workdir, f"history-{tag}.db"), "enable": True},
+            )
+            cfg_path = os.path.join(workdir, f"config-{tag}.yaml")
+            with open(cfg_path, "w", encoding="utf-8") as f:
+                yaml.safe_dump(cfg, f)
+            stdin = "".join(_text(rng, 10) + "\n" for _ in range(n)) + ":q\n"
+            env = dict(os.environ, GUTIL_CODEX_BIN=stub, COLUMNS="120")
+            t0 = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, "-m", "cli.codex_cli.cli", cfg_path],
+                input=stdin,
+                text=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env,
+                cwd=_repo_root(),
+            )
+            elapsed = time.perf_counter() - t0
+            if proc.returncode != 0:
+                raise BenchmarkError(f"REPL exited with {proc.returncode}: {proc.stderr.strip()[-500:]}")
+            return elapsed
+
+        runs = iter(range(self.repeat * 2 + 1))
+        session(0, f"warmup-{next(runs)}")  # prime imports and the page cache
+        startup = self._best(lambda: session(0, f"idle-{next(runs)}"))
+        full = self._best(lambda: session(turns, f"turns-{next(runs)}"))
+        metrics["repl.startup_s"] = Metric(startup, "s", "lower")
+        metrics["repl.turn_ms"] = Metric(max(0.0, full - startup) / turns * 1000, "ms", "lower")
+
+
+def _repo_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _environment() -> Dict[str, Any]:
+    env: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+    for mod in ("lancedb", "pyarrow", "numpy", "fastembed"):
+        try:
+            env[mod] = __import__(mod).__version__
+        except Exception:  # noqa: BLE001
+            pass
+    return env
+
+
+def format_results(result: BenchResult) -> str:
+    lines = [f"{'metric':<44} {'value':>14}  unit"]
+    for name, m in sorted(result.metrics.items()):
+        lines.append(f"{name:<44} {m.value:>14,.3f}  {m.unit}")
+    for name, reason in result.skipped.items():
+        lines.append(f"{name:<44} {'skipped':>14}  {reason}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: Sequence[Comparison], threshold: float) -> str:
+    lines = [f"{'metric':<44} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for c in rows:
+        flag = "  REGRESSION" if c.regressed else ""
+        lines.append(f"{c.name:<44} {c.baseline:>12,.3f} {c.current:>12,.3f} {c.change:>+7.1%}{flag}")
+    bad = sum(c.regressed for c in rows)
+    lines.append(f"{bad} regression(s) beyond {threshold:.0%}" if bad else f"no regressions beyond {threshold:.0%}")
+    return "\n".join(lines)
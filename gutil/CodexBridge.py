@@ -3,6 +3,8 @@ import shutil
 import subprocess
 from typing import Iterable, List, Optional, Tuple
 
+from .Tracing import tracer
+
 
 class CodexCLIError(RuntimeError):
     pass
@@ -28,16 +30,18 @@ class CodexCLI:
     def run(self, args: Iterable[str]) -> Tuple[int, str, str]:
         bin_path = self._resolve()
         cmd: List[str] = [bin_path, *list(args)]
-        try:
-            proc = subprocess.run(
-                cmd,
-                check=False,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-        except FileNotFoundError as e:
-            raise CodexCLIError("Failed to execute Codex CLI binary") from e
+        with tracer.span("codex.exec") as span:
+            try:
+                proc = subprocess.run(
+                    cmd,
+                    check=False,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                )
+            except FileNotFoundError as e:
+                raise CodexCLIError("Failed to execute Codex CLI binary") from e
+            span.set(returncode=proc.returncode)
 
         return proc.returncode, proc.stdout, proc.stderr
 
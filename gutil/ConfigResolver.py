@@ -1,48 +1,212 @@
+import copy
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
 import yaml
 from dotenv import dotenv_values
 
+try:  # libyaml-backed loader is several times faster when available
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeLoader as _SafeLoader
+
+
+logger = logging.getLogger("gutil.config")
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=1024)
+def _compile_path(variable_path: str) -> Tuple[str, ...]:
+    """Split a slash-separated key path once and reuse the tuple."""
+    return tuple(variable_path.split('/'))
+
+
+@lru_cache(maxsize=1024)
+def _env_name(variable_path: str) -> str:
+    """Map a key path like ``database/url`` to ``DATABASE_URL``."""
+    return variable_path.replace('/', '_').upper()
+
+
+def _detached(value: Any) -> Any:
+    """Copy containers handed to callers so their edits cannot reach the shared cache."""
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+class _DocumentCache:
+    """Parsed file cache keyed by absolute path, invalidated on mtime/size change.
+
+    Documents are shared by every resolver and must not be mutated;
+    ``ConfigResolver`` only reads them and hands out copies.
+    """
+
+    def __init__(self) -> None:
+        self._docs: Dict[Tuple[str, str], Tuple[int, int, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, path: str) -> Any:
+        abspath = os.path.abspath(path)
+        st = os.stat(abspath)  # raises FileNotFoundError like open() did
+        key = (kind, abspath)
+        cached = self._docs.get(key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        with self._lock:
+            cached = self._docs.get(key)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                return cached[2]
+            value = self._parse(kind, abspath)
+            self._docs[key] = (st.st_mtime_ns, st.st_size, value)
+            logger.debug("Parsed %s file %s", kind, abspath)
+            return value
+
+    @staticmethod
+    def _parse(kind: str, path: str) -> Any:
+        if kind == 'config':
+            with open(path, 'r', encoding='utf-8') as file:
+                return yaml.load(file, Loader=_SafeLoader) or {}
+        return dict(dotenv_values(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+
+
+_cache = _DocumentCache()
+
+
 class ConfigResolver:
-    def __init__(self):
-        self.env_vars = {}
-        self.config = None
+    """Resolve values from ``config.yaml``, ``.env`` and the process environment.
+
+    Parsed files are cached per path and re-read only when their mtime or size
+    changes, so repeated lookups cost a ``stat`` and a few dict accesses.
+    Pass ``verbose=True`` to log lookups at INFO; otherwise they go to DEBUG.
+    """
+
+    def __init__(
+        self,
+        config_path: str = 'config.yaml',
+        env_path: str = '.env',
+        verbose: bool = False,
+    ):
+        self.config_path = config_path
+        self.env_path = env_path
+        self._env_vars: Dict[str, Optional[str]] = {}
+        self._config: Any = None
+        self._log_level = logging.INFO if verbose else logging.DEBUG
+
+    def _log(self, msg: str, *args: Any) -> None:
+        if logger.isEnabledFor(self._log_level):
+            logger.log(self._log_level, msg, *args)
+
+    @property
+    def config(self) -> Any:
+        """Copy of the YAML document as last loaded (None before the first load)."""
+        return _detached(self._config)
+
+    @property
+    def env_vars(self) -> Dict[str, Optional[str]]:
+        """Copy of the ``.env`` values as last loaded."""
+        return dict(self._env_vars)
+
+    def _load_yaml(self) -> Any:
+        self._config = _cache.get('config', self.config_path)
+        return self._config
+
+    def _load_env(self) -> Dict[str, Optional[str]]:
+        self._env_vars = _cache.get('env', self.env_path)
+        return self._env_vars
+
+    @staticmethod
+    def _lookup(doc: Any, keys: Tuple[str, ...]) -> Any:
+        value = doc
+        for key in keys:
+            if isinstance(value, dict) and key in value:
+                value = value[key]
+            else:
+                return _MISSING
+        return value
 
     def load_config(self, source, variable_path):
         """Load configuration or environment variables and access nested keys."""
         try:
             if source == 'config':
-                # Load YAML config
-                with open('config.yaml', 'r') as file:
-                    self.config = yaml.load(file, Loader=yaml.Loader)
-                print(f"Loaded configuration from config.yaml")
-
-                # Access the nested variable using the variable_path
-                keys = variable_path.split('/')
-                value = self.config
-                for key in keys:
-                    if key in value:
+                value = self._load_yaml()
+                for key in _compile_path(variable_path):
+                    if isinstance(value, dict) and key in value:
                         value = value[key]
                     else:
                         raise KeyError(f"Key '{key}' not found in the configuration path '{variable_path}'")
-                print(f"Accessed variable '{variable_path}' with value: {value}")
-                return value
+                self._log("Accessed variable '%s' from %s", variable_path, self.config_path)
+                return _detached(value)
             elif source == 'env':
-                # Load environment variables from the .env file
-                self.env_vars = dotenv_values('.env')
-                print(f"Loaded environment variables from .env")
-
-                # Access the environment variable directly
-                key = variable_path
-                if key in self.env_vars:
-                    value = self.env_vars[key]
-                    print(f"Accessed environment variable '{key}' with value: {value}")
-                    return value
-                else:
-                    raise KeyError(f"Environment variable '{key}' not found")
+                env_vars = self._load_env()
+                if variable_path in env_vars:
+                    self._log("Accessed environment variable '%s' from %s", variable_path, self.env_path)
+                    return env_vars[variable_path]
+                raise KeyError(f"Environment variable '{variable_path}' not found")
             else:
                 raise ValueError("Invalid source type. Must be 'config' or 'env'.")
         except KeyError as e:
-            print(f"Key error: {e}")
+            self._log("Key error: %s", e)
             raise
         except Exception as e:
-            print(f"Error loading configuration or environment variable: {e}")
+            self._log("Error loading configuration or environment variable: %s", e)
             raise
+
+    def _sources(self) -> Tuple[Dict[str, Optional[str]], Any]:
+        try:
+            env_vars = self._load_env()
+        except FileNotFoundError:
+            env_vars = {}
+        try:
+            config = self._load_yaml()
+        except FileNotFoundError:
+            config = {}
+        return env_vars, config
+
+    def _resolve_in(self, variable_path: str, env_vars: Dict[str, Optional[str]], config: Any) -> Any:
+        name = _env_name(variable_path)
+        if name in os.environ:
+            return os.environ[name]
+        if name in env_vars:
+            return env_vars[name]
+        return self._lookup(config, _compile_path(variable_path))
+
+    def resolve(self, variable_path: str, default: Any = _MISSING) -> Any:
+        """Resolve a key using layered sources: process env, then ``.env``, then YAML.
+
+        ``database/url`` is looked up as ``DATABASE_URL`` in the environment
+        layers and as the nested ``database -> url`` path in YAML. Missing
+        files are treated as empty layers.
+        """
+        env_vars, config = self._sources()
+        value = self._resolve_in(variable_path, env_vars, config)
+        if value is _MISSING:
+            if default is not _MISSING:
+                return default
+            raise KeyError(f"Key '{variable_path}' not found in env, {self.env_path} or {self.config_path}")
+        self._log("Resolved '%s'", variable_path)
+        return _detached(value)
+
+    def resolve_many(self, variable_paths: Iterable[str], default: Any = _MISSING) -> Dict[str, Any]:
+        """Resolve several keys against a single snapshot of every source."""
+        env_vars, config = self._sources()
+        out: Dict[str, Any] = {}
+        for path in variable_paths:
+            value = self._resolve_in(path, env_vars, config)
+            if value is _MISSING:
+                if default is _MISSING:
+                    raise KeyError(f"Key '{path}' not found in env, {self.env_path} or {self.config_path}")
+                value = default
+            out[path] = _detached(value)
+        self._log("Resolved %d keys", len(out))
+        return out
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all cached parsed documents (they are re-read on next access)."""
+        _cache.clear()
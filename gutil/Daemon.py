@@ -0,0 +1,515 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Protocol: one JSON object per line in each direction over a Unix socket.
+# Requests are ``{"op": name, ...params}``; replies are ``{"ok": true,
+# "result": ...}`` or ``{"ok": false, "error": message, "type": class name}``.
+
+
+class DaemonError(RuntimeError):
+    pass
+
+
+class DaemonUnavailable(DaemonError):
+    """No daemon answered on the socket; callers fall back to in-process mode."""
+
+
+def default_socket_path() -> str:
+    """``$GUTIL_DAEMON_SOCKET``, else ``$XDG_RUNTIME_DIR/gutil/daemon.sock``, else ``~/.cache/gutil/daemon.sock``."""
+    env = os.environ.get("GUTIL_DAEMON_SOCKET")
+    if env:
+        return env
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "gutil", "daemon.sock")
+
+
+def _pid_path(socket_path: str) -> str:
+    return socket_path + ".pid"
+
+
+def _jsonable(obj: Any) -> Any:
+    if hasattr(obj, "tolist"):  # numpy arrays and scalars
+        return obj.tolist()
+    return str(obj)
+
+
+def _encode(obj: Dict[str, Any]) -> bytes:
+    return json.dumps(obj, default=_jsonable, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class DaemonClient:
+    """Talks to a running daemon; one connection per calling thread.
+
+    Connection failures raise ``DaemonUnavailable`` (after one reconnect
+    attempt, in case the daemon restarted); errors raised by an operation on
+    the daemon side raise ``DaemonError``.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 120.0) -> None:
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise DaemonUnavailable(f"No gutil daemon at {self.socket_path}: {e}") from e
+        self._local.sock = sock
+        self._local.reader = sock.makefile("rb")
+        return sock
+
+    def _drop(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            self._local.reader.close()
+            sock.close()
+        self._local.sock = None
+
+    def call(self, op: str, **params: Any) -> Any:
+        request = _encode(dict(params, op=op))
+        for attempt in (0, 1):
+            sock = getattr(self._local, "sock", None) or self._connect()
+            try:
+                sock.sendall(request)
+                line = self._local.reader.readline()
+            except OSError as e:
+                self._drop()
+                if attempt:
+                    raise DaemonUnavailable(f"gutil daemon connection failed: {e}") from e
+                continue
+            if not line:
+                self._drop()
+                if attempt:
+                    raise DaemonUnavailable("gutil daemon closed the connection")
+                continue
+            reply = json.loads(line)
+            if not reply.get("ok"):
+                raise DaemonError(f"{reply.get('type', 'Error')}: {reply.get('error')}")
+            return reply.get("result")
+        raise DaemonUnavailable("unreachable")  # pragma: no cover
+
+    def ping(self) -> bool:
+        try:
+            return self.call("ping") == "pong"
+        except DaemonError:
+            return False
+
+    def close(self) -> None:
+        self._drop()
+
+
+def connect(socket_path: Optional[str] = None) -> Optional[DaemonClient]:
+    """Return a client if a daemon answers on ``socket_path``, else None.
+
+    ``GUTIL_DAEMON=off`` skips the check, forcing in-process mode.
+    """
+    if os.environ.get("GUTIL_DAEMON", "").lower() in ("0", "off", "false", "no"):
+        return None
+    path = socket_path or default_socket_path()
+    if not os.path.exists(path):
+        return None
+    probe = DaemonClient(path, timeout=2.0)
+    try:
+        alive = probe.ping()
+    finally:
+        probe.close()
+    return DaemonClient(path) if alive else None
+
+
+# -- server -------------------------------------------------------------------
+
+
+def _key(spec: Dict[str, Any]) -> str:
+    return json.dumps(spec, sort_keys=True, default=str)
+
+
+class _Resources:
+    """Warm objects shared by all connections, built on first use.
+
+    Each object gets its own lock: embedding models and the LanceDB hot
+    index are not safe to call from several threads at once, but different
+    tables and models can serve requests in parallel. Building happens
+    outside the registry lock, behind a per-key future, so loading one model
+    does not hold up requests for objects that are already warm; concurrent
+    first callers for the same key wait for the one build. A failed build is
+    dropped so the next request retries it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: Dict[Tuple[str, str], "Future[Tuple[Any, threading.Lock]]"] = {}
+
+    def get(self, kind: str, spec: Dict[str, Any], build: Callable[[], Any]) -> Tuple[Any, threading.Lock]:
+        key = (kind, _key(spec))
+        with self._lock:
+            pending = self._items.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._items[key] = Future()
+        if owner:
+            try:
+                pending.set_result((build(), threading.Lock()))
+            except BaseException as e:
+                with self._lock:
+                    self._items.pop(key, None)
+                pending.set_exception(e)
+                raise
+        return pending.result()
+
+    def _ready(self) -> List[Tuple[Tuple[str, str], Tuple[Any, threading.Lock]]]:
+        return [(key, f.result()) for key, f in self._items.items() if f.done() and f.exception() is None]
+
+    def describe(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"kind": kind, "spec": json.loads(spec)} for (kind, spec), _ in self._ready()]
+
+    def close(self) -> None:
+        with self._lock:
+            for _, (obj, _) in self._ready():
+                close = getattr(obj, "close", None)
+                if close is not None:
+                    try:
+                        close()
+                    except Exception:  # noqa: BLE001
+                        pass
+            self._items.clear()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_UnixServer"
+
+    def handle(self) -> None:
+        daemon = self.server.daemon
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                op = request.pop("op")
+                result = daemon.dispatch(op, request)
+                reply = {"ok": True, "result": result}
+            except Exception as e:  # noqa: BLE001
+                reply = {"ok": False, "error": str(e), "type": type(e).__name__}
+            try:
+                self.wfile.write(_encode(reply))
+                self.wfile.flush()
+            except OSError:
+                return
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    daemon: "DaemonServer"
+
+
+class DaemonServer:
+    """Serves embedding, search and remember operations from one warm process.
+
+    Embedding models, vector stores (with their hot index) and code indexes
+    are built on first request and kept for the life of the process, so
+    clients skip model loading, DB connections and heavy imports. Paths in
+    specs should be absolute: the daemon's working directory is not the
+    client's. With ``idle_timeout`` > 0 the daemon exits after that many
+    seconds without a request.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        idle_timeout: float = 0,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.socket_path = socket_path or default_socket_path()
+        self.idle_timeout = idle_timeout
+        self.log = log or (lambda msg: None)
+        self.resources = _Resources()
+        self.started = time.time()
+        self.last_request = self.started
+        self.requests: Dict[str, int] = {}
+        self._server: Optional[_UnixServer] = None
+
+    # -- operations ---------------------------------------------------------
+
+    def _embeddings(self, spec: Dict[str, Any]):
+        from cli.codex_cli.embeddings import EmbeddingConfig, Embeddings
+
+        spec = {"provider": spec.get("provider") or "fastembed", "model": spec.get("model"), "dim": spec.get("dim")}
+        return self.resources.get("embeddings", spec, lambda: Embeddings(EmbeddingConfig(**spec)))
+
+    def _store(self, spec: Dict[str, Any]):
+        from cli.codex_cli.vector_store import open_store
+
+        return self.resources.get("store", spec, lambda: open_store(spec))
+
+    def _code_index(self, spec: Dict[str, Any]):
+        from .Ingest import CodeIndex
+
+        return self.resources.get("code", spec, lambda: CodeIndex(spec["uri"], spec["table"]))
+
+    def op_ping(self) -> str:
+        return "pong"
+
+    def op_status(self) -> Dict[str, Any]:
+        import resource
+
+        return {
+            "pid": os.getpid(),
+            "socket": self.socket_path,
+            "uptime_s": round(time.time() - self.started, 1),
+            "idle_s": round(time.time() - self.last_request, 1),
+            "requests": dict(self.requests),
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "loaded": self.resources.describe(),
+        }
+
+    def op_embed(self, texts: List[str], embeddings: Dict[str, Any]) -> List[List[float]]:
+        emb, lock = self._embeddings(embeddings)
+        with lock:
+            return emb.encode(texts)
+
+    def op_search(self, store: Dict[str, Any], vectors: List[List[float]], k: int = 5) -> List[List[Dict[str, Any]]]:
+        st, lock = self._store(store)
+        with lock:
+            return st.search_batch(vectors, k=k)
+
+    def op_remember(self, store: Dict[str, Any], entries: List[Dict[str, Any]]) -> int:
+        from cli.codex_cli.vector_store import MemoryEntry
+
+        st, lock = self._store(store)
+        with lock:
+            st.add_batch([MemoryEntry(**e) for e in entries])
+        return len(entries)
+
+    def op_delete(self, store: Dict[str, Any], ids: List[str]) -> int:
+        st, lock = self._store(store)
+        with lock:
+            return st.delete(ids)
+
+    def op_count(self, store: Dict[str, Any]) -> int:
+        st, lock = self._store(store)
+        with lock:
+            return st.count()
+
+    def op_code_search(self, code: Dict[str, Any], vector: List[float], k: int = 3) -> List[Dict[str, Any]]:
+        index, lock = self._code_index(code)
+        with lock:
+            return index.search(vector, k=k)
+
+    def op_preload(
+        self,
+        embeddings: Optional[Dict[str, Any]] = None,
+        store: Optional[Dict[str, Any]] = None,
+        code: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        if embeddings is not None:
+            emb, lock = self._embeddings(embeddings)
+            with lock:
+                emb.encode(["warm up"])  # fastembed loads the ONNX session lazily
+        if store is not None:
+            self._store(store)
+        if code is not None:
+            self._code_index(code)
+        return self.resources.describe()
+
+    def op_shutdown(self) -> bool:
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return True
+
+    def dispatch(self, op: str, params: Dict[str, Any]) -> Any:
+        handler = getattr(self, f"op_{op}", None)
+        if handler is None:
+            raise DaemonError(f"Unknown operation: {op}")
+        self.last_request = time.time()
+        self.requests[op] = self.requests.get(op, 0) + 1
+        return handler(**params)
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def _bind(self) -> _UnixServer:
+        directory = os.path.dirname(os.path.abspath(self.socket_path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if DaemonClient(self.socket_path, timeout=2).ping():
+                raise DaemonError(f"A gutil daemon is already running at {self.socket_path}")
+            os.unlink(self.socket_path)  # stale socket from a crashed daemon
+        old_umask = os.umask(0o177)
+        try:
+            server = _UnixServer(self.socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        server.daemon = self
+        return server
+
+    def _watch_idle(self) -> None:
+        while self._server is not None:
+            time.sleep(min(self.idle_timeout, 5.0))
+            if time.time() - self.last_request >= self.idle_timeout:
+                self.log(f"idle for {self.idle_timeout:.0f}s, exiting")
+                self.shutdown()
+                return
+
+    def serve(self) -> None:
+        """Serve until ``shutdown`` (the ``shutdown`` op, SIGTERM or SIGINT)."""
+        self._server = self._bind()
+        with open(_pid_path(self.socket_path), "w", encoding="utf-8") as f:
+            f.write(str(os.getpid()))
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, lambda *_: threading.Thread(target=self.shutdown, daemon=True).start())
+        if self.idle_timeout > 0:
+            threading.Thread(target=self._watch_idle, name="gutil-daemon-idle", daemon=True).start()
+        self.log(f"gutil daemon {os.getpid()} listening on {self.socket_path}")
+        try:
+            self._server.serve_forever(poll_interval=0.5)
+        finally:
+            server, self._server = self._server, None
+            server.server_close()
+            self.resources.close()
+            for path in (self.socket_path, _pid_path(self.socket_path)):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self.log("gutil daemon stopped")
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+
+# -- process management (``gutil daemon start|stop|status``) ------------------
+
+
+def status(socket_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The running daemon's ``status`` reply, or None when none answers."""
+    client = DaemonClient(socket_path, timeout=5)
+    try:
+        return client.call("status")
+    except DaemonUnavailable:
+        return None
+    finally:
+        client.close()
+
+
+def start(
+    socket_path: Optional[str] = None,
+    config: Optional[str] = None,
+    idle_timeout: float = 0,
+    log_path: Optional[str] = None,
+    wait: float = 60.0,
+) -> int:
+    """Launch ``gutil daemon run`` detached and wait until it answers.
+
+    With ``config`` (a codex REPL config.yaml) the embedding model, memory
+    store and code index it names are loaded before this returns. Returns
+    the daemon's pid.
+    """
+    socket_path = os.path.abspath(socket_path or default_socket_path())
+    running = status(socket_path)
+    if running is not None:
+        raise DaemonError(f"gutil daemon already running (pid {running['pid']}) at {socket_path}")
+    cmd = [sys.executable, "-m", "gutil", "daemon", "run", "--socket", socket_path]
+    if config:
+        cmd += ["--config", os.path.abspath(config)]
+    if idle_timeout:
+        cmd += ["--idle-timeout", str(idle_timeout)]
+    log_path = log_path or socket_path + ".log"
+    os.makedirs(os.path.dirname(log_path), mode=0o700, exist_ok=True)
+    with open(log_path, "ab") as log:
+        proc = subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True
+        )
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise DaemonError(f"gutil daemon exited with code {proc.returncode}; see {log_path}")
+        running = status(socket_path)
+        if running is not None and running.get("pid") == proc.pid:
+            return proc.pid
+        time.sleep(0.1)
+    raise DaemonError(f"gutil daemon did not come up within {wait:.0f}s; see {log_path}")
+
+
+def _is_daemon(pid: int) -> bool:
+    """Guard against signalling an unrelated process that reused a stale pid."""
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return b"daemon" in f.read()
+    except FileNotFoundError:
+        return not os.path.isdir("/proc/self")  # no procfs: trust the pid file
+    except OSError:
+        return True
+
+
+def stop(socket_path: Optional[str] = None, timeout: float = 10.0) -> Optional[int]:
+    """Ask the daemon to exit (SIGTERM via its pid file if it does not answer).
+
+    Returns the stopped pid, or None if no daemon was running.
+    """
+    socket_path = os.path.abspath(socket_path or default_socket_path())
+    pid: Optional[int] = None
+    client = DaemonClient(socket_path, timeout=5)
+    try:
+        pid = client.call("status")["pid"]
+        client.call("shutdown")
+    except DaemonUnavailable:
+        try:
+            with open(_pid_path(socket_path), "r", encoding="utf-8") as f:
+                pid = int(f.read().strip())
+            if not _is_daemon(pid):
+                return None
+            os.kill(pid, signal.SIGTERM)
+        except (OSError, ValueError):
+            return None
+    finally:
+        client.close()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return pid
+        time.sleep(0.1)
+    raise DaemonError(f"gutil daemon (pid {pid}) did not exit within {timeout:.0f}s")
+
+
+def specs_from_config(cfg: Dict[str, Any]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Daemon specs for the embeddings, memory store and code index of a REPL config.
+
+    Paths are made absolute against the caller's working directory.
+    """
+    db_uri = os.path.abspath(cfg.get("db_uri", "./data/codex_memory"))
+    ecfg = cfg.get("embeddings", {}) or {}
+    rcfg = cfg.get("retrieval", {}) or {}
+    code = None
+    if rcfg.get("code_table"):
+        code_uri = rcfg.get("code_db_uri")
+        code = {"uri": os.path.abspath(code_uri) if code_uri else db_uri, "table": rcfg["code_table"]}
+    return {
+        "embeddings": {
+            "provider": ecfg.get("provider", "fastembed"),
+            "model": ecfg.get("model"),
+            "dim": ecfg.get("dim"),
+        },
+        "store": {
+            "store": str(cfg.get("store") or "lancedb").lower(),
+            "db_uri": db_uri,
+            "table": cfg.get("table", "interactions"),
+            "hot_index": cfg.get("hot_index") or {},
+            "writes": cfg.get("writes") or {},
+        },
+        "code": code,
+    }
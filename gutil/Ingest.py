@@ -0,0 +1,524 @@
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .LanceDB import _ensure_lancedb
+
+# Directory names never descended into.
+SKIP_DIRS = {
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".mypy_cache",
+    ".pytest_cache", ".tox", "dist", "build", ".idea", ".vscode", "target", ".next",
+}
+
+LANGUAGES = {
+    ".py": "python", ".pyi": "python",
+    ".js": "javascript", ".jsx": "javascript", ".mjs": "javascript", ".cjs": "javascript",
+    ".ts": "typescript", ".tsx": "typescript",
+    ".go": "go", ".rs": "rust", ".java": "java", ".kt": "kotlin", ".scala": "scala",
+    ".c": "c", ".h": "c", ".cc": "cpp", ".cpp": "cpp", ".hpp": "cpp", ".cs": "csharp",
+    ".rb": "ruby", ".php": "php", ".swift": "swift", ".sh": "shell", ".sql": "sql",
+    ".md": "markdown", ".rst": "rst", ".txt": "text",
+    ".yaml": "yaml", ".yml": "yaml", ".toml": "toml", ".json": "json", ".html": "html", ".css": "css",
+}
+
+# Lines that start a new top-level unit, per language. Only unindented lines
+# are considered, so nested definitions stay with their parent.
+_BOUNDARIES = {
+    "python": re.compile(r"(?:async\s+def|def|class)\s|@"),
+    "javascript": re.compile(r"(?:export\s+)?(?:default\s+)?(?:async\s+)?(?:function|class|const|let|var)\b"),
+    "typescript": re.compile(
+        r"(?:export\s+)?(?:default\s+)?(?:async\s+)?(?:function|class|const|let|interface|type|enum)\b"
+    ),
+    "go": re.compile(r"(?:func|type|var|const)\b"),
+    "rust": re.compile(r"(?:pub(?:\([^)]*\))?\s+)?(?:async\s+)?(?:fn|struct|enum|trait|impl|mod|const|static)\b|#\["),
+    "java": re.compile(r"(?:public|private|protected|abstract|final|class|interface|enum|@)"),
+    "kotlin": re.compile(r"(?:fun|class|object|interface|data|sealed|val|var|@)"),
+    "csharp": re.compile(r"(?:public|private|protected|internal|class|interface|enum|namespace|\[)"),
+    "ruby": re.compile(r"(?:def|class|module)\b"),
+    "php": re.compile(r"(?:function|class|interface|trait|abstract|final)\b"),
+    "swift": re.compile(r"(?:func|class|struct|enum|protocol|extension|@)"),
+    "c": re.compile(r"[A-Za-z_][\w\s\*]*\(|(?:struct|typedef|enum|#define)\b"),
+    "cpp": re.compile(r"[A-Za-z_][\w\s\*:<>,&]*\(|(?:class|struct|namespace|template|typedef|enum)\b"),
+    "shell": re.compile(r"(?:function\s+)?[A-Za-z_][\w-]*\s*\(\)"),
+    "markdown": re.compile(r"#{1,6}\s"),
+}
+
+
+class IngestError(RuntimeError):
+    pass
+
+
+@dataclass
+class Chunk:
+    path: str
+    start_line: int  # 1-based, inclusive
+    end_line: int
+    text: str
+    language: str
+
+    @property
+    def chunk_hash(self) -> str:
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+    @property
+    def id(self) -> str:
+        return chunk_id(self.path, self.chunk_hash)
+
+
+def chunk_id(path: str, chunk_hash: str) -> str:
+    """Row key derived from ``(path, chunk_hash)``."""
+    return hashlib.sha256(f"{path}\0{chunk_hash}".encode("utf-8")).hexdigest()[:32]
+
+
+def language_for(path: str) -> str:
+    return LANGUAGES.get(os.path.splitext(path)[1].lower(), "text")
+
+
+_LEAD = ("@", "#[", "//", "/*", "* ", "*/", "# ")
+
+
+def _units(lines: List[str], language: str) -> List[Tuple[int, int]]:
+    """Split ``lines`` into ``(start, end)`` half-open ranges at top-level boundaries."""
+    pattern = _BOUNDARIES.get(language)
+    if pattern is None:
+        return [(0, len(lines))]
+    starts = [0]
+    for i, line in enumerate(lines):
+        if i == 0 or not line or line[0].isspace() or not pattern.match(line):
+            continue
+        # keep decorators and comments directly above a definition with it
+        j = i
+        while j > starts[-1] and lines[j - 1].startswith(_LEAD):
+            j -= 1
+        if j > starts[-1]:
+            starts.append(j)
+    return [(s, e) for s, e in zip(starts, starts[1:] + [len(lines)])]
+
+
+def chunk_text(path: str, text: str, max_lines: int = 80, max_chars: int = 3000) -> List[Chunk]:
+    """Code-aware chunking.
+
+    Files are split at top-level definitions (functions, classes, types;
+    headings for Markdown), small neighbouring units are merged up to
+    ``max_lines``/``max_chars``, and oversized units are cut into windows.
+    Unknown languages are cut into windows directly. Chunks are whole lines.
+    """
+    language = language_for(path)
+    lines = text.splitlines(keepends=True)
+    chunks: List[Chunk] = []
+
+    def emit(start: int, end: int) -> None:
+        body = "".join(lines[start:end])
+        if body.strip():
+            chunks.append(Chunk(path, start + 1, end, body, language))
+
+    cur_start: Optional[int] = None
+    cur_end = 0
+    cur_chars = 0
+    for start, end in _units(lines, language):
+        size = sum(len(line) for line in lines[start:end])
+        if end - start > max_lines or size > max_chars:
+            if cur_start is not None:
+                emit(cur_start, cur_end)
+                cur_start = None
+            win_start = start
+            while win_start < end:
+                win_end = win_start
+                chars = 0
+                while win_end < end and win_end - win_start < max_lines and chars + len(lines[win_end]) <= max_chars:
+                    chars += len(lines[win_end])
+                    win_end += 1
+                win_end = max(win_end, win_start + 1)
+                emit(win_start, win_end)
+                win_start = win_end
+            continue
+        if cur_start is not None and (end - cur_start > max_lines or cur_chars + size > max_chars):
+            emit(cur_start, cur_end)
+            cur_start = None
+        if cur_start is None:
+            cur_start, cur_chars = start, 0
+        cur_end = end
+        cur_chars += size
+    if cur_start is not None:
+        emit(cur_start, cur_end)
+    return chunks
+
+
+def _schema(dim: int):
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            pa.field("id", pa.string()),
+            pa.field("path", pa.string()),
+            pa.field("chunk_hash", pa.string()),
+            pa.field("start_line", pa.int32()),
+            pa.field("end_line", pa.int32()),
+            pa.field("language", pa.string()),
+            pa.field("text", pa.string()),
+            pa.field("mtime", pa.float64()),
+            pa.field("embedding", pa.list_(pa.float32(), dim)),
+        ]
+    )
+
+
+def _row(c: Chunk, mtime: float, vector: Sequence[float]) -> Dict[str, Any]:
+    return {
+        "id": c.id,
+        "path": c.path,
+        "chunk_hash": c.chunk_hash,
+        "start_line": c.start_line,
+        "end_line": c.end_line,
+        "language": c.language,
+        "text": c.text,
+        "mtime": mtime,
+        "embedding": list(vector),
+    }
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+@dataclass
+class IngestReport:
+    files_scanned: int = 0
+    files_new: int = 0
+    files_changed: int = 0
+    files_deleted: int = 0
+    files_unchanged: int = 0
+    chunks_embedded: int = 0
+    chunks_kept: int = 0
+    chunks_deleted: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"{self.files_scanned} files: {self.files_new} new, {self.files_changed} changed, "
+            f"{self.files_deleted} deleted, {self.files_unchanged} unchanged; "
+            f"{self.chunks_embedded} chunks embedded, {self.chunks_kept} kept, "
+            f"{self.chunks_deleted} removed in {self.seconds:.2f}s"
+        )
+
+
+class DirectoryIngestor:
+    """Keeps a LanceDB table of embedded chunks in step with a source tree.
+
+    Rows are keyed by ``(path, chunk_hash)`` (``id`` is a digest of both) and
+    upserted with ``merge_insert``. A manifest (``<uri>/<table>.manifest.json``)
+    records each file's size, mtime, content hash and chunk hashes (binary
+    and oversized files get an entry with no hash or chunks): files
+    whose size and mtime match are skipped without being read, files whose
+    content hash matches only refresh their mtime, and for changed files only
+    chunks with a new hash are embedded while vanished ones are deleted (kept
+    chunks are rewritten with their stored vector so line numbers follow edits).
+    Work is flushed every ``flush_chunks`` chunks and the manifest saved after
+    each flush, so an interrupted run resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        table: str,
+        root: str,
+        embeddings: Any,
+        batch_size: int = 64,
+        workers: int = 2,
+        flush_chunks: int = 1024,
+        max_file_bytes: int = 1_000_000,
+        exclude: Sequence[str] = (),
+        max_lines: int = 80,
+        max_chars: int = 3000,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        if not os.path.isdir(root):
+            raise IngestError(f"Not a directory: {root}")
+        _ensure_lancedb()
+        import lancedb  # type: ignore
+
+        self.db = lancedb.connect(uri)
+        self.uri = uri
+        self.table_name = table
+        self.root = os.path.abspath(root)
+        self.embeddings = embeddings
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.flush_chunks = max(self.batch_size, flush_chunks)
+        self.max_file_bytes = max_file_bytes
+        self.exclude = list(exclude)
+        self.max_lines = max_lines
+        self.max_chars = max_chars
+        self.log = log or (lambda msg: None)
+        self.manifest_path = os.path.join(uri, f"{table}.manifest.json")
+        self._db_path = os.path.abspath(uri)
+        self.manifest = self._load_manifest()
+        self._table = None
+
+    # -- manifest -----------------------------------------------------------
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {"version": 1, "root": self.root, "files": {}}
+        if data.get("root") != self.root:
+            raise IngestError(
+                f"Table '{self.table_name}' was ingested from {data.get('root')}, not {self.root}; "
+                "use another table name"
+            )
+        return data
+
+    def _save_manifest(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.manifest_path)), exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, separators=(",", ":"))
+        os.replace(tmp, self.manifest_path)
+
+    # -- walking ------------------------------------------------------------
+
+    def _excluded(self, rel: str) -> bool:
+        return any(fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(os.path.basename(rel), pat) for pat in self.exclude)
+
+    def _is_db_path(self, path: str) -> bool:
+        # the database, its manifest and hot-index siblings (<uri>.<table>.hot.*)
+        path = os.path.abspath(path)
+        return path == self._db_path or path.startswith((self._db_path + os.sep, self._db_path + "."))
+
+    def accepts(self, rel: str) -> bool:
+        """Whether ``rel`` (relative to ``root``) is a file this ingestor indexes."""
+        parts = rel.split("/")
+        if any(p in SKIP_DIRS or p.startswith(".") for p in parts):
+            return False
+        return not self._excluded(rel) and not self._is_db_path(os.path.join(self.root, rel))
+
+    def walk(self) -> Iterator[str]:
+        """Relative paths of candidate files under ``root`` (POSIX separators)."""
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            rel_dir = os.path.relpath(dirpath, self.root)
+            dirnames[:] = sorted(
+                d for d in dirnames
+                if d not in SKIP_DIRS and not d.startswith(".")
+                and not self._excluded(os.path.normpath(os.path.join(rel_dir, d)).replace(os.sep, "/"))
+                and not self._is_db_path(os.path.join(dirpath, d))
+            )
+            for name in sorted(filenames):
+                rel = os.path.normpath(os.path.join(rel_dir, name)).replace(os.sep, "/")
+                if name.startswith(".") or self._excluded(rel) or self._is_db_path(os.path.join(dirpath, name)):
+                    continue
+                yield rel
+
+    def _read(self, rel: str) -> Optional[str]:
+        path = os.path.join(self.root, rel)
+        with open(path, "rb") as f:
+            raw = f.read(self.max_file_bytes + 1)
+        if len(raw) > self.max_file_bytes or b"\0" in raw[:8192]:
+            return None  # too large or binary
+        return raw.decode("utf-8", errors="replace")
+
+    # -- table --------------------------------------------------------------
+
+    def _open(self, dim: Optional[int] = None):
+        if self._table is not None:
+            return self._table
+        names = self.db.table_names() if hasattr(self.db, "table_names") else list(self.db.list_tables())
+        if self.table_name in names:
+            self._table = self.db.open_table(self.table_name)
+        elif dim is not None:
+            self._table = self.db.create_table(self.table_name, schema=_schema(dim))
+        return self._table
+
+    def _delete_ids(self, ids: Sequence[str]) -> None:
+        tbl = self._open()
+        if tbl is None:
+            return
+        for start in range(0, len(ids), 500):
+            part = ids[start:start + 500]
+            tbl.delete("id IN (" + ", ".join(_quote(i) for i in part) + ")")
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if self.workers == 1 or len(batches) == 1:
+            results = [self.embeddings.encode(b) for b in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(self.embeddings.encode, batches))
+        return [list(v) for batch in results for v in batch]
+
+    def _stored_vectors(self, ids: Sequence[str]) -> Dict[str, List[float]]:
+        tbl = self._open()
+        if tbl is None:
+            return {}
+        found: Dict[str, List[float]] = {}
+        for start in range(0, len(ids), 500):
+            where = "id IN (" + ", ".join(_quote(i) for i in ids[start:start + 500]) + ")"
+            part = tbl.search().where(where).select(["id", "embedding"]).limit(None).to_arrow()
+            found.update(zip(part.column("id").to_pylist(), part.column("embedding").to_pylist()))
+        return found
+
+    def _flush(
+        self,
+        pending: List[Tuple[Chunk, float]],
+        kept: List[Tuple[Chunk, float]],
+        entries: Dict[str, Dict[str, Any]],
+        stale: List[str],
+    ) -> None:
+        rows: List[Dict[str, Any]] = []
+        if kept:
+            # unchanged chunks of an edited file may have moved; rewrite their
+            # line numbers with the stored vector instead of embedding again
+            stored = self._stored_vectors([c.id for c, _ in kept])
+            rows.extend(_row(c, mtime, stored[c.id]) for c, mtime in kept if c.id in stored)
+            pending.extend((c, mtime) for c, mtime in kept if c.id not in stored)
+        if pending:
+            vectors = self._embed([c.text for c, _ in pending])
+            rows.extend(_row(c, mtime, vec) for (c, mtime), vec in zip(pending, vectors))
+        if rows:
+            tbl = self._open(dim=len(rows[0]["embedding"]))
+            tbl.merge_insert("id").when_matched_update_all().when_not_matched_insert_all().execute(rows)
+        if stale:
+            self._delete_ids(stale)
+        files = self.manifest["files"]
+        for rel, entry in entries.items():
+            if entry is None:
+                files.pop(rel, None)
+            else:
+                files[rel] = entry
+        self._save_manifest()
+        pending.clear()
+        kept.clear()
+        entries.clear()
+        stale.clear()
+
+    # -- sync ---------------------------------------------------------------
+
+    def sync(self, paths: Optional[Iterable[str]] = None) -> IngestReport:
+        """Bring the table up to date.
+
+        With ``paths`` (relative to ``root``), only those files are checked,
+        and any of them that no longer exist are removed; otherwise the whole
+        tree is walked and manifest entries for missing files are removed.
+        """
+        t0 = time.perf_counter()
+        report = IngestReport()
+        files: Dict[str, Any] = self.manifest["files"]
+        if paths is None:
+            candidates = list(self.walk())
+            gone = set(files) - set(candidates)
+        else:
+            candidates, gone = [], set()
+            for rel in sorted(set(paths)):
+                full = os.path.join(self.root, rel)
+                if os.path.isfile(full) and self.accepts(rel):
+                    candidates.append(rel)
+                elif rel in files:
+                    gone.add(rel)
+
+        pending: List[Tuple[Chunk, float]] = []
+        kept: List[Tuple[Chunk, float]] = []
+        entries: Dict[str, Optional[Dict[str, Any]]] = {}
+        stale: List[str] = []
+
+        for rel in sorted(gone):
+            old = files.get(rel) or {}
+            stale.extend(chunk_id(rel, h) for h in old.get("chunks", []))
+            entries[rel] = None
+            report.files_deleted += 1
+            report.chunks_deleted += len(old.get("chunks", []))
+
+        for rel in candidates:
+            report.files_scanned += 1
+            full = os.path.join(self.root, rel)
+            try:
+                st = os.stat(full)
+                old = files.get(rel)
+                if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime:
+                    report.files_unchanged += 1
+                    continue
+                text = self._read(rel)
+            except OSError as e:
+                report.errors.append(f"{rel}: {e}")
+                continue
+            if text is None:
+                if old:  # became binary or too large
+                    stale.extend(chunk_id(rel, h) for h in old.get("chunks", []))
+                    report.chunks_deleted += len(old.get("chunks", []))
+                # recorded without chunks so the next sync skips it on size/mtime
+                entries[rel] = {"size": st.st_size, "mtime": st.st_mtime, "sha256": None, "chunks": []}
+                continue
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            if old and old["sha256"] == digest:
+                entries[rel] = dict(old, size=st.st_size, mtime=st.st_mtime)
+                report.files_unchanged += 1
+                continue
+
+            chunks: List[Chunk] = []
+            seen: Set[str] = set()
+            for c in chunk_text(rel, text, self.max_lines, self.max_chars):
+                if c.chunk_hash not in seen:
+                    seen.add(c.chunk_hash)
+                    chunks.append(c)
+            previous = set(old.get("chunks", [])) if old else set()
+            fresh = [c for c in chunks if c.chunk_hash not in previous]
+            removed = previous - seen
+            pending.extend((c, st.st_mtime) for c in fresh)
+            kept.extend((c, st.st_mtime) for c in chunks if c.chunk_hash in previous)
+            stale.extend(chunk_id(rel, h) for h in removed)
+            entries[rel] = {
+                "size": st.st_size,
+                "mtime": st.st_mtime,
+                "sha256": digest,
+                "chunks": [c.chunk_hash for c in chunks],
+            }
+            report.files_changed += 1 if old else 0
+            report.files_new += 0 if old else 1
+            report.chunks_embedded += len(fresh)
+            report.chunks_kept += len(chunks) - len(fresh)
+            report.chunks_deleted += len(removed)
+            if len(pending) + len(kept) >= self.flush_chunks:
+                self._flush(pending, kept, entries, stale)
+                self.log(f"  {report.files_scanned} files, {report.chunks_embedded} chunks embedded")
+
+        if pending or kept or entries or stale:
+            self._flush(pending, kept, entries, stale)
+        report.seconds = time.perf_counter() - t0
+        return report
+
+
+class CodeIndex:
+    """Read side of an ingested table, used by the codex REPL for retrieval."""
+
+    def __init__(self, uri: str, table: str) -> None:
+        _ensure_lancedb()
+        import lancedb  # type: ignore
+
+        self.db = lancedb.connect(uri)
+        self.table_name = table
+        self._table = None
+
+    def search(self, vector: Sequence[float], k: int = 3) -> List[Dict[str, Any]]:
+        if self._table is None:
+            names = self.db.table_names() if hasattr(self.db, "table_names") else list(self.db.list_tables())
+            if self.table_name not in names:
+                return []
+            self._table = self.db.open_table(self.table_name)
+        elif hasattr(self._table, "checkout_latest"):
+            self._table.checkout_latest()  # pick up writes from `gutil lancedb ingest/watch`
+        cols = ["path", "start_line", "end_line", "language", "text", "_distance"]
+        rows = (
+            self._table.search(list(vector), vector_column_name="embedding")
+            .limit(k)
+            .to_arrow()
+            .to_pylist()
+        )
+        return [{c: r.get(c) for c in cols} for r in rows]
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Iterable, List, Mapping, Optional
+import os
+import re
+import warnings
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
 
 
 class LanceDBNotInstalled(RuntimeError):
@@ -32,7 +37,9 @@ class LanceDBClient:
         self._db = lancedb.connect(uri)
 
     def list_tables(self) -> List[str]:
-        return [t.name for t in self._db.tables()]
+        if hasattr(self._db, "table_names"):
+            return list(self._db.table_names())
+        return list(self._db.list_tables())
 
     def create_table(
         self, name: str, rows: Iterable[Mapping[str, Any]], exist_ok: bool = False
@@ -57,6 +64,179 @@ class LanceDBClient:
         arrow = tbl.to_arrow(limit=limit)
         return arrow.to_pylist()
 
+    # -- streaming import/export ---------------------------------------------
+
+    def scan(
+        self,
+        name: str,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[str] = None,
+        batch_size: int = 8192,
+    ):
+        """``pyarrow.RecordBatchReader`` over ``name``, ``batch_size`` rows at a time."""
+        query = self._db.open_table(name).search()
+        if columns:
+            query = query.select(list(columns))
+        if where:
+            query = query.where(where)
+        return query.limit(None).to_batches(batch_size)
+
+    def export(
+        self,
+        name: str,
+        path: str,
+        fmt: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[str] = None,
+        compression: Optional[str] = None,
+        batch_size: int = 8192,
+    ) -> int:
+        """Stream ``name`` to ``path`` as Parquet, Arrow IPC or NDJSON.
+
+        Only one record batch is held at a time. Lance's scanner reads ahead
+        up to ``LANCE_DEFAULT_IO_BUFFER_SIZE`` bytes, which is capped at
+        ``EXPORT_IO_BUFFER`` for the duration of the export unless already
+        set (the previous environment is restored). Files are written to a
+        temporary name and renamed when complete; ``path`` ``-`` writes NDJSON
+        to stdout. Returns the number of rows written.
+        """
+        fmt = fmt or format_for_path(path)
+        if path == "-" and fmt != "ndjson":
+            raise ValueError("Only ndjson can be written to stdout")
+        with _env_default("LANCE_DEFAULT_IO_BUFFER_SIZE", str(EXPORT_IO_BUFFER)):
+            reader = self.scan(name, columns=columns, where=where, batch_size=batch_size)
+            if path == "-":
+                import sys
+
+                return _write_ndjson(reader, sys.stdout)
+            tmp = path + ".tmp"
+            try:
+                rows = _WRITERS[fmt](reader, tmp, compression)
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        return rows
+
+    def create_table_from_file(
+        self, name: str, path: str, fmt: Optional[str] = None, exist_ok: bool = False, batch_size: int = 8192
+    ) -> None:
+        """Create ``name`` from a Parquet, Arrow IPC or NDJSON file in one streaming write."""
+        if not name:
+            raise ValueError("Table name must be non-empty")
+        reader = read_batches(path, fmt=fmt, batch_size=batch_size)
+        self._db.create_table(name, data=reader, schema=reader.schema, exist_ok=exist_ok)
+
+    def insert_file(self, name: str, path: str, fmt: Optional[str] = None, batch_size: int = 8192) -> int:
+        """Append a Parquet, Arrow IPC or NDJSON file to ``name`` in one streaming write."""
+        tbl = self._db.open_table(name)
+        before = tbl.count_rows()
+        reader = read_batches(path, fmt=fmt, batch_size=batch_size, schema=tbl.schema)
+        tbl.add(reader)
+        return tbl.count_rows() - before
+
+    # -- maintenance --------------------------------------------------------
+
+    def table_stats(self, name: str) -> Dict[str, Any]:
+        """Row, fragment, version, size and index coverage figures for ``name``.
+
+        ``data_bytes`` is the size of the current version; ``disk_bytes``
+        (local tables only) also counts files kept for older versions.
+        """
+        tbl = self._db.open_table(name)
+        stats: Dict[str, Any] = {"table": name, "version": tbl.version}
+        raw = tbl.stats() if hasattr(tbl, "stats") else {}
+        raw = raw if isinstance(raw, dict) else dict(raw)
+        frag = raw.get("fragment_stats") or {}
+        stats["rows"] = raw.get("num_rows", tbl.count_rows())
+        stats["fragments"] = frag.get("num_fragments")
+        stats["small_fragments"] = frag.get("num_small_fragments")
+        stats["fragment_rows"] = frag.get("lengths")
+        stats["data_bytes"] = raw.get("total_bytes")
+        stats["versions"] = len(tbl.list_versions())
+        path = os.path.join(getattr(self._db, "uri", ""), f"{name}.lance")
+        stats["disk_bytes"] = _dir_size(path) if os.path.isdir(path) else None
+        indices = []
+        for idx in tbl.list_indices():
+            entry = {"name": idx.name, "type": str(idx.index_type), "columns": list(idx.columns)}
+            st = tbl.index_stats(idx.name)
+            if st is not None:
+                total = st.num_indexed_rows + st.num_unindexed_rows
+                entry["indexed_rows"] = st.num_indexed_rows
+                entry["unindexed_rows"] = st.num_unindexed_rows
+                entry["coverage"] = st.num_indexed_rows / total if total else 1.0
+            indices.append(entry)
+        stats["indices"] = indices
+        return stats
+
+    def optimize(self, name: str, retention: timedelta = timedelta(days=7)) -> None:
+        """Compact small fragments, fold new rows into existing indices and
+        remove versions older than ``retention``.
+
+        Safe alongside readers and writers as long as ``retention`` is longer
+        than any of them keeps an old version open; files of in-flight writes
+        are never deleted.
+        """
+        tbl = self._db.open_table(name)
+        tbl.optimize(cleanup_older_than=retention, delete_unverified=False)
+
+    def prune(self, name: str, retention: timedelta = timedelta(days=7)) -> Dict[str, Any]:
+        """Remove versions (and their files) older than ``retention``; the
+        latest version is always kept.
+
+        Uses ``cleanup_old_versions`` when the ``pylance`` package is present,
+        otherwise ``optimize``, which prunes the same way but also compacts.
+        """
+        tbl = self._db.open_table(name)
+        versions = len(tbl.list_versions())
+        path = os.path.join(getattr(self._db, "uri", ""), f"{name}.lance")
+        size = _dir_size(path) if os.path.isdir(path) else None
+        try:
+            tbl.cleanup_old_versions(retention, delete_unverified=False)
+        except (ImportError, ValueError) as e:
+            if "pylance" not in str(e):
+                raise
+            tbl.optimize(cleanup_older_than=retention, delete_unverified=False)
+        tbl = self._db.open_table(name)
+        return {
+            "versions_before": versions,
+            "versions_after": len(tbl.list_versions()),
+            "disk_bytes_before": size,
+            "disk_bytes_after": _dir_size(path) if size is not None else None,
+        }
+
+    def ensure_indexes(
+        self,
+        name: str,
+        vector_column: str = "embedding",
+        min_vector_rows: int = 10_000,
+        scalar_columns: Iterable[str] = ("id",),
+        rebuild: bool = False,
+    ) -> List[str]:
+        """Create missing indices (a BTree per scalar column present, a vector
+        index once the table has ``min_vector_rows`` rows); with ``rebuild``
+        existing ones are retrained from scratch. Returns what was built."""
+        tbl = self._db.open_table(name)
+        columns = set(tbl.schema.names)
+        indexed = {tuple(idx.columns): idx for idx in tbl.list_indices()}
+        built: List[str] = []
+        for col in scalar_columns:
+            if col in columns and (rebuild or (col,) not in indexed):
+                idx = indexed.get((col,))
+                kind = str(idx.index_type).upper().replace("LABELLIST", "LABEL_LIST") if idx else "BTREE"
+                if kind in ("BTREE", "BITMAP", "LABEL_LIST"):
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")  # deprecated in favour of config objects, still supported
+                        tbl.create_scalar_index(col, index_type=kind, replace=True)
+                    built.append(f"{col} ({kind})")
+        if vector_column in columns and (rebuild or (vector_column,) not in indexed):
+            idx = indexed.get((vector_column,))
+            if idx is not None or tbl.count_rows() >= min_vector_rows:
+                kind = _VECTOR_INDEX_TYPES.get(str(idx.index_type).upper(), "IVF_PQ") if idx else "IVF_PQ"
+                tbl.create_index(vector_column_name=vector_column, index_type=kind, replace=True)
+                built.append(f"{vector_column} ({kind})")
+        return built
+
     @staticmethod
     def load_json_file(path: str) -> List[Mapping[str, Any]]:
         with open(path, "r", encoding="utf-8") as f:
@@ -67,3 +247,195 @@ class LanceDBClient:
             return content  # type: ignore[return-value]
         raise ValueError("JSON must be an object or an array of objects")
 
+
+_VECTOR_INDEX_TYPES = {
+    "IVFFLAT": "IVF_FLAT",
+    "IVFPQ": "IVF_PQ",
+    "IVFSQ": "IVF_SQ",
+    "IVFRQ": "IVF_RQ",
+    "IVFHNSWSQ": "IVF_HNSW_SQ",
+    "IVFHNSWPQ": "IVF_HNSW_PQ",
+    "IVFHNSWFLAT": "IVF_HNSW_FLAT",
+}
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for f in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, f))
+            except OSError:
+                pass
+    return total
+
+
+def parse_duration(text: str) -> timedelta:
+    """``"7d"``, ``"12h"``, ``"30m"``, ``"45s"`` or plain seconds."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([dhms]?)\s*", text or "")
+    if not m:
+        raise ValueError(f"Invalid duration: {text!r} (use e.g. 7d, 12h, 30m)")
+    value, unit = float(m.group(1)), m.group(2) or "s"
+    return timedelta(**{{"d": "days", "h": "hours", "m": "minutes", "s": "seconds"}[unit]: value})
+
+
+FORMATS = ("parquet", "arrow", "ndjson")
+
+# Read-ahead budget for export scans. With Lance's default, peak RSS
+# grows with table size (~460 MiB for 300k x 384 floats, ~280 MiB capped).
+EXPORT_IO_BUFFER = 16 << 20
+
+
+@contextmanager
+def _env_default(name: str, value: str) -> Iterator[None]:
+    """Set ``name`` to ``value`` inside the block if it is unset, then unset it again."""
+    if name in os.environ:
+        yield
+        return
+    os.environ[name] = value
+    try:
+        yield
+    finally:
+        os.environ.pop(name, None)
+
+_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".arrows": "arrow",
+    ".ipc": "arrow",
+    ".feather": "arrow",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+
+def format_for_path(path: str) -> str:
+    if path == "-":
+        return "ndjson"
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in _EXTENSIONS:
+        raise ValueError(f"Cannot tell the format of {path!r}; pass one of: {', '.join(FORMATS)}")
+    return _EXTENSIONS[ext]
+
+
+def _write_parquet(reader, path: str, compression: Optional[str]) -> int:
+    import pyarrow.parquet as pq
+
+    rows = 0
+    with pq.ParquetWriter(path, reader.schema, compression=compression or "zstd") as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def _write_arrow(reader, path: str, compression: Optional[str]) -> int:
+    import pyarrow as pa
+
+    options = pa.ipc.IpcWriteOptions(compression=None if compression in (None, "none") else compression)
+    rows = 0
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, reader.schema, options=options) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def _write_ndjson(reader, out: IO[str]) -> int:
+    rows = 0
+    for batch in reader:
+        # Python objects are ~10x the Arrow size, so convert in slices.
+        for start in range(0, batch.num_rows, 1024):
+            part = batch.slice(start, 1024).to_pylist()
+            out.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in part))
+        rows += batch.num_rows
+    return rows
+
+
+def _write_ndjson_file(reader, path: str, compression: Optional[str]) -> int:
+    if compression not in (None, "none"):
+        raise ValueError("Compression is not supported for ndjson")
+    with open(path, "w", encoding="utf-8") as f:
+        return _write_ndjson(reader, f)
+
+
+_WRITERS = {"parquet": _write_parquet, "arrow": _write_arrow, "ndjson": _write_ndjson_file}
+
+
+def _vector_columns(schema, rows: List[Mapping[str, Any]]):
+    """Infer fixed-size float32 vectors for JSON list-of-number columns of uniform length."""
+    import pyarrow as pa
+
+    fields = []
+    for f in schema:
+        if pa.types.is_list(f.type) and pa.types.is_floating(f.type.value_type):
+            lengths = {len(r[f.name]) for r in rows if r.get(f.name) is not None}
+            if len(lengths) == 1:
+                f = pa.field(f.name, pa.list_(pa.float32(), lengths.pop()), f.nullable)
+        fields.append(f)
+    return pa.schema(fields)
+
+
+def _ndjson_batches(path: str, batch_size: int, schema=None):
+    import pyarrow as pa
+
+    f = open(path, "r", encoding="utf-8")
+
+    def chunks() -> Iterator[List[Mapping[str, Any]]]:
+        buf: List[Mapping[str, Any]] = []
+        for line in f:
+            if line.strip():
+                buf.append(json.loads(line))
+                if len(buf) >= batch_size:
+                    yield buf
+                    buf = []
+        if buf:
+            yield buf
+
+    it = chunks()
+    first = next(it, None)
+    if first is None:
+        f.close()
+        raise ValueError(f"No rows in {path}")
+    if schema is None:
+        schema = _vector_columns(pa.RecordBatch.from_pylist(first).schema, first)
+
+    def batches():
+        try:
+            yield pa.RecordBatch.from_pylist(first, schema=schema)
+            for rows in it:
+                yield pa.RecordBatch.from_pylist(rows, schema=schema)
+        finally:
+            f.close()
+
+    return pa.RecordBatchReader.from_batches(schema, batches())
+
+
+def read_batches(path: str, fmt: Optional[str] = None, batch_size: int = 8192, schema=None):
+    """``pyarrow.RecordBatchReader`` over a file written by ``LanceDBClient.export``.
+
+    ``schema`` (e.g. the target table's) is used to type NDJSON rows; without
+    it, uniform-length float lists become fixed-size float32 vectors.
+    """
+    import pyarrow as pa
+
+    fmt = fmt or format_for_path(path)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(path)
+        return pa.RecordBatchReader.from_batches(pf.schema_arrow, pf.iter_batches(batch_size=batch_size))
+    if fmt == "arrow":
+        source = pa.memory_map(path, "r")
+        try:
+            reader = pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            source.seek(0)
+            return pa.ipc.open_stream(source)
+        return pa.RecordBatchReader.from_batches(
+            reader.schema, (reader.get_batch(i) for i in range(reader.num_record_batches))
+        )
+    if fmt == "ndjson":
+        return _ndjson_batches(path, batch_size, schema=schema)
+    raise ValueError(f"Unknown format: {fmt} (expected one of {', '.join(FORMATS)})")
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, IO, List, Optional
+
+MODES = ("cpu", "wall", "mem")
+
+# Default output suffix per mode; ``.json`` selects speedscope for wall/mem.
+SUFFIXES = {"cpu": ".pstats", "wall": ".collapsed", "mem": ".collapsed"}
+
+
+class ProfilerError(RuntimeError):
+    pass
+
+
+def default_output(command: str, mode: str) -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return f"gutil-{command}-{mode}-{stamp}{SUFFIXES[mode]}"
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _Sampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval (wall clock).
+
+    Unlike cProfile this also charges time spent blocked on I/O, locks and
+    subprocesses, and costs nothing between samples.
+    """
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(name="gutil-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def write_collapsed(stacks: Counter, out: IO[str]) -> None:
+    """Brendan Gregg's folded format (``root;child;leaf weight``), readable by
+    flamegraph.pl and speedscope."""
+    for stack, weight in stacks.most_common():
+        out.write(";".join(f.replace(";", ":") for f in stack) + f" {weight}\n")
+
+
+def write_speedscope(stacks: Counter, out: IO[str], name: str, unit: str) -> None:
+    frames: Dict[str, int] = {}
+    samples: List[List[int]] = []
+    weights: List[int] = []
+    for stack, weight in stacks.most_common():
+        samples.append([frames.setdefault(f, len(frames)) for f in stack])
+        weights.append(int(weight))
+    json.dump(
+        {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": f} for f in frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": unit,
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+            "name": name,
+            "exporter": "gutil",
+        },
+        out,
+    )
+
+
+def _summarize_stacks(stacks: Counter, top: int, fmt: Callable[[float], str]) -> List[str]:
+    total = sum(stacks.values()) or 1
+    own: Counter = Counter()
+    incl: Counter = Counter()
+    for stack, weight in stacks.items():
+        own[stack[-1]] += weight
+        for frame in set(stack):
+            incl[frame] += weight
+    lines = [f"{'self':>10} {'self%':>6} {'total':>10} {'total%':>6}  function"]
+    for frame, weight in own.most_common(top):
+        lines.append(
+            f"{fmt(weight):>10} {100 * weight / total:>5.1f}% {fmt(incl[frame]):>10} "
+            f"{100 * incl[frame] / total:>5.1f}%  {frame}"
+        )
+    return lines
+
+
+def _fmt_bytes(n: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(n) < 1024:
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n:.1f}GiB"
+
+
+class Profiler:
+    """Runs a callable under one of three profilers and saves the result.
+
+    - ``cpu``: deterministic cProfile; writes a ``.pstats`` file
+      (``python -m pstats``, snakeviz) and prints the top functions by
+      cumulative time.
+    - ``wall``: samples the calling thread's stack every ``interval`` seconds;
+      writes collapsed stacks (or speedscope JSON when ``output`` ends in
+      ``.json``) weighted in samples.
+    - ``mem``: tracemalloc; writes the allocation stacks live near the peak
+      (or at exit, if larger) weighted in bytes, in the same formats, and
+      prints peak usage. Each allocation records ``mem_frames`` frames; deeper
+      stacks make import-heavy commands much slower under tracemalloc.
+
+    The summary goes to ``log`` (stderr by default) so the command's own stdout
+    stays intact.
+    """
+
+    def __init__(
+        self,
+        mode: str = "cpu",
+        output: Optional[str] = None,
+        top: int = 20,
+        interval: float = 0.005,
+        mem_frames: int = 8,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        if mode not in MODES:
+            raise ProfilerError(f"Unknown profile mode: {mode} (expected one of {', '.join(MODES)})")
+        self.mode = mode
+        self.output = output or default_output("run", mode)
+        self.top = top
+        self.interval = interval
+        self.mem_frames = mem_frames
+        self.log = log or (lambda msg: print(msg, file=sys.stderr))
+
+    def run(self, fn: Callable[[], int]) -> int:
+        runner = {"cpu": self._run_cpu, "wall": self._run_wall, "mem": self._run_mem}[self.mode]
+        return runner(fn)
+
+    def _open_output(self) -> IO[str]:
+        os.makedirs(os.path.dirname(os.path.abspath(self.output)), exist_ok=True)
+        return open(self.output, "w", encoding="utf-8")
+
+    def _write_stacks(self, stacks: Counter, unit: str) -> None:
+        with self._open_output() as out:
+            if self.output.endswith(".json"):
+                write_speedscope(stacks, out, name=f"gutil {self.mode}", unit=unit)
+            else:
+                write_collapsed(stacks, out)
+
+    def _run_cpu(self, fn: Callable[[], int]) -> int:
+        import cProfile
+        import io
+        import pstats
+
+        prof = cProfile.Profile()
+        os.makedirs(os.path.dirname(os.path.abspath(self.output)), exist_ok=True)
+        try:
+            return prof.runcall(fn)
+        finally:
+            prof.dump_stats(self.output)
+            buf = io.StringIO()
+            pstats.Stats(prof, stream=buf).strip_dirs().sort_stats("cumulative").print_stats(self.top)
+            self.log(buf.getvalue().rstrip())
+            self.log(f"profile: wrote {self.output}")
+
+    def _run_wall(self, fn: Callable[[], int]) -> int:
+        sampler = _Sampler(threading.get_ident(), self.interval)
+        t0 = time.perf_counter()
+        sampler.start()
+        try:
+            return fn()
+        finally:
+            sampler.stop()
+            elapsed = time.perf_counter() - t0
+            self._write_stacks(sampler.stacks, unit="none")
+            n = sum(sampler.stacks.values())
+            self.log(f"wall profile: {n} samples every {self.interval * 1000:.1f} ms over {elapsed:.3f} s")
+            ms = lambda w: f"{w * self.interval * 1000:.0f}ms"  # noqa: E731
+            self.log("\n".join(_summarize_stacks(sampler.stacks, self.top, ms)))
+            self.log(f"profile: wrote {self.output}")
+
+    def _run_mem(self, fn: Callable[[], int]) -> int:
+        import tracemalloc
+
+        tracemalloc.start(self.mem_frames)
+        watcher = _PeakWatcher()
+        watcher.start()
+        try:
+            return fn()
+        finally:
+            watcher.stop()
+            final = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot = watcher.snapshot if watcher.size > _traced_size(final) else final
+            stacks: Counter = Counter()
+            for stat in _own_traces(snapshot).statistics("traceback"):
+                stacks[tuple(f"{os.path.basename(fr.filename)}:{fr.lineno}" for fr in stat.traceback)] += stat.size
+            self._write_stacks(stacks, unit="bytes")
+            self.log(
+                f"mem profile: peak {_fmt_bytes(peak)}, "
+                f"{_fmt_bytes(sum(stacks.values()))} live in the snapshot written"
+            )
+            self.log("\n".join(_summarize_stacks(stacks, self.top, _fmt_bytes)))
+            self.log(f"profile: wrote {self.output}")
+
+
+def _traced_size(snapshot) -> int:
+    return sum(t.size for t in snapshot.traces)
+
+
+def _own_traces(snapshot):
+    import tracemalloc
+
+    return snapshot.filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    )
+
+
+class _PeakWatcher(threading.Thread):
+    """Keeps a tracemalloc snapshot taken near the high-water mark.
+
+    Most of a command's memory is released before it returns, so a snapshot
+    at exit alone would miss what drove the peak. Snapshots are only taken
+    when traced memory grows by ``growth`` over the last one.
+    """
+
+    def __init__(self, interval: float = 0.05, growth: float = 1.5, floor: int = 16 << 20) -> None:
+        super().__init__(name="gutil-memwatch", daemon=True)
+        self.interval = interval
+        self.growth = growth
+        self.floor = floor
+        self.size = 0
+        self.snapshot = None
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        import tracemalloc
+
+        while not self._stop_event.wait(self.interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > max(self.size * self.growth, self.floor):
+                self.snapshot = tracemalloc.take_snapshot()
+                self.size = current
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, IO, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("gutil_span", default=None)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def set(self, **attrs: Any) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "attrs", "trace_id", "span_id", "parent_id", "start", "_t0", "_token", "_otel")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self._otel = None
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        parent = _current.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self._token = _current.set(self)
+        if self.tracer._otel is not None:
+            self._otel = self.tracer._otel.start_as_current_span(self.name)
+            self._otel.__enter__()
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        duration_ms = (time.perf_counter() - self._t0) * 1000
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        if self._otel is not None:
+            from opentelemetry import trace as otel_trace
+
+            current = otel_trace.get_current_span()
+            for key, value in self.attrs.items():
+                current.set_attribute(key, value if isinstance(value, (str, bool, int, float)) else str(value))
+            self._otel.__exit__(exc_type, exc, tb)
+        self.tracer._finish(self, duration_ms)
+
+
+class Tracer:
+    """Lightweight span tracer for the Codex REPL and its helpers.
+
+    Disabled by default: ``span`` then returns a shared no-op context manager,
+    so instrumented code pays one attribute check. When enabled, each span's
+    duration is kept per name for ``stats``; with ``path`` set, finished spans
+    are appended as JSON lines (flushed when a root span ends), and with
+    ``otlp_endpoint`` set they are mirrored to OpenTelemetry over OTLP/HTTP.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.durations: Dict[str, List[float]] = {}
+        self._file: Optional[IO[str]] = None
+        self._otel = None
+        self._provider = None
+
+    def configure(
+        self,
+        enabled: bool = True,
+        path: Optional[str] = None,
+        otlp_endpoint: Optional[str] = None,
+        service_name: str = "gutil",
+    ) -> None:
+        self.close()
+        self.enabled = enabled
+        if not enabled:
+            return
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+        if otlp_endpoint:
+            self._setup_otel(otlp_endpoint, service_name)
+
+    def _setup_otel(self, endpoint: str, service_name: str) -> None:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except Exception as e:  # noqa: BLE001
+            logger.warning(
+                "OpenTelemetry export disabled (%s). Install with: "
+                "pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http",
+                e,
+            )
+            return
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+        self._provider = provider
+        self._otel = provider.get_tracer("gutil")
+
+    def span(self, name: str, **attrs: Any):
+        if not self.enabled:
+            return _NOOP
+        return Span(self, name, attrs)
+
+    def _finish(self, span: Span, duration_ms: float) -> None:
+        self.durations.setdefault(span.name, []).append(duration_ms)
+        if self._file is None:
+            return
+        record = {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "name": span.name,
+            "start": span.start,
+            "duration_ms": round(duration_ms, 3),
+        }
+        if span.attrs:
+            record["attrs"] = span.attrs
+        self._file.write(json.dumps(record, default=str) + "\n")
+        if span.parent_id is None:
+            self._file.flush()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-span-name count, p50, p95 and total in milliseconds."""
+        out: Dict[str, Dict[str, float]] = {}
+        for name, values in self.durations.items():
+            ordered = sorted(values)
+            n = len(ordered)
+            out[name] = {
+                "count": n,
+                "p50_ms": ordered[(n - 1) // 2],
+                "p95_ms": ordered[min(n - 1, int(round(0.95 * (n - 1))))],
+                "total_ms": sum(ordered),
+            }
+        return out
+
+    def reset(self) -> None:
+        self.durations.clear()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._provider is not None:
+            self._provider.shutdown()
+            self._provider = None
+            self._otel = None
+
+
+tracer = Tracer()
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a function so each call is recorded as a span named ``name``."""
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with Span(tracer, name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
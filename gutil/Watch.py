@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+from .Ingest import DirectoryIngestor, IngestReport
+
+BACKENDS = ("auto", "watchfiles", "poll")
+
+
+class WatchError(RuntimeError):
+    pass
+
+
+class RepoWatcher:
+    """Keeps a ``DirectoryIngestor`` table current while files change.
+
+    Changes come from ``watchfiles`` (inotify/FSEvents/ReadDirectoryChangesW)
+    when it is installed, or from polling file stats. Changed paths gather
+    until the tree has been quiet for ``debounce`` seconds (or for at most
+    ``max_delay`` seconds since the first change), so a branch checkout is
+    processed once rather than file by file; they are then synced in batches
+    of ``batch_files``. Polling sleeps at least ``poll_ratio`` times as long
+    as the previous scan took, which caps its CPU use on large trees.
+    Embedding concurrency is the ingestor's ``workers``.
+    """
+
+    def __init__(
+        self,
+        ingestor: DirectoryIngestor,
+        debounce: float = 0.5,
+        max_delay: float = 10.0,
+        batch_files: int = 32,
+        backend: str = "auto",
+        poll_interval: float = 1.0,
+        poll_ratio: float = 10.0,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        if backend not in BACKENDS:
+            raise WatchError(f"Unknown watch backend: {backend} (expected one of {', '.join(BACKENDS)})")
+        if backend == "auto":
+            try:
+                import watchfiles  # noqa: F401
+
+                backend = "watchfiles"
+            except Exception:  # noqa: BLE001
+                backend = "poll"
+        elif backend == "watchfiles":
+            try:
+                import watchfiles  # noqa: F401
+            except Exception as e:  # noqa: BLE001
+                raise WatchError("watchfiles is required for this backend. Install with: pip install watchfiles") from e
+        self.ingestor = ingestor
+        self.debounce = debounce
+        self.max_delay = max(max_delay, debounce)
+        self.batch_files = max(1, batch_files)
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.poll_ratio = poll_ratio
+        self.log = log or (lambda msg: None)
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # -- change sources -----------------------------------------------------
+
+    def _rel(self, path: str) -> Optional[str]:
+        rel = os.path.relpath(path, self.ingestor.root).replace(os.sep, "/")
+        if rel.startswith("../") or not self.ingestor.accepts(rel):
+            return None
+        return rel
+
+    def _watchfiles_events(self) -> Iterator[Set[str]]:
+        import watchfiles
+
+        timeout_ms = max(50, int(self.debounce * 1000))
+        for changes in watchfiles.watch(
+            self.ingestor.root,
+            watch_filter=lambda _change, path: self._rel(path) is not None,
+            debounce=timeout_ms,
+            rust_timeout=timeout_ms,
+            yield_on_timeout=True,
+            stop_event=self._stop,
+            raise_interrupt=False,
+        ):
+            yield {rel for _change, path in changes for rel in [self._rel(path)] if rel}
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        out: Dict[str, Tuple[int, int]] = {}
+        for rel in self.ingestor.walk():
+            try:
+                st = os.stat(os.path.join(self.ingestor.root, rel))
+            except OSError:
+                continue
+            out[rel] = (st.st_size, st.st_mtime_ns)
+        return out
+
+    def _poll_events(self) -> Iterator[Set[str]]:
+        prev = self._snapshot()
+        while not self._stop.is_set():
+            t0 = time.perf_counter()
+            cur = self._snapshot()
+            elapsed = time.perf_counter() - t0
+            changed = {rel for rel, sig in cur.items() if prev.get(rel) != sig} | (set(prev) - set(cur))
+            prev = cur
+            yield changed
+            self._stop.wait(max(self.poll_interval, elapsed * self.poll_ratio, 0.05))
+
+    # -- main loop ----------------------------------------------------------
+
+    def _sync(self, paths: Set[str]) -> None:
+        ordered = sorted(paths)
+        for start in range(0, len(ordered), self.batch_files):
+            batch = ordered[start:start + self.batch_files]
+            try:
+                report = self.ingestor.sync(paths=batch)
+            except Exception as e:  # noqa: BLE001
+                self.log(f"sync failed for {len(batch)} file(s): {e}")
+                continue
+            for err in report.errors:
+                self.log(f"warning: {err}")
+            if report.chunks_embedded or report.chunks_deleted or report.files_deleted:
+                self.log(report.summary())
+
+    def run(self, initial_sync: bool = True) -> IngestReport:
+        """Catch up with a full sync, then process changes until ``stop``.
+
+        Returns the initial sync's report (empty when ``initial_sync`` is off).
+        """
+        report = IngestReport()
+        if initial_sync:
+            report = self.ingestor.sync()
+            self.log(report.summary())
+        events = self._watchfiles_events() if self.backend == "watchfiles" else self._poll_events()
+        self.log(f"watching {self.ingestor.root} ({self.backend})")
+        pending: Set[str] = set()
+        first = last = 0.0
+        for changed in events:
+            now = time.monotonic()
+            if changed:
+                if not pending:
+                    first = now
+                pending |= changed
+                last = now
+            if pending and (now - last >= self.debounce or now - first >= self.max_delay):
+                batch, pending = pending, set()
+                self._sync(batch)
+            if self._stop.is_set():
+                break
+        if pending:
+            self._sync(pending)
+        return report
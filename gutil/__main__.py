@@ -1,4 +1,5 @@
 import argparse
+import os
 import sys
 
 from .ProjectCreator import ProjectCreator
@@ -31,8 +32,159 @@ def _add_create_subparser(subparsers: argparse._SubParsersAction) -> None:
     )
 
 
-def main(argv=None) -> int:
+def _add_ingest_options(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--config",
+        default="cli/codex_cli/config.yaml",
+        help="codex_cli config.yaml whose embeddings settings to use (so the REPL can query the table)",
+    )
+    p.add_argument("--provider", help="Embeddings provider override (fastembed, openai, hash)")
+    p.add_argument("--model", help="Embeddings model override")
+    p.add_argument("--batch-size", type=int, default=64, help="Chunks per embeddings call")
+    p.add_argument("--workers", type=int, default=2, help="Concurrent embeddings batches")
+    p.add_argument("--exclude", nargs="*", default=[], help="Glob patterns of paths to skip")
+    p.add_argument(
+        "--max-file-kb", type=int, default=1000, help="Skip files larger than this (default: 1000)"
+    )
+
+
+def _ingestor_from_args(args: argparse.Namespace, log=None):
+    from cli.codex_cli.embeddings import EmbeddingConfig
+    from cli.codex_cli.remote import open_embeddings
+    from .Ingest import DirectoryIngestor
+
+    ecfg = {}
+    if os.path.exists(args.config):
+        import yaml
+
+        with open(args.config, "r", encoding="utf-8") as f:
+            ecfg = (yaml.safe_load(f) or {}).get("embeddings", {}) or {}
+    # Served by `gutil daemon` when it is running, so the model is already loaded
+    embeddings = open_embeddings(
+        EmbeddingConfig(
+            provider=args.provider or ecfg.get("provider", "fastembed"),
+            model=args.model or ecfg.get("model"),
+            dim=ecfg.get("dim"),
+        )
+    )
+    return DirectoryIngestor(
+        args.uri,
+        args.table,
+        args.dir,
+        embeddings,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        max_file_bytes=args.max_file_kb * 1024,
+        exclude=args.exclude,
+        log=log,
+    )
+
+
+def _format_bytes(n) -> str:
+    if n is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def _print_table_stats(stats) -> None:
+    print(f"table:        {stats['table']} (version {stats['version']}, {stats['versions']} versions kept)")
+    print(f"rows:         {stats['rows']}")
+    lengths = stats.get("fragment_rows") or {}
+    detail = f" (mean {lengths['mean']} rows)" if "mean" in lengths else ""
+    print(f"fragments:    {stats['fragments']}, {stats['small_fragments']} small{detail}")
+    print(f"data size:    {_format_bytes(stats['data_bytes'])}")
+    print(f"on disk:      {_format_bytes(stats['disk_bytes'])} incl. old versions")
+    if not stats["indices"]:
+        print("indices:      none")
+    for idx in stats["indices"]:
+        coverage = f"{idx['coverage']:.1%} ({idx['unindexed_rows']} unindexed)" if "coverage" in idx else "-"
+        print(f"index:        {idx['name']} {idx['type']} on {', '.join(idx['columns'])}: {coverage}")
+
+
+def _print_daemon_status(info) -> None:
+    print(f"pid:          {info['pid']} (up {info['uptime_s']:.0f}s, idle {info['idle_s']:.0f}s)")
+    print(f"socket:       {info['socket']}")
+    print(f"max rss:      {_format_bytes(info['max_rss_kb'] * 1024)}")
+    served = ", ".join(f"{op} {n}" for op, n in sorted(info["requests"].items())) or "none"
+    print(f"requests:     {served}")
+    if not info["loaded"]:
+        print("loaded:       nothing yet")
+    for item in info["loaded"]:
+        spec = item["spec"]
+        if item["kind"] == "embeddings":
+            what = f"{spec['provider']} {spec.get('model') or '(default model)'}"
+        elif item["kind"] == "store":
+            what = f"{spec['store']} {spec['db_uri']} table {spec['table']}"
+        else:
+            what = f"{spec['uri']} table {spec['table']}"
+        print(f"loaded:       {item['kind']}: {what}")
+
+
+def _print_timings(client: AppClient) -> None:
+    import json as _json
+
+    for t in client.timings:
+        print(_json.dumps(t.as_dict()), file=sys.stderr)
+
+
+_VALUED_GLOBAL_OPTIONS = {"--profile-output", "--profile-top", "--profile-interval", "--profile-mem-frames"}
+
+
+def _normalize_profile_flag(argv):
+    """Let a bare global ``--profile`` mean ``--profile=cpu``.
+
+    argparse would otherwise take the subcommand name as the flag's value.
+    ``--profile wall`` (a mode as the next token) keeps that mode. Only
+    options before the subcommand are rewritten.
+    """
+    from .Profiler import MODES
+
+    out = list(argv)
+    i = 0
+    while i < len(out) and out[i].startswith("-"):
+        if out[i] == "--profile":
+            if i + 1 < len(out) and out[i + 1] in MODES:
+                out[i:i + 2] = [f"--profile={out[i + 1]}"]
+            else:
+                out[i] = "--profile=cpu"
+        elif out[i] in _VALUED_GLOBAL_OPTIONS:
+            i += 1
+        i += 1
+    return out
+
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="gutil", description="gutil CLI utilities")
+    parser.add_argument(
+        "--profile",
+        choices=["cpu", "wall", "mem"],
+        metavar="{cpu,wall,mem}",
+        help="Profile the command: --profile (or =cpu) cProfile to .pstats, "
+        "=wall sampled stacks to .collapsed, =mem tracemalloc stacks to .collapsed",
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Profile file to write (default: gutil-<command>-<mode>-<time>.<ext>; "
+        "a .json path writes speedscope format for wall/mem)",
+    )
+    parser.add_argument(
+        "--profile-top", type=int, default=20, help="Entries in the stderr profile summary (default: 20)"
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=5.0,
+        help="Sampling interval in ms for --profile=wall (default: 5)",
+    )
+    parser.add_argument(
+        "--profile-mem-frames",
+        type=int,
+        default=8,
+        help="Stack depth recorded per allocation for --profile=mem (default: 8; deeper is slower)",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     _add_create_subparser(subparsers)
@@ -57,23 +209,127 @@ def main(argv=None) -> int:
 
     # create from JSON file
     l_create = ldb_sub.add_parser(
-        "create", help="Create table from a JSON file (object or array of objects)"
+        "create",
+        help="Create table from a JSON file (object or array of objects), or stream it from "
+        "Parquet, Arrow IPC or NDJSON",
     )
     l_create.add_argument("uri", help="LanceDB URI/path")
     l_create.add_argument("table", help="Table name")
-    l_create.add_argument("json_file", help="Path to JSON file")
+    l_create.add_argument(
+        "json_file", help="Path to a .json, .parquet, .arrow or .ndjson/.jsonl file"
+    )
     l_create.add_argument(
         "--exist-ok",
         action="store_true",
         help="Do not error if table already exists",
     )
 
+    # insert (streaming)
+    l_insert = ldb_sub.add_parser(
+        "insert", help="Append rows from a Parquet, Arrow IPC or NDJSON file (streamed)"
+    )
+    l_insert.add_argument("uri", help="LanceDB URI/path")
+    l_insert.add_argument("table", help="Table name")
+    l_insert.add_argument("file", help="Path to a .parquet, .arrow or .ndjson/.jsonl file")
+
+    # export (streaming)
+    l_export = ldb_sub.add_parser(
+        "export", help="Stream a table to Parquet, Arrow IPC or NDJSON in constant memory"
+    )
+    l_export.add_argument("uri", help="LanceDB URI/path")
+    l_export.add_argument("table", help="Table name")
+    l_export.add_argument("out", help="Output path ('-' writes NDJSON to stdout)")
+    l_export.add_argument(
+        "--format",
+        choices=["parquet", "arrow", "ndjson"],
+        help="Output format (default: from the file extension)",
+    )
+    l_export.add_argument("--columns", nargs="+", help="Columns to export (default: all)")
+    l_export.add_argument("--where", help="SQL filter, e.g. \"ts > 1700000000\"")
+    l_export.add_argument(
+        "--compression",
+        choices=["zstd", "snappy", "gzip", "lz4", "brotli", "none"],
+        help="Parquet codec (default: zstd) or Arrow IPC buffer compression (zstd, lz4)",
+    )
+    l_export.add_argument("--batch-size", type=int, default=8192, help="Rows per record batch")
+
     # query
     l_query = ldb_sub.add_parser("query", help="Query table and print rows as JSON")
     l_query.add_argument("uri", help="LanceDB URI/path")
     l_query.add_argument("table", help="Table name")
     l_query.add_argument("--limit", type=int, default=10, help="Max rows to return")
 
+    # ingest a source tree (incremental)
+    l_ingest = ldb_sub.add_parser(
+        "ingest", help="Chunk, embed and upsert a directory; re-runs only process changed files"
+    )
+    l_ingest.add_argument("uri", help="LanceDB URI/path")
+    l_ingest.add_argument("table", help="Table name")
+    l_ingest.add_argument("dir", help="Source directory to ingest")
+    _add_ingest_options(l_ingest)
+
+    # keep an ingested table up to date
+    l_watch = ldb_sub.add_parser(
+        "watch", help="Ingest a directory, then re-embed changed files as they change"
+    )
+    l_watch.add_argument("uri", help="LanceDB URI/path")
+    l_watch.add_argument("table", help="Table name")
+    l_watch.add_argument("dir", help="Source directory to watch")
+    _add_ingest_options(l_watch)
+    l_watch.add_argument(
+        "--debounce", type=float, default=0.5, help="Seconds of quiet before changes are processed"
+    )
+    l_watch.add_argument(
+        "--max-delay", type=float, default=10.0, help="Process changes after this long even if still busy"
+    )
+    l_watch.add_argument("--batch-files", type=int, default=32, help="Files per sync batch")
+    l_watch.add_argument(
+        "--backend",
+        choices=["auto", "watchfiles", "poll"],
+        default="auto",
+        help="Change source: watchfiles (OS notifications) or stat polling (default: auto)",
+    )
+    l_watch.add_argument(
+        "--poll-interval", type=float, default=1.0, help="Minimum seconds between polling scans"
+    )
+
+    # maintenance
+    l_opt = ldb_sub.add_parser(
+        "optimize", help="Compact fragments, update indices and drop versions past the retention window"
+    )
+    l_opt.add_argument("uri", help="LanceDB URI/path")
+    l_opt.add_argument("table", help="Table name")
+    l_opt.add_argument(
+        "--retention", default="7d", help="Keep versions newer than this (e.g. 7d, 12h; default: 7d)"
+    )
+    l_opt.add_argument(
+        "--create-indexes",
+        action="store_true",
+        help="Also create missing indices (BTree on id, vector index once --min-vector-rows is reached)",
+    )
+    l_opt.add_argument(
+        "--rebuild-indexes", action="store_true", help="Retrain existing indices from scratch"
+    )
+    l_opt.add_argument("--vector-column", default="embedding", help="Vector column name")
+    l_opt.add_argument(
+        "--min-vector-rows",
+        type=int,
+        default=10000,
+        help="Rows required before a vector index is created (default: 10000)",
+    )
+
+    l_prune = ldb_sub.add_parser("prune", help="Remove table versions older than the retention window")
+    l_prune.add_argument("uri", help="LanceDB URI/path")
+    l_prune.add_argument("table", help="Table name")
+    l_prune.add_argument(
+        "--retention", default="7d", help="Keep versions newer than this (e.g. 7d, 12h; default: 7d)"
+    )
+
+    l_stats = ldb_sub.add_parser("stats", help="Print row, fragment, version, size and index figures")
+    l_stats.add_argument("uri", help="LanceDB URI/path")
+    l_stats.add_argument("table", help="Table name")
+    l_stats.add_argument("--json", action="store_true", help="Print as one JSON object")
+
     # gutil toolbox ...
     tb = subparsers.add_parser("toolbox", help="MCP Toolbox (genai-toolbox) integration")
     tb_sub = tb.add_subparsers(dest="toolbox_cmd", required=True)
@@ -116,6 +372,58 @@ def main(argv=None) -> int:
         help="Path to codex_cli config.yaml (defaults to cli/codex_cli/config.yaml)",
     )
 
+    # gutil daemon start|run|stop|status [--socket <path>]
+    daemon = subparsers.add_parser(
+        "daemon", help="Resident process that keeps embedding models and DB connections warm"
+    )
+    daemon_sub = daemon.add_subparsers(dest="daemon_cmd", required=True)
+    d_start = daemon_sub.add_parser("start", help="Start the daemon in the background")
+    d_run = daemon_sub.add_parser("run", help="Run the daemon in the foreground")
+    for dp in (d_start, d_run):
+        dp.add_argument(
+            "--config",
+            help="Codex config.yaml whose embedding model, memory store and code index to load up front",
+        )
+        dp.add_argument(
+            "--idle-timeout",
+            type=float,
+            default=0,
+            help="Exit after this many seconds without a request (default: never)",
+        )
+    d_start.add_argument("--log", help="Daemon log file (default: <socket>.log)")
+    d_stop = daemon_sub.add_parser("stop", help="Stop the running daemon")
+    d_status = daemon_sub.add_parser("status", help="Show whether the daemon runs and what it has loaded")
+    d_status.add_argument("--json", action="store_true", help="Print the status as JSON")
+    for dp in (d_start, d_run, d_stop, d_status):
+        dp.add_argument(
+            "--socket",
+            help="Unix socket path (default: $GUTIL_DAEMON_SOCKET or $XDG_RUNTIME_DIR/gutil/daemon.sock)",
+        )
+
+    # gutil bench [--scenario ...] [--quick] [--output results.json] [--baseline base.json]
+    bench = subparsers.add_parser("bench", help="Run benchmarks (ingest, search, embed, repl)")
+    bench.add_argument(
+        "--scenario",
+        nargs="+",
+        choices=["ingest", "search", "embed", "repl"],
+        help="Scenarios to run (default: all)",
+    )
+    bench.add_argument("--quick", action="store_true", help="Smaller data sizes for smoke runs")
+    bench.add_argument("--seed", type=int, default=0, help="Seed for synthetic data")
+    bench.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is kept)")
+    bench.add_argument("--dim", type=int, default=384, help="Synthetic embedding size")
+    bench.add_argument(
+        "--embed-provider", default="fastembed", help="Embeddings provider for the embed scenario"
+    )
+    bench.add_argument("--output", help="Write JSON results to this path")
+    bench.add_argument("--baseline", help="Compare against a saved JSON result")
+    bench.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Allowed relative slowdown before a metric counts as a regression (default: 0.10)",
+    )
+
     # gutil env bootstrap [--force] [--src .env.example] [--dst .env]
     envp = subparsers.add_parser("env", help="Environment helpers (.env bootstrap)")
     env_sub = envp.add_subparsers(dest="env_cmd", required=True)
@@ -156,6 +464,11 @@ def main(argv=None) -> int:
 
     # gutil app ...
     app = subparsers.add_parser("app", help="App commands (backend integration)")
+    app.add_argument(
+        "--timing",
+        action="store_true",
+        help="Print per-request HTTP timings (DNS/connect/TTFB/total) to stderr",
+    )
     app_sub = app.add_subparsers(dest="app_cmd", required=True)
 
     # app auth ...
@@ -174,8 +487,31 @@ def main(argv=None) -> int:
 
     # app generate
     app_gen = app_sub.add_parser("generate", help="Generate content via backend Codex endpoint")
-    app_gen.add_argument("--prompt", required=True)
+    app_gen_src = app_gen.add_mutually_exclusive_group(required=True)
+    app_gen_src.add_argument("--prompt")
+    app_gen_src.add_argument(
+        "--input",
+        help="JSONL file of prompts for batch mode ('-' reads stdin)",
+    )
     app_gen.add_argument("--max-tokens", type=int, default=100)
+    app_gen.add_argument(
+        "--stream",
+        action="store_true",
+        help="Render tokens as they arrive from the streaming endpoint (--prompt only)",
+    )
+    app_gen.add_argument(
+        "--concurrency", type=int, default=4, help="Batch mode: max in-flight requests"
+    )
+    app_gen.add_argument(
+        "--rate", type=float, default=0.0, help="Batch mode: max requests/sec (0 = unlimited)"
+    )
+    app_gen.add_argument(
+        "--max-retries", type=int, default=5, help="Batch mode: retries on 429/5xx/transport errors"
+    )
+    app_gen.add_argument(
+        "--checkpoint",
+        help="Batch mode: JSONL file of completed results; rerun with the same path to resume",
+    )
 
     # app config
     app_cfg = app_sub.add_parser("config", help="Configure API URL and endpoints")
@@ -187,8 +523,29 @@ def main(argv=None) -> int:
     cfg_get.add_argument("key")
     cfg_show = app_cfg_sub.add_parser("show", help="Show current config")
 
-    args = parser.parse_args(argv)
+    return parser
+
 
+def main(argv=None) -> int:
+    parser = _build_parser()
+    argv = sys.argv[1:] if argv is None else argv
+    args = parser.parse_args(_normalize_profile_flag(argv))
+    if not args.profile:
+        return _dispatch(args, parser)
+
+    from .Profiler import Profiler, default_output
+
+    profiler = Profiler(
+        mode=args.profile,
+        output=args.profile_output or default_output(args.command, args.profile),
+        top=args.profile_top,
+        interval=args.profile_interval / 1000.0,
+        mem_frames=args.profile_mem_frames,
+    )
+    return profiler.run(lambda: _dispatch(args, parser))
+
+
+def _dispatch(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
     if args.command == "create":
         if args.create_target == "project":
             creator = ProjectCreator()
@@ -246,10 +603,99 @@ def main(argv=None) -> int:
                 return 0
             if args.lancedb_cmd == "create":
                 client = LanceDBClient(args.uri)
-                rows = LanceDBClient.load_json_file(args.json_file)
-                client.create_table(args.table, rows, exist_ok=args.exist_ok)
+                if args.json_file.lower().endswith(".json"):
+                    rows = LanceDBClient.load_json_file(args.json_file)
+                    client.create_table(args.table, rows, exist_ok=args.exist_ok)
+                else:
+                    client.create_table_from_file(args.table, args.json_file, exist_ok=args.exist_ok)
                 print(f"Created table '{args.table}' at {args.uri}")
                 return 0
+            if args.lancedb_cmd == "insert":
+                client = LanceDBClient(args.uri)
+                n = client.insert_file(args.table, args.file)
+                print(f"Inserted {n} rows into '{args.table}'")
+                return 0
+            if args.lancedb_cmd == "export":
+                client = LanceDBClient(args.uri)
+                n = client.export(
+                    args.table,
+                    args.out,
+                    fmt=args.format,
+                    columns=args.columns,
+                    where=args.where,
+                    compression=args.compression,
+                    batch_size=args.batch_size,
+                )
+                if args.out != "-":
+                    print(f"Exported {n} rows from '{args.table}' to {args.out}")
+                return 0
+            if args.lancedb_cmd == "ingest":
+                ingestor = _ingestor_from_args(args, log=lambda msg: print(msg, file=sys.stderr))
+                report = ingestor.sync()
+                for err in report.errors:
+                    print(f"warning: {err}", file=sys.stderr)
+                print(report.summary())
+                return 0
+            if args.lancedb_cmd == "watch":
+                from .Watch import RepoWatcher
+
+                log = lambda msg: print(msg, file=sys.stderr, flush=True)  # noqa: E731
+                watcher = RepoWatcher(
+                    _ingestor_from_args(args, log=log),
+                    debounce=args.debounce,
+                    max_delay=args.max_delay,
+                    batch_files=args.batch_files,
+                    backend=args.backend,
+                    poll_interval=args.poll_interval,
+                    log=log,
+                )
+                try:
+                    watcher.run()
+                except KeyboardInterrupt:
+                    pass
+                return 0
+            if args.lancedb_cmd == "optimize":
+                from .LanceDB import parse_duration
+
+                client = LanceDBClient(args.uri)
+                retention = parse_duration(args.retention)
+                before = client.table_stats(args.table)
+                if args.create_indexes or args.rebuild_indexes:
+                    for built in client.ensure_indexes(
+                        args.table,
+                        vector_column=args.vector_column,
+                        min_vector_rows=args.min_vector_rows,
+                        rebuild=args.rebuild_indexes,
+                    ):
+                        print(f"Built index on {built}")
+                client.optimize(args.table, retention=retention)
+                after = client.table_stats(args.table)
+                print(
+                    f"Optimized '{args.table}': fragments {before['fragments']} -> {after['fragments']}, "
+                    f"versions {before['versions']} -> {after['versions']}, "
+                    f"on disk {_format_bytes(before['disk_bytes'])} -> {_format_bytes(after['disk_bytes'])}"
+                )
+                return 0
+            if args.lancedb_cmd == "prune":
+                from .LanceDB import parse_duration
+
+                client = LanceDBClient(args.uri)
+                out = client.prune(args.table, retention=parse_duration(args.retention))
+                print(
+                    f"Pruned '{args.table}': versions {out['versions_before']} -> {out['versions_after']}, "
+                    f"on disk {_format_bytes(out['disk_bytes_before'])} -> {_format_bytes(out['disk_bytes_after'])}"
+                )
+                return 0
+            if args.lancedb_cmd == "stats":
+                client = LanceDBClient(args.uri)
+                stats = client.table_stats(args.table)
+                if args.json:
+                    import json as _json
+
+                    print(_json.dumps(stats, default=str))
+                else:
+                    _print_table_stats(stats)
+                return 0
             if args.lancedb_cmd == "query":
                 client = LanceDBClient(args.uri)
                 rows = client.query(args.table, limit=args.limit)
@@ -308,8 +754,53 @@ def main(argv=None) -> int:
             print(f"Error importing codex_cli: {e}")
             return 2
         return run_repl(args.config)
+    elif args.command == "daemon":
+        from . import Daemon
+
+        try:
+            if args.daemon_cmd == "start":
+                pid = Daemon.start(
+                    args.socket, config=args.config, idle_timeout=args.idle_timeout, log_path=args.log
+                )
+                print(f"gutil daemon started (pid {pid})")
+                return 0
+            if args.daemon_cmd == "run":
+                server = Daemon.DaemonServer(
+                    args.socket,
+                    idle_timeout=args.idle_timeout,
+                    log=lambda msg: print(msg, file=sys.stderr, flush=True),
+                )
+                if args.config:
+                    import yaml
+
+                    with open(args.config, "r", encoding="utf-8") as f:
+                        specs = Daemon.specs_from_config(yaml.safe_load(f) or {})
+                    server.op_preload(**specs)
+                server.serve()
+                return 0
+            if args.daemon_cmd == "stop":
+                pid = Daemon.stop(args.socket)
+                print("gutil daemon is not running" if pid is None else f"gutil daemon stopped (pid {pid})")
+                return 0
+            if args.daemon_cmd == "status":
+                info = Daemon.status(args.socket)
+                if args.json:
+                    import json as _json
+
+                    print(_json.dumps(info, indent=2))
+                elif info is None:
+                    print("gutil daemon is not running")
+                else:
+                    _print_daemon_status(info)
+                return 0 if info is not None else 1
+        except (Daemon.DaemonError, OSError) as e:
+            print(f"Error: {e}")
+            return 2
     elif args.command == "app":
-        client = AppClient()
+        if args.app_cmd == "generate" and args.stream and args.input:
+            print("Error: --stream works with --prompt only, not with --input batch mode")
+            return 2
+        client = AppClient(timing=args.timing)
         try:
             if args.app_cmd == "auth":
                 if args.auth_cmd == "login":
@@ -324,6 +815,35 @@ def main(argv=None) -> int:
                     out = client.logout()
                     print(out)
                     return 0
+            if args.app_cmd == "generate" and args.input:
+                from cli.services.batch_generate import run_batch
+
+                src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+                try:
+                    failures = run_batch(
+                        src,
+                        base_url=client.settings.api_url,
+                        endpoint=client.settings.generate_endpoint,
+                        headers=client._headers(),
+                        max_tokens=args.max_tokens,
+                        concurrency=args.concurrency,
+                        rate=args.rate,
+                        max_retries=args.max_retries,
+                        checkpoint_path=args.checkpoint,
+                    )
+                finally:
+                    if src is not sys.stdin:
+                        src.close()
+                if failures:
+                    print(f"{failures} prompt(s) failed", file=sys.stderr)
+                    return 1
+                return 0
+            if args.app_cmd == "generate" and args.stream:
+                for token in client.generate_stream(args.prompt, max_tokens=args.max_tokens):
+                    sys.stdout.write(token)
+                    sys.stdout.flush()
+                sys.stdout.write("\n")
+                return 0
             if args.app_cmd == "generate":
                 out = client.generate(args.prompt, max_tokens=args.max_tokens)
                 # Print minimal JSON
@@ -349,9 +869,49 @@ def main(argv=None) -> int:
         except Exception as e:
             print(f"Error: {e}")
             return 2
+        finally:
+            if args.timing:
+                _print_timings(client)
+            client.close()
+    elif args.command == "bench":
+        from .Benchmark import (
+            SCENARIOS,
+            BenchmarkError,
+            BenchmarkSuite,
+            BenchResult,
+            compare,
+            format_comparison,
+            format_results,
+        )
+
+        suite = BenchmarkSuite(
+            seed=args.seed,
+            quick=args.quick,
+            dim=args.dim,
+            repeat=args.repeat,
+            embed_provider=args.embed_provider,
+            log=lambda msg: print(msg, file=sys.stderr),
+        )
+        try:
+            baseline = BenchResult.load(args.baseline) if args.baseline else None
+            result = suite.run(args.scenario or SCENARIOS)
+        except (BenchmarkError, OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return 2
+        print(format_results(result))
+        if args.output:
+            result.save(args.output)
+            print(f"Wrote {args.output}")
+        if baseline is not None:
+            rows = compare(result, baseline, args.threshold)
+            print()
+            print(format_comparison(rows, args.threshold))
+            if any(c.regressed for c in rows):
+                return 1
+        return 0
     elif args.command == "env":
         if args.env_cmd == "bootstrap":
-            import os, shutil
+            import shutil
             src = args.src
             dst = args.dst
             if not os.path.exists(src):
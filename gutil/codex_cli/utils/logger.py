@@ -1,30 +1,9 @@
-from __future__ import annotations
-
-import logging
-import os
-from typing import Optional
-
-
-def setup_logger(log_path: Optional[str] = None) -> logging.Logger:
-    logger = logging.getLogger("codex_cli")
-    if logger.handlers:
-        return logger
-    logger.setLevel(logging.INFO)
-
-    formatter = logging.Formatter(
-        fmt="%(asctime)s [%(levelname)s] %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    ch = logging.StreamHandler()
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
-
-    if log_path:
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
-        fh = logging.FileHandler(log_path)
-        fh.setFormatter(formatter)
-        logger.addHandler(fh)
-
-    return logger
-
+"""Re-export of the shared codex_cli logger (see ``cli/codex_cli/utils/logger.py``)."""
+
+from cli.codex_cli.utils.logger import (  # noqa: F401
+    JSONFormatter,
+    SamplingFilter,
+    SizeTimeRotatingFileHandler,
+    setup_logger,
+    shutdown_logger,
+)
@@ -0,0 +1,27 @@
+"""Import backend service modules without running the ``app`` package init.
+
+``backend/app/__init__.py`` builds a FastAPI app and the router imports
+instantiate ``Settings``, which needs the full environment. Benchmarks only
+need individual service modules, so the parent packages are registered as
+bare namespace modules first.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import types
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+
+def load_backend_module(name: str) -> types.ModuleType:
+    parts = name.split(".")
+    for i in range(1, len(parts)):
+        pkg = ".".join(parts[:i])
+        if pkg not in sys.modules:
+            module = types.ModuleType(pkg)
+            module.__path__ = [os.path.join(BACKEND_DIR, *parts[:i])]  # type: ignore[attr-defined]
+            sys.modules[pkg] = module
+    return importlib.import_module(name)
@@ -0,0 +1,59 @@
+"""Qdrant upsert throughput across chunk sizes and parallelism.
+
+Runs against qdrant-client's in-process engine by default, or a server with
+``--url`` (``QDRANT_API_KEY`` is read from the environment):
+
+    python scripts/bench_qdrant_upsert.py --points 20000 --dim 384
+    python scripts/bench_qdrant_upsert.py --url http://localhost:6333 --quantization int8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cli.app.services.vectordb.qdrant_service import QdrantService  # noqa: E402
+
+
+async def _run(args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    vectors = [[rng.random() for _ in range(args.dim)] for _ in range(args.points)]
+    payloads = [{"group": i % 10} for i in range(args.points)]
+    if args.url:
+        service = QdrantService(url=args.url)
+    else:
+        service = QdrantService(location=":memory:")
+    async with service:
+        for batch_size in args.batch_sizes:
+            for parallel in args.parallel:
+                await service.ensure_collection(
+                    args.collection, args.dim, on_disk=args.on_disk, quantization=args.quantization, recreate=True
+                )
+                report = await service.upsert(
+                    args.collection, vectors, payloads=payloads, batch_size=batch_size, parallel=parallel
+                )
+                print(f"batch_size={batch_size:<5} parallel={parallel:<3} {report}")
+        await service.delete_collection(args.collection)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None, help="Qdrant server URL (default: in-process :memory:)")
+    parser.add_argument("--collection", default="gutil_bench")
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[64, 256, 1024])
+    parser.add_argument("--parallel", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--on-disk", action="store_true")
+    parser.add_argument("--quantization", choices=["int8"], default=None)
+    args = parser.parse_args(argv)
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""Recall, latency and memory of compact hot-index codes vs full precision.
+
+Each configuration runs a first pass over compact codes (int8 or binary,
+optionally truncated to the leading ``dims``) and exactly rescores the top
+``k * rescore`` candidates; recall@k is measured against exact float32
+search. Uses ``--npy`` embeddings (rows x dims, e.g. a hot index ``.npy``)
+or synthetic clustered vectors with a decaying per-dimension spectrum:
+
+    python scripts/bench_quantization.py --rows 100000 --dim 384
+    python scripts/bench_quantization.py --npy data/codex_memory.interactions.hot.npy --dims 128 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cli.codex_cli.quantization import CompactVectors, rescore  # noqa: E402
+
+
+def _unit(x: np.ndarray) -> np.ndarray:
+    return x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+
+
+def _data(args: argparse.Namespace, rng: np.random.Generator):
+    if args.npy:
+        full = np.load(args.npy, mmap_mode="r")
+        full = _unit(np.asarray(full[: args.rows] if args.rows else full, dtype=np.float32))
+    else:
+        # clustered rows with variance concentrated in the leading dims
+        spectrum = 1.0 / np.sqrt(1.0 + np.arange(args.dim) / 32.0)
+        centers = rng.standard_normal((max(1, args.rows // 100), args.dim))
+        assign = rng.integers(0, len(centers), args.rows)
+        rows = centers[assign] + 0.7 * rng.standard_normal((args.rows, args.dim))
+        full = _unit((rows * spectrum).astype(np.float32))
+    picks = rng.integers(0, len(full), args.queries)
+    noise = rng.standard_normal((args.queries, full.shape[1])) * (args.noise / np.sqrt(full.shape[1]))
+    return full, _unit(full[picks] + noise).astype(np.float32)
+
+
+def _exact(full: np.ndarray, q: np.ndarray, k: int) -> np.ndarray:
+    s = full @ q
+    top = np.argpartition(-s, k - 1)[:k]
+    return top[np.argsort(-s[top])]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--npy", default=None, help="Embeddings to load instead of synthetic data")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore", type=int, nargs="+", default=[4])
+    parser.add_argument("--dims", type=int, nargs="*", default=[], help="Truncation sizes to try")
+    parser.add_argument("--noise", type=float, default=0.5, help="Norm of the noise added to sampled rows to form queries")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    full, queries = _data(args, rng)
+    n, dim = full.shape
+    truth = [_exact(full, q, args.k) for q in queries]
+
+    t0 = time.perf_counter()
+    for q in queries:
+        _exact(full, q, args.k)
+    base_ms = (time.perf_counter() - t0) / len(queries) * 1000
+
+    print(f"{n} rows x {dim} dims, {len(queries)} queries, recall@{args.k} vs exact float32")
+    print(f"{'config':<22} {'rescore':>7} {'recall':>7} {'ms/query':>9} {'bytes/vec':>10} {'RAM MiB':>8}")
+    print(f"{'float32 exact':<22} {'-':>7} {1.0:>7.3f} {base_ms:>9.3f} {dim * 4:>10} {full.nbytes / 2**20:>8.1f}")
+
+    for mode in ("int8", "binary"):
+        for dims in [None, *args.dims]:
+            compact = CompactVectors(mode, dims)
+            compact.add(full)
+            label = mode if dims is None else f"{mode} @ {dims} dims"
+            for factor in args.rescore:
+                hits = 0
+                t0 = time.perf_counter()
+                results = [rescore(compact, full, q, args.k, factor)[0] for q in queries]
+                ms = (time.perf_counter() - t0) / len(queries) * 1000
+                for got, want in zip(results, truth):
+                    hits += len(np.intersect1d(got, want))
+                recall = hits / (len(queries) * args.k)
+                print(
+                    f"{label:<22} {factor:>7} {recall:>7.3f} {ms:>9.3f} "
+                    f"{compact.nbytes / n:>10.1f} {compact.nbytes / 2**20:>8.1f}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+"""Compare time-to-first-token of CodexService.generate_code vs stream_code.
+
+Runs both against a local stub upstream (see ``stub_llm.py``) so the numbers
+reflect the request path rather than a real model:
+
+    python scripts/bench_ttft.py --tokens 50 --token-delay 0.02 --runs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _backend import load_backend_module  # noqa: E402
+from stub_llm import StubLLMServer  # noqa: E402
+
+
+async def _measure(service, tokens: int, runs: int):
+    blocking, first, total = [], [], []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        await service.generate_code("bench", max_tokens=tokens)
+        blocking.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        ttft = None
+        async for _token in service.stream_code("bench", max_tokens=tokens):
+            if ttft is None:
+                ttft = time.perf_counter() - t0
+        first.append(ttft or 0.0)
+        total.append(time.perf_counter() - t0)
+    return blocking, first, total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=50)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    module = load_backend_module("app.services.llm_service")
+    with StubLLMServer(token_delay=args.token_delay, tokens=args.tokens) as stub:
+        service = module.CodexService(api_key="stub", api_url=f"{stub.url}/v1/completions")
+        blocking, first, total = asyncio.run(_measure(service, args.tokens, args.runs))
+
+    def ms(xs):
+        return f"p50={statistics.median(xs) * 1000:8.1f} ms  max={max(xs) * 1000:8.1f} ms"
+
+    print(f"tokens={args.tokens} token_delay={args.token_delay}s runs={args.runs}")
+    print(f"generate_code  TTFT (= full response)  {ms(blocking)}")
+    print(f"stream_code    TTFT                     {ms(first)}")
+    print(f"stream_code    total                    {ms(total)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
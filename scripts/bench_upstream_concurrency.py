@@ -0,0 +1,85 @@
+"""Concurrent upstream throughput: blocking ``requests`` vs the shared async client.
+
+"before" replays the previous ``CodexService.generate_code`` body (a blocking
+``requests.post`` inside ``async def``); "after" is the current service on the
+shared ``httpx.AsyncClient``. Both fire ``--concurrency`` requests at a time on
+one event loop against the local stub upstream:
+
+    python scripts/bench_upstream_concurrency.py --requests 200 --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _backend import load_backend_module  # noqa: E402
+from stub_llm import StubLLMServer  # noqa: E402
+
+
+class _BlockingCodexService:
+    def __init__(self, api_url: str) -> None:
+        self.api_url = api_url
+
+    async def generate_code(self, prompt: str, **kwargs):
+        import requests
+
+        response = requests.post(self.api_url, json={"prompt": prompt, **kwargs})
+        response.raise_for_status()
+        return response.json()
+
+
+async def _drive(service, total: int, concurrency: int, max_tokens: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            await service.generate_code("bench", max_tokens=max_tokens)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--tokens", type=int, default=5)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    llm_service = load_backend_module("app.services.llm_service")
+    http_client = load_backend_module("app.services.http_client")
+
+    with StubLLMServer(token_delay=args.token_delay, tokens=args.tokens) as stub:
+        url = f"{stub.url}/v1/completions"
+        before = asyncio.run(
+            _drive(_BlockingCodexService(url), args.requests, args.concurrency, args.tokens)
+        )
+
+        async def after_run() -> float:
+            try:
+                service = llm_service.CodexService(api_key="stub", api_url=url)
+                return await _drive(service, args.requests, args.concurrency, args.tokens)
+            finally:
+                await http_client.close_http_client()
+
+        after = asyncio.run(after_run())
+
+    upstream_ms = args.tokens * args.token_delay * 1000
+    print(
+        f"requests={args.requests} concurrency={args.concurrency} "
+        f"upstream latency={upstream_ms:.0f} ms"
+    )
+    print(f"before (blocking requests) {args.requests / before:8.1f} req/s  wall={before:6.2f} s")
+    print(f"after  (shared httpx)      {args.requests / after:8.1f} req/s  wall={after:6.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Same memory workload against each codex vector store backend.
+
+Inserts ``--rows`` random entries in ``--batch`` sized chunks, then times
+single-query and batched search, ``count`` and a delete, for every store in
+``--stores`` (each gets a fresh temporary ``db_uri``):
+
+    python scripts/bench_vector_stores.py --rows 20000 --dim 384
+    python scripts/bench_vector_stores.py --stores numpy lancedb --queries 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cli.codex_cli.vector_store import STORES, MemoryEntry, open_store  # noqa: E402
+
+
+def _entries(rows: int, dim: int, rng: random.Random):
+    out = []
+    for i in range(rows):
+        out.append(
+            MemoryEntry(
+                id=str(uuid.UUID(int=rng.getrandbits(128))),
+                ts=float(i),
+                prompt=f"prompt {i}",
+                response=f"response {i}",
+                tags=[],
+                tokens=4,
+                embedding=[rng.gauss(0.0, 1.0) for _ in range(dim)],
+            )
+        )
+    return out
+
+
+def _bench(kind: str, entries, queries, args) -> dict:
+    with tempfile.TemporaryDirectory(prefix=f"gutil-{kind}-") as tmp:
+        store = open_store({"store": kind, "db_uri": tmp, "table": "bench"})
+        try:
+            t0 = time.perf_counter()
+            for start in range(0, len(entries), args.batch):
+                store.add_batch(entries[start:start + args.batch])
+            ingest = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            for q in queries:
+                store.search(q, k=args.k)
+            single = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            store.search_batch(queries, k=args.k)
+            batched = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            count = store.count()
+            count_s = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            removed = store.delete([e.id for e in entries[: args.delete]])
+            delete_s = time.perf_counter() - t0
+        finally:
+            store.close()
+    return {
+        "store": kind,
+        "ingest_rows_per_s": len(entries) / ingest,
+        "search_ms": single / len(queries) * 1000,
+        "search_batch_ms_per_query": batched / len(queries) * 1000,
+        "count_ms": count_s * 1000,
+        "delete_ms": delete_s * 1000,
+        "count": count,
+        "removed": removed,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stores", nargs="+", choices=STORES, default=list(STORES))
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--delete", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    entries = _entries(args.rows, args.dim, rng)
+    queries = [[rng.gauss(0.0, 1.0) for _ in range(args.dim)] for _ in range(args.queries)]
+
+    print(f"{args.rows} rows x {args.dim} dims, {args.queries} queries, k={args.k}")
+    print(f"{'store':<8} {'ingest rows/s':>14} {'search ms':>10} {'batch ms/q':>11} {'count ms':>9} {'delete ms':>10}")
+    for kind in args.stores:
+        try:
+            r = _bench(kind, entries, queries, args)
+        except Exception as e:  # noqa: BLE001
+            print(f"{kind:<8} skipped: {e}")
+            continue
+        print(
+            f"{r['store']:<8} {r['ingest_rows_per_s']:>14,.0f} {r['search_ms']:>10.3f} "
+            f"{r['search_batch_ms_per_query']:>11.3f} {r['count_ms']:>9.2f} {r['delete_ms']:>10.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
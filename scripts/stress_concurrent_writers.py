@@ -0,0 +1,167 @@
+"""N processes appending to one codex memory table at the same time.
+
+Each writer process opens its own ``LanceDBStore`` on a shared ``db_uri``
+(the table does not exist yet, so creation races too), waits on a barrier,
+then writes ``--rows`` entries in ``--batch`` sized ``add_batch`` calls.
+Afterwards every id is checked to be present exactly once and, with
+``--hot``, the hot index is checked to match the table. Reports sustained
+rows/sec and commits/sec, per-write latency and how many commit conflicts
+were retried, for each ``--modes`` entry (``optimistic``: retry on conflict
+only; ``lock``: also serialize writers through the table's file lock):
+
+    python scripts/stress_concurrent_writers.py --writers 8 --rows 100
+    python scripts/stress_concurrent_writers.py --writers 16 --rows 50 --hot --modes optimistic
+
+Exits 1 if any row was lost, duplicated or failed to write.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODES = ("optimistic", "lock")
+
+
+def _config(db_uri: str, mode: str, args) -> dict:
+    return {
+        "store": "lancedb",
+        "db_uri": db_uri,
+        "table": "interactions",
+        "hot_index": {"enable": args.hot},
+        "writes": {"lock": mode == "lock", "retries": args.retries},
+    }
+
+
+def _writer(wid: int, cfg: dict, args, barrier, results) -> None:
+    from cli.codex_cli.vector_store import MemoryEntry, open_store
+
+    rng = random.Random(wid)
+    store = open_store(cfg)
+    entries = [
+        MemoryEntry(
+            id=f"w{wid}-{i}",
+            ts=time.time(),
+            prompt=f"prompt {wid}/{i}",
+            response=f"response {wid}/{i}",
+            tags=[],
+            tokens=4,
+            embedding=[rng.gauss(0.0, 1.0) for _ in range(args.dim)],
+        )
+        for i in range(args.rows)
+    ]
+    latencies = []
+    failed = 0
+    barrier.wait()
+    for start in range(0, len(entries), args.batch):
+        t0 = time.perf_counter()
+        try:
+            store.add_batch(entries[start:start + args.batch])
+        except Exception as e:  # noqa: BLE001
+            failed += len(entries[start:start + args.batch])
+            print(f"writer {wid}: {e}", file=sys.stderr)
+        latencies.append(time.perf_counter() - t0)
+    results.put(
+        {"end": time.time(), "failed": failed, "conflicts": store.conflicts, "latencies": latencies}
+    )
+    store.close()
+
+
+def _pct(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def _verify(db_uri: str, cfg: dict, args) -> dict:
+    import lancedb
+
+    from cli.codex_cli.vector_store import open_store
+
+    ids = lancedb.connect(db_uri).open_table("interactions").to_arrow().column("id").to_pylist()
+    expected = {f"w{w}-{i}" for w in range(args.writers) for i in range(args.rows)}
+    out = {"rows": len(ids), "lost": len(expected - set(ids)), "dupes": len(ids) - len(set(ids))}
+    if args.hot:
+        store = open_store(cfg)
+        store.search([0.0] * args.dim, k=1)  # brings the hot index up to date
+        out["hot_ok"] = store.hot.usable and set(store.hot.ids[: store.hot.count]) == set(ids)
+        store.close()
+    return out
+
+
+def _run(mode: str, args) -> dict:
+    ctx = mp.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix=f"gutil-writers-{mode}-") as tmp:
+        db_uri = os.path.join(tmp, "db")
+        cfg = _config(db_uri, mode, args)
+        barrier = ctx.Barrier(args.writers + 1)
+        results = ctx.Queue()
+        procs = [ctx.Process(target=_writer, args=(w, cfg, args, barrier, results)) for w in range(args.writers)]
+        for p in procs:
+            p.start()
+        barrier.wait(timeout=300)
+        t0 = time.time()
+        reports = [results.get(timeout=args.timeout) for _ in procs]
+        for p in procs:
+            p.join()
+        elapsed = max(r["end"] for r in reports) - t0
+        latencies = [x for r in reports for x in r["latencies"]]
+        out = {
+            "mode": mode,
+            "writers": args.writers,
+            "written": args.writers * args.rows,
+            "elapsed_s": elapsed,
+            "rows_per_s": args.writers * args.rows / elapsed,
+            "commits_per_s": len(latencies) / elapsed,
+            "p50_ms": _pct(latencies, 0.50) * 1000,
+            "p95_ms": _pct(latencies, 0.95) * 1000,
+            "conflicts": sum(r["conflicts"] for r in reports),
+            "failed": sum(r["failed"] for r in reports),
+            "crashed": sum(1 for p in procs if p.exitcode),
+        }
+        out.update(_verify(db_uri, cfg, args))
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writer processes")
+    parser.add_argument("--rows", type=int, default=100, help="Entries per writer")
+    parser.add_argument("--batch", type=int, default=1, help="Entries per add_batch call (1 = one per REPL turn)")
+    parser.add_argument("--dim", type=int, default=64, help="Embedding size")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--hot", action="store_true", help="Enable the hot index in every writer")
+    parser.add_argument("--retries", type=int, default=8, help="writes.retries for each store")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for each writer")
+    args = parser.parse_args()
+
+    header = (
+        f"{'mode':<11} {'writers':>7} {'rows/s':>8} {'commits/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'conflicts':>9} {'failed':>6} {'lost':>5} {'dupes':>5}"
+    )
+    if args.hot:
+        header += f" {'hot':>4}"
+    print(header)
+    bad = False
+    for mode in args.modes:
+        r = _run(mode, args)
+        line = (
+            f"{r['mode']:<11} {r['writers']:>7} {r['rows_per_s']:>8.1f} {r['commits_per_s']:>9.1f} "
+            f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['conflicts']:>9} {r['failed']:>6} "
+            f"{r['lost']:>5} {r['dupes']:>5}"
+        )
+        if args.hot:
+            line += f" {'ok' if r['hot_ok'] else 'BAD':>4}"
+        print(line, flush=True)
+        bad |= bool(r["lost"] or r["dupes"] or r["failed"] or r["crashed"] or not r.get("hot_ok", True))
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""Local stub of an OpenAI-style completions upstream for benchmarks.
+
+Serves ``POST /v1/completions`` (plain JSON, or SSE when ``"stream": true``)
+and ``POST /embeddings`` on a background thread. Each generated token costs
+``token_delay`` seconds, so time-to-first-token and total latency are
+predictable. Connections are kept alive between requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from typing import Optional, Tuple
+
+
+class StubLLMServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        token_delay: float = 0.02,
+        tokens: int = 20,
+        embedding_delay: float = 0.05,
+        embedding_dim: int = 8,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.token_delay = token_delay
+        self.tokens = tokens
+        self.embedding_delay = embedding_delay
+        self.embedding_dim = embedding_dim
+        self.requests = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._server is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(5)
+
+    async def _shutdown(self) -> None:
+        self._server.close()  # type: ignore[union-attr]
+        current = asyncio.current_task()
+        tasks = [t for t in asyncio.all_tasks() if t is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, dict]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        method, path, _ = line.decode("latin-1").split(" ", 2)
+        length = 0
+        while True:
+            header = await reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value.strip())
+        body = await reader.readexactly(length) if length else b""
+        return method, path, json.loads(body) if body else {}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                req = await self._read_request(reader)
+                if req is None:
+                    break
+                self.requests += 1
+                _, path, body = req
+                if path.startswith("/embeddings"):
+                    await self._embeddings(writer, body)
+                elif body.get("stream"):
+                    await self._stream(writer, body)
+                else:
+                    await self._complete(writer, body)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def _n_tokens(self, body: dict) -> int:
+        return min(self.tokens, int(body.get("max_tokens") or self.tokens))
+
+    async def _complete(self, writer: asyncio.StreamWriter, body: dict) -> None:
+        n = self._n_tokens(body)
+        await asyncio.sleep(self.token_delay * n)
+        payload = json.dumps(
+            {
+                "id": "cmpl-stub",
+                "object": "text_completion",
+                "created": int(time.time()),
+                "choices": [{"index": 0, "text": " tok" * n, "finish_reason": "length"}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": n, "total_tokens": n + 1},
+            }
+        ).encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+            + payload
+        )
+        await writer.drain()
+
+    async def _stream(self, writer: asyncio.StreamWriter, body: dict) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n"
+        )
+        for _ in range(self._n_tokens(body)):
+            await asyncio.sleep(self.token_delay)
+            event = b"data: " + json.dumps({"choices": [{"index": 0, "text": " tok"}]}).encode() + b"\n\n"
+            writer.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+            await writer.drain()
+        done = b"data: [DONE]\n\n"
+        writer.write(f"{len(done):x}\r\n".encode() + done + b"\r\n0\r\n\r\n")
+        await writer.drain()
+
+    async def _embeddings(self, writer: asyncio.StreamWriter, body: dict) -> None:
+        await asyncio.sleep(self.embedding_delay)
+        texts = body.get("texts")
+        if texts is None:
+            payload = {"embeddings": [0.1] * self.embedding_dim}
+        else:
+            payload = {"embeddings": [[0.1] * self.embedding_dim for _ in texts]}
+        data = json.dumps(payload).encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(data)}\r\n\r\n".encode()
+            + data
+        )
+        await writer.drain()
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+from gutil import ConfigResolver as config_module
+from gutil.ConfigResolver import ConfigResolver
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    ConfigResolver.clear_cache()
+    yield
+    ConfigResolver.clear_cache()
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    real = config_module._DocumentCache._parse
+
+    def counting(kind, path):
+        calls.append((kind, path))
+        return real(kind, path)
+
+    monkeypatch.setattr(config_module._DocumentCache, "_parse", staticmethod(counting))
+    return calls
+
+
+def _resolver(tmp_path):
+    return ConfigResolver(str(tmp_path / "config.yaml"), str(tmp_path / ".env"))
+
+
+def test_returned_values_do_not_alias_the_cache(tmp_path):
+    (tmp_path / "config.yaml").write_text("database:\n  url: sqlite://a\n  pools: [1, 2]\n")
+    first = _resolver(tmp_path)
+    first.resolve("database")["url"] = "changed"
+    first.load_config("config", "database/pools").append(3)
+    first.config["database"].clear()
+
+    second = _resolver(tmp_path)
+    assert second.resolve("database/url") == "sqlite://a"
+    assert second.load_config("config", "database/pools") == [1, 2]
+    assert second.resolve_many(["database"])["database"] == {"url": "sqlite://a", "pools": [1, 2]}
+
+
+def test_unchanged_file_is_parsed_once(tmp_path, parses):
+    (tmp_path / "config.yaml").write_text("a: 1\n")
+    for _ in range(3):
+        assert _resolver(tmp_path).load_config("config", "a") == 1
+    assert len(parses) == 1
+
+
+def test_size_change_invalidates(tmp_path, parses):
+    path = tmp_path / "config.yaml"
+    path.write_text("a: 1\n")
+    resolver = _resolver(tmp_path)
+    assert resolver.load_config("config", "a") == 1
+    st = os.stat(path)
+    path.write_text("a: 100\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))  # same mtime, new size
+    assert resolver.load_config("config", "a") == 100
+    assert len(parses) == 2
+
+
+def test_mtime_change_invalidates(tmp_path, parses):
+    path = tmp_path / ".env"
+    path.write_text("TOKEN=aaa\n")
+    resolver = _resolver(tmp_path)
+    assert resolver.load_config("env", "TOKEN") == "aaa"
+    st = os.stat(path)
+    path.write_text("TOKEN=bbb\n")  # same size
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert resolver.load_config("env", "TOKEN") == "bbb"
+    assert len(parses) == 2
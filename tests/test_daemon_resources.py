@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+
+from gutil.Daemon import _Resources
+
+
+def test_slow_build_does_not_block_warm_objects():
+    resources = _Resources()
+    resources.get("embeddings", {"model": "warm"}, lambda: "warm")
+    started = threading.Event()
+    builds = []
+
+    def slow_build():
+        builds.append(1)
+        started.set()
+        time.sleep(0.3)
+        return "slow"
+
+    threads = [
+        threading.Thread(target=resources.get, args=("embeddings", {"model": "cold"}, slow_build)) for _ in range(3)
+    ]
+    for t in threads:
+        t.start()
+    started.wait()
+    t0 = time.monotonic()
+    assert resources.get("embeddings", {"model": "warm"}, lambda: "rebuilt")[0] == "warm"
+    assert time.monotonic() - t0 < 0.1
+    for t in threads:
+        t.join()
+    assert len(builds) == 1
+    assert resources.get("embeddings", {"model": "cold"}, slow_build)[0] == "slow"
+
+
+def test_failed_build_is_retried():
+    resources = _Resources()
+
+    def broken():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        resources.get("store", {}, broken)
+    assert resources.describe() == []
+    assert resources.get("store", {}, lambda: "ok")[0] == "ok"
@@ -0,0 +1,11 @@
+from cli.codex_cli.embeddings import EmbeddingConfig, Embeddings
+
+
+def test_hash_provider_uses_dim_setting():
+    emb = Embeddings(EmbeddingConfig(provider="hash", dim=16))
+    assert [len(v) for v in emb.encode(["a", "b"])] == [16, 16]
+
+
+def test_hash_provider_ignores_model_name():
+    emb = Embeddings(EmbeddingConfig(provider="hash", model="all-MiniLM-L6-v2"))
+    assert len(emb.encode(["a"])[0]) == 384
@@ -0,0 +1,57 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import urllib3.connection
+
+from cli.app.services.http_session import HTTPSession
+
+RESPONSE_DELAY = 0.15
+CONNECT_DELAY = 0.2
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(RESPONSE_DELAY)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_ttfb_excludes_connection_setup(server, monkeypatch):
+    real = urllib3.connection.connection.create_connection
+
+    def slow_connect(*args, **kwargs):
+        time.sleep(CONNECT_DELAY)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(urllib3.connection.connection, "create_connection", slow_connect)
+    session = HTTPSession(retries=0, timing=True)
+    session.request("GET", server)
+    session.request("GET", server)
+    session.close()
+
+    first, second = session.timings
+    assert not first.reused and first.connect_ms >= CONNECT_DELAY * 1000 * 0.9
+    assert second.reused and second.connect_ms == 0.0
+    for timing in (first, second):
+        assert RESPONSE_DELAY * 1000 * 0.9 <= timing.ttfb_ms < (RESPONSE_DELAY + CONNECT_DELAY) * 1000 * 0.9
+        assert timing.ttfb_ms <= timing.total_ms
@@ -0,0 +1,120 @@
+import os
+
+import pytest
+
+lancedb = pytest.importorskip("lancedb")
+
+from gutil.Ingest import DirectoryIngestor  # noqa: E402
+
+TWO_FUNCS = "def f():\n    return 1\n\n\ndef g():\n    return 2\n"
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.texts = []
+
+    def encode(self, texts):
+        self.texts.extend(texts)
+        return [[1.0, float(len(t))] for t in texts]
+
+
+def _ingestor(tmp_path, embeddings=None, max_file_bytes=100, max_lines=4):
+    return DirectoryIngestor(
+        str(tmp_path / "db"),
+        "code",
+        str(tmp_path / "src"),
+        embeddings or FakeEmbeddings(),
+        max_file_bytes=max_file_bytes,
+        max_lines=max_lines,
+    )
+
+
+def _rows(tmp_path):
+    rows = lancedb.connect(str(tmp_path / "db")).open_table("code").to_arrow().to_pylist()
+    return {(r["path"], r["text"].split("(")[0]): r for r in rows}
+
+
+def _touch(path, text):
+    # a different size is enough, but keep mtime distinct too
+    path.write_text(text)
+    st = os.stat(path)
+    os.utime(path, (st.st_atime, st.st_mtime + 5))
+
+
+def test_unchanged_file_is_not_read_again(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.py").write_text(TWO_FUNCS)
+    assert _ingestor(tmp_path).sync().files_new == 1
+
+    def no_read(self, rel):
+        raise AssertionError(f"{rel} was read again")
+
+    monkeypatch.setattr(DirectoryIngestor, "_read", no_read)
+    report = _ingestor(tmp_path).sync()
+    assert report.files_unchanged == 1
+    assert report.chunks_embedded == 0
+
+
+def test_edit_embeds_only_new_chunks_and_moves_kept_lines(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.py").write_text(TWO_FUNCS)
+    _ingestor(tmp_path, max_file_bytes=10_000).sync()
+    assert _rows(tmp_path)[("a.py", "def g")]["start_line"] == 5
+
+    embeddings = FakeEmbeddings()
+    _touch(src / "a.py", "import os\n\n\ndef h():\n    return 0\n\n\n" + TWO_FUNCS)
+    report = _ingestor(tmp_path, embeddings, max_file_bytes=10_000).sync()
+    assert report.files_changed == 1
+    assert report.chunks_kept >= 1
+    assert not any("def f" in t or "def g" in t for t in embeddings.texts)
+
+    rows = _rows(tmp_path)
+    g = rows[("a.py", "def g")]
+    assert (g["start_line"], g["end_line"]) == (12, 13)
+    assert g["embedding"] == [1.0, float(len(g["text"]))]  # stored vector kept
+
+
+def test_deleted_file_removes_its_rows(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.py").write_text(TWO_FUNCS)
+    (src / "b.py").write_text("def b():\n    return 3\n")
+    _ingestor(tmp_path).sync()
+
+    os.remove(src / "a.py")
+    report = _ingestor(tmp_path).sync()
+    assert report.files_deleted == 1
+    assert {path for path, _ in _rows(tmp_path)} == {"b.py"}
+    assert "a.py" not in _ingestor(tmp_path).manifest["files"]
+
+
+def test_binary_and_oversized_files_are_not_reread(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.py").write_text("def f():\n    return 1\n")
+    (src / "blob.bin").write_bytes(b"\0\1\2" * 10)
+    (src / "big.txt").write_text("x" * 500)
+
+    first = _ingestor(tmp_path).sync()
+    assert first.files_new == 1
+
+    def no_read(self, rel):
+        raise AssertionError(f"{rel} was read again")
+
+    monkeypatch.setattr(DirectoryIngestor, "_read", no_read)
+    second = _ingestor(tmp_path).sync()
+    assert second.files_unchanged == 3
+
+
+def test_skipped_file_is_indexed_once_it_becomes_text(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "big.txt").write_text("x" * 500)
+    _ingestor(tmp_path).sync()
+
+    (src / "big.txt").write_text("small now\n")
+    report = _ingestor(tmp_path).sync()
+    assert report.files_changed == 1
+    assert report.chunks_embedded == 1
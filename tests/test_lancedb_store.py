@@ -0,0 +1,133 @@
+import os
+
+import pytest
+
+pytest.importorskip("lancedb")
+
+from cli.codex_cli.lancedb_store import LanceDBStore, LanceDBStoreError, _is_conflict  # noqa: E402
+from cli.codex_cli.vector_store import MemoryEntry  # noqa: E402
+
+VECTORS = {"a": [3.0, 0.0], "b": [1.0, 1.0], "c": [0.0, 10.0], "d": [-2.0, 0.5]}
+
+
+def _entries():
+    return [
+        MemoryEntry(id=i, ts=0.0, prompt=i, response=i, tags=[], tokens=1, embedding=v) for i, v in VECTORS.items()
+    ]
+
+
+def _ranked(rows):
+    return [(r["id"], round(r["_distance"], 4)) for r in rows]
+
+
+def test_hot_index_and_lance_fallback_rank_and_score_alike(tmp_path):
+    query = [2.0, 1.0]
+    hot = LanceDBStore(str(tmp_path / "db"), hot_index=True, hot_max_rows=100)
+    hot.add_batch(_entries())
+    served = hot.search(query, k=4)
+    assert hot.hot.usable
+
+    # Same table, but too large for the hot index: Lance answers instead
+    fallback = LanceDBStore(str(tmp_path / "db"), hot_index=True, hot_max_rows=2)
+    assert not fallback.hot.usable
+    assert _ranked(fallback.search(query, k=4)) == _ranked(served)
+
+
+def test_search_sees_commits_from_another_handle(tmp_path):
+    store = LanceDBStore(str(tmp_path / "db"))
+    entries = _entries()
+    store.add_batch(entries[:1])
+    assert store.count() == 1
+    LanceDBStore(str(tmp_path / "db")).add_batch(entries[1:])
+    assert store.count() == 4
+    assert {r["id"] for r in store.search([1.0, 0.0], k=4)} == set(VECTORS)
+
+
+@pytest.mark.parametrize(
+    "message, conflict",
+    [
+        ("Commit conflict for version 7: This Append transaction was preempted", True),
+        ("Too many concurrent writers", True),
+        ("Retryable commit conflict ... incompatible transaction", True),
+        ("Table 'interactions' was not found", False),
+        ("Invalid input, Schema error: No field named nocol.", False),
+        ("LanceError(IO): Not found: /db/interactions.lance/data/x.lance", False),
+        ("Table interactions was not found", False),
+    ],
+)
+def test_is_conflict(message, conflict):
+    assert _is_conflict(RuntimeError(message)) is conflict
+
+
+def test_table_mid_creation_is_retryable_but_other_errors_are_not(tmp_path):
+    db = tmp_path / "db"
+    store = LanceDBStore(str(db))
+    missing = ValueError("Table 'interactions' was not found")
+    assert not store._retryable(missing)  # not listed: genuinely missing
+    os.makedirs(db / "interactions.lance")  # listed, nothing committed yet
+    assert store._retryable(missing)
+    assert not store._retryable(ValueError("Table 'other' was not found"))
+    assert not store._retryable(ValueError("Schema error: No field named nocol"))
+
+
+class _ConflictAfter:
+    """Table proxy whose ``add`` fails with a commit conflict, after committing if ``landed``."""
+
+    def __init__(self, tbl, landed):
+        self._tbl = tbl
+        self._landed = landed
+        self.calls = []
+
+    def add(self, rows):
+        self.calls.append("add")
+        if self._landed:
+            self._tbl.add(rows)
+        raise RuntimeError("Commit conflict for version 2: preempted by a concurrent append")
+
+    def merge_insert(self, on):
+        self.calls.append("merge_insert")
+        return self._tbl.merge_insert(on)
+
+    def __getattr__(self, name):
+        return getattr(self._tbl, name)
+
+
+@pytest.mark.parametrize("landed", [False, True])
+def test_retry_after_conflict_inserts_each_row_once(tmp_path, monkeypatch, landed):
+    store = LanceDBStore(str(tmp_path / "db"))
+    entries = _entries()
+    store.add_batch(entries[:1])
+
+    real_open = store._open
+    proxy = None
+
+    def flaky_open(dim=None):
+        nonlocal proxy
+        tbl = real_open(dim)
+        if proxy is None:
+            proxy = _ConflictAfter(tbl, landed)
+            return proxy
+        return tbl
+
+    monkeypatch.setattr(store, "_open", flaky_open)
+    store.add_batch(entries[1:])
+    monkeypatch.undo()
+
+    assert proxy.calls == ["add"]
+    assert store.conflicts == 1
+    ids = store._open().to_arrow().column("id").to_pylist()
+    assert sorted(ids) == sorted(VECTORS)
+
+
+def test_non_conflict_error_is_not_retried(tmp_path, monkeypatch):
+    store = LanceDBStore(str(tmp_path / "db"), write_retries=8)
+    attempts = []
+
+    def broken(tbl, attempt):
+        attempts.append(attempt)
+        raise ValueError("Invalid input, Schema error: No field named nocol")
+
+    store.add_batch(_entries()[:1])
+    with pytest.raises(LanceDBStoreError, match="after 1 attempt"):
+        store._write(broken)
+    assert attempts == [0]
@@ -0,0 +1,17 @@
+from cli.codex_cli.numpy_store import NumpyStore
+from cli.codex_cli.vector_store import MemoryEntry
+
+
+def _entry(id, embedding):
+    return MemoryEntry(id=id, ts=0.0, prompt="p", response="r", tags=[], tokens=1, embedding=embedding)
+
+
+def test_blank_jsonl_opens_empty_and_accepts_writes(tmp_path):
+    path = tmp_path / "memory.jsonl"
+    path.write_text("\n  \n", encoding="utf-8")
+    store = NumpyStore(str(path))
+    assert store.count() == 0
+    assert store.search([1.0, 0.0], k=3) == []
+
+    store.add_batch([_entry("a", [1.0, 0.0])])
+    assert NumpyStore(str(path)).count() == 1
@@ -0,0 +1,30 @@
+import pytest
+
+from gutil.__main__ import _build_parser, _normalize_profile_flag
+
+
+@pytest.mark.parametrize(
+    "argv, mode",
+    [
+        (["--profile", "daemon", "status"], "cpu"),
+        (["--profile=cpu", "daemon", "status"], "cpu"),
+        (["--profile", "wall", "daemon", "status"], "wall"),
+        (["--profile", "mem", "daemon", "status"], "mem"),
+        (["--profile=wall", "daemon", "status"], "wall"),
+        (["--profile-top", "5", "--profile", "wall", "daemon", "status"], "wall"),
+    ],
+)
+def test_profile_mode(argv, mode):
+    args = _build_parser().parse_args(_normalize_profile_flag(argv))
+    assert args.profile == mode
+    assert args.command == "daemon"
+
+
+def test_profile_space_separated_mode_is_merged():
+    argv = ["--profile", "wall", "daemon", "status"]
+    assert _normalize_profile_flag(argv) == ["--profile=wall", "daemon", "status"]
+
+
+def test_options_after_subcommand_untouched():
+    argv = ["daemon", "status", "--profile", "wall"]
+    assert _normalize_profile_flag(argv) == argv
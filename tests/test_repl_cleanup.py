@@ -0,0 +1,30 @@
+import yaml
+
+from cli.codex_cli import cli
+
+
+class FakeStore:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeHistory:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_failed_turn_still_closes_history_and_store(tmp_path, monkeypatch):
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({"tracing": {"enable": False}, "history": {"enable": True}}))
+    store, history = FakeStore(), FakeHistory()
+    monkeypatch.setattr(cli, "open_backends", lambda cfg: (store, object(), None))
+    monkeypatch.setattr(cli, "open_history", lambda path: history)
+    monkeypatch.setattr(cli.Prompt, "ask", lambda *a, **kw: "hello")
+    monkeypatch.setattr(cli, "_turn", lambda *a, **kw: 3)
+
+    assert cli.run_repl(str(config)) == 3
+    assert store.closed and history.closed